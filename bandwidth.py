@@ -0,0 +1,135 @@
+"""
+VIGGA - Bant Genişliği Zamanlayıcısı
+Tüm indirmeler tek bir token bucket limitini ağırlıklarına göre paylaşır; limit saat aralığına göre değişebilir.
+Küçük etkileşimli istekler (thumbnail, metadata) sürerken toplu indirmeler geri çekilir.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from settings import get_setting
+
+INTERACTIVE_RESERVE = 0.3
+BURST_SECONDS = 0.5
+MAX_SLEEP = 1.0
+RATE_WINDOW = 1.0
+RATE_ALPHA = 0.3
+
+def _minutes(hhmm):
+    h, m = str(hhmm).split(':')
+    return int(h) * 60 + int(m)
+
+def scheduled_limit_kbps(now=None):
+    # settings: bandwidth_schedule = [{"start": "09:00", "end": "18:00", "kbps": 2000}, ...]
+    t = time.localtime(now)
+    minute = t.tm_hour * 60 + t.tm_min
+    for rule in get_setting('bandwidth_schedule') or []:
+        try:
+            start, end = _minutes(rule['start']), _minutes(rule['end'])
+        except (KeyError, ValueError):
+            continue
+        inside = start <= minute < end if start <= end else (minute >= start or minute < end)
+        if inside:
+            return rule.get('kbps') or 0
+    return get_setting('bandwidth_limit_kbps') or 0
+
+class Flow:
+    def __init__(self, scheduler, weight):
+        self.scheduler = scheduler
+        self.weight = max(0.1, float(weight))
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    def consume(self, nbytes, cancel_event=None):
+        if nbytes <= 0:
+            return
+        self.scheduler._account(nbytes)
+        rate = self.scheduler.flow_rate(self)
+        if not rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(rate * BURST_SECONDS, self._tokens + (now - self._last) * rate)
+            self._last = now
+            self._tokens -= nbytes
+            wait = -self._tokens / rate if self._tokens < 0 else 0
+        while wait > 0:
+            step = min(wait, MAX_SLEEP)
+            if cancel_event is not None:
+                if cancel_event.wait(step):
+                    return
+            else:
+                time.sleep(step)
+            wait -= step
+    def close(self):
+        self.scheduler.close_flow(self)
+
+class BandwidthScheduler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flows = set()
+        self._interactive = 0
+        self._window_bytes = 0
+        self._window_start = time.monotonic()
+        self.measured_bps = None
+    def open_flow(self, weight=1.0):
+        flow = Flow(self, weight)
+        with self._lock:
+            self._flows.add(flow)
+        return flow
+    def close_flow(self, flow):
+        with self._lock:
+            self._flows.discard(flow)
+    def interactive_begin(self):
+        with self._lock:
+            self._interactive += 1
+    def interactive_end(self):
+        with self._lock:
+            self._interactive = max(0, self._interactive - 1)
+    @contextmanager
+    def interactive(self):
+        self.interactive_begin()
+        try:
+            yield
+        finally:
+            self.interactive_end()
+    def bulk_limit(self):
+        limit = scheduled_limit_kbps() * 1024
+        with self._lock:
+            interactive = self._interactive
+        if interactive:
+            # Limit yoksa ölçülen toplam hız referans alınır, böylece etkileşimli isteklere yer açılır
+            base = limit or self.measured_bps
+            return base * (1 - INTERACTIVE_RESERVE) if base else None
+        return limit or None
+    def flow_rate(self, flow):
+        limit = self.bulk_limit()
+        if not limit:
+            return None
+        with self._lock:
+            total = sum(f.weight for f in self._flows) or flow.weight
+        return limit * flow.weight / total
+    def _account(self, nbytes):
+        with self._lock:
+            self._window_bytes += nbytes
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            if elapsed >= RATE_WINDOW:
+                if self._interactive:
+                    # Kısılmış dönemler kapasite tahminini aşağı çekmesin
+                    self._window_bytes = 0
+                    self._window_start = now
+                    return
+                rate = self._window_bytes / elapsed
+                self.measured_bps = rate if self.measured_bps is None else self.measured_bps + RATE_ALPHA * (rate - self.measured_bps)
+                self._window_bytes = 0
+                self._window_start = now
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_bandwidth_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = BandwidthScheduler()
+        return _scheduler
@@ -0,0 +1,199 @@
+"""
+VIGGA - İndirme Benchmark'ı
+Yerel medya sunucusuna karşı gerçek indirme yolu (DownloadTask + yt-dlp) ölçülür:
+ilk bayt süresi, sürekli MB/s, parça eşzamanlılığıyla ölçeklenme ve MB başına CPU. Sonuçlar JSON olarak saklanır.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from settings import DATA_DIR, get_setting
+from download_core import DownloadTask
+from media_server import MediaServer, progressive_path, hls_path, dash_path
+
+BENCHMARK_DIR = os.path.join(DATA_DIR, 'benchmarks')
+FIRST_BYTE_POLL = 0.002
+MB = 1024 * 1024
+
+def _server_main(conn, latency_ms, bandwidth_kbps):
+    server = MediaServer(latency_ms=latency_ms, bandwidth_kbps=bandwidth_kbps).start()
+    conn.send(server.base_url)
+    conn.recv()
+    server.stop()
+
+class ServerProcess:
+    # Sunucu ayrı süreçte çalışır; böylece ölçülen CPU yalnızca indirme yoluna aittir
+    def __init__(self, latency_ms, bandwidth_kbps):
+        ctx = multiprocessing.get_context('spawn')
+        self._conn, child = ctx.Pipe()
+        self._proc = ctx.Process(target=_server_main, args=(child, latency_ms, bandwidth_kbps), daemon=True)
+    def __enter__(self):
+        self._proc.start()
+        self.base_url = self._conn.recv()
+        return self
+    def __exit__(self, *exc):
+        self._conn.send('stop')
+        self._proc.join(5)
+    def _get(self, path):
+        with urllib.request.urlopen(self.base_url + path, timeout=5) as resp:
+            return json.load(resp)
+    def reset(self):
+        self._get('/_reset')
+    def stats(self):
+        return self._get('/_stats')
+
+def scenarios(args):
+    return [
+        ('progressive', progressive_path(args.size_mb * MB)),
+        ('hls', hls_path(args.segments, args.segment_kb * 1024)),
+        ('dash', dash_path(args.segments, args.segment_kb * 1024)),
+    ]
+
+def run_case(server, url, connections):
+    workdir = tempfile.mkdtemp(prefix='vigga-bench-')
+    opts = {'segmented_connections': connections, 'concurrent_fragment_downloads': connections, 'fixup': 'never'}
+    task = DownloadTask(url, 'best', 'MP4', outtmpl=os.path.join(workdir, '%(title)s.%(ext)s'), extra_opts=opts, archive=False)
+    first_byte = []
+    done = threading.Event()
+    def watch():
+        while not done.is_set():
+            if task.snapshot()[0] > 0:
+                first_byte.append(time.perf_counter())
+                return
+            done.wait(FIRST_BYTE_POLL)
+    server.reset()
+    watcher = threading.Thread(target=watch, daemon=True)
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    watcher.start()
+    try:
+        ok, message = task.run()
+    finally:
+        t1, cpu1 = time.perf_counter(), time.process_time()
+        done.set()
+        watcher.join()
+    size = sum(os.path.getsize(os.path.join(workdir, n)) for n in os.listdir(workdir))
+    shutil.rmtree(workdir, ignore_errors=True)
+    stats = server.stats()
+    start = first_byte[0] if first_byte else t0
+    return {
+        'ok': ok,
+        'error': None if ok else message,
+        'bytes': size,
+        'wall_s': round(t1 - t0, 4),
+        'ttfb_ms': round((start - t0) * 1000, 1) if first_byte else None,
+        'mb_per_s': round(size / MB / (t1 - start), 3) if ok and t1 > start else None,
+        'cpu_s': round(cpu1 - cpu0, 4),
+        'cpu_ms_per_mb': round((cpu1 - cpu0) * 1000 / (size / MB), 2) if size else None,
+        'requests': stats['requests'],
+        'peak_connections': stats['peak_connections'],
+    }
+
+def summarize(results):
+    groups = {}
+    for r in results:
+        if r['ok']:
+            groups.setdefault((r['scenario'], r['connections']), []).append(r)
+    summary = {}
+    for (scenario, connections), runs in sorted(groups.items()):
+        median = lambda key: statistics.median(r[key] for r in runs if r[key] is not None) if any(r[key] is not None for r in runs) else None
+        summary[f"{scenario}/{connections}"] = {
+            'scenario': scenario,
+            'connections': connections,
+            'ttfb_ms': median('ttfb_ms'),
+            'mb_per_s': median('mb_per_s'),
+            'cpu_ms_per_mb': median('cpu_ms_per_mb'),
+            'peak_connections': max(r['peak_connections'] for r in runs),
+        }
+    # Ölçeklenme: aynı senaryonun en az bağlantılı çalışmasına göre hız oranı
+    for entry in summary.values():
+        base = min((e for e in summary.values() if e['scenario'] == entry['scenario']), key=lambda e: e['connections'])
+        if entry['mb_per_s'] and base['mb_per_s']:
+            entry['scaling'] = round(entry['mb_per_s'] / base['mb_per_s'], 2)
+    return summary
+
+def compare(summary, baseline):
+    lines = []
+    for key, entry in summary.items():
+        old = baseline.get('summary', {}).get(key)
+        if not old:
+            continue
+        parts = []
+        for metric in ('mb_per_s', 'ttfb_ms', 'cpu_ms_per_mb'):
+            if entry.get(metric) and old.get(metric):
+                parts.append(f"{metric} {(entry[metric] - old[metric]) * 100 / old[metric]:+.1f}%")
+        lines.append(f"  {key:<16} " + '  '.join(parts))
+    return lines
+
+def print_summary(summary):
+    print(f"{'case':<16} {'MB/s':>8} {'scale':>6} {'TTFB ms':>8} {'CPU ms/MB':>10} {'peak conn':>9}")
+    for key, e in summary.items():
+        fmt = lambda v, spec: format(v, spec) if v is not None else '-'
+        print(f"{key:<16} {fmt(e['mb_per_s'], '8.2f')} {fmt(e.get('scaling'), '6.2f')} {fmt(e['ttfb_ms'], '8.1f')} "
+              f"{fmt(e['cpu_ms_per_mb'], '10.2f')} {e['peak_connections']:>9}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='vigga-bench', description='Download throughput benchmark against a local media server')
+    parser.add_argument('--latency-ms', type=float, default=20, help='server response latency per request')
+    parser.add_argument('--bandwidth-kbps', type=int, default=4096, help='per-connection bandwidth cap (0 = unlimited)')
+    parser.add_argument('--size-mb', type=int, default=32, help='progressive file size')
+    parser.add_argument('--segments', type=int, default=32, help='HLS/DASH segment count')
+    parser.add_argument('--segment-kb', type=int, default=1024, help='HLS/DASH segment size')
+    parser.add_argument('--connections', default='1,2,4,8', help='comma separated connection counts')
+    parser.add_argument('--scenarios', default='progressive,hls,dash', help='comma separated scenarios')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per case')
+    parser.add_argument('-o', '--output', help='result file (default: data/benchmarks/<timestamp>.json)')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    connections = [int(c) for c in args.connections.split(',') if c.strip()]
+    wanted = {s.strip() for s in args.scenarios.split(',')}
+    import yt_dlp
+    results = []
+    with ServerProcess(args.latency_ms, args.bandwidth_kbps) as server:
+        for name, path in scenarios(args):
+            if name not in wanted:
+                continue
+            for n in connections:
+                for run in range(args.repeat):
+                    result = dict(scenario=name, connections=n, run=run, **run_case(server, server.base_url + path, n))
+                    results.append(result)
+                    status = f"{result['mb_per_s']} MB/s" if result['ok'] else f"failed: {result['error']}"
+                    print(f"{name}/{n} #{run}: {status}", file=sys.stderr)
+    summary = summarize(results)
+    report = {
+        'meta': {
+            'time': time.time(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'yt_dlp': yt_dlp.version.__version__,
+            'segment_size_mb': get_setting('segment_size_mb'),
+            'bandwidth_limit_kbps': get_setting('bandwidth_limit_kbps'),
+            'config': vars(args),
+        },
+        'results': results,
+        'summary': summary,
+    }
+    output = args.output or os.path.join(BENCHMARK_DIR, time.strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=2)
+    print_summary(summary)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as fh:
+            print('\nvs ' + args.compare)
+            print('\n'.join(compare(summary, json.load(fh))))
+    print(f"\nresults: {output}")
+    return 0 if all(r['ok'] for r in results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+VIGGA - Kart Gölgesi
+Gölge bir kez bulanıklaştırılıp küçük bir 9 parçalı pixmap olarak önbelleğe alınır; pencere yalnızca kenar parçalarını çizer.
+QGraphicsDropShadowEffect gibi kartı her alt widget güncellemesinde ekran dışında yeniden çizip bulanıklaştırmaz.
+"""
+import functools
+from PyQt5.QtCore import Qt, QRect, QRectF
+from PyQt5.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt5.QtWidgets import QGraphicsBlurEffect, QGraphicsPixmapItem, QGraphicsScene
+
+@functools.lru_cache(maxsize=8)
+def shadow_pixmap(radius, blur, color=0xFF000000):
+    # Köşe + bulanıklık payı kadar kenarlı, ortası tek piksel olan yuvarlatılmış dikdörtgen
+    margin = blur + radius
+    size = 2 * margin + 1
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QColor.fromRgba(color))
+    painter.drawRoundedRect(QRectF(blur, blur, size - 2 * blur, size - 2 * blur), radius, radius)
+    painter.end()
+    # Bulanıklaştırma uygulama ömründe bir kez yapılır
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(image))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur)
+    effect.setBlurHints(QGraphicsBlurEffect.QualityHint)
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+    blurred = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    blurred.fill(Qt.transparent)
+    painter = QPainter(blurred)
+    scene.render(painter, QRectF(0, 0, size, size), QRectF(0, 0, size, size))
+    painter.end()
+    return QPixmap.fromImage(blurred)
+
+class CardShadow:
+    def __init__(self, radius, blur, offset=(0, 0), color=Qt.black):
+        self.radius = radius
+        self.blur = blur
+        self.offset = offset
+        self.pixmap = shadow_pixmap(radius, blur, QColor(color).rgba())
+    def covers(self, card_rect, dirty):
+        # Kartın içinde kalan ve yuvarlak köşelere değmeyen kirli alanlar (ilerleme çubuğu, spinner) gölgeye dokunmaz
+        if not card_rect.contains(dirty):
+            return False
+        r = self.radius
+        corners = (QRect(card_rect.left(), card_rect.top(), r, r), QRect(card_rect.right() - r + 1, card_rect.top(), r, r),
+                   QRect(card_rect.left(), card_rect.bottom() - r + 1, r, r), QRect(card_rect.right() - r + 1, card_rect.bottom() - r + 1, r, r))
+        return not any(c.intersects(dirty) for c in corners)
+    def paint(self, painter, card_rect):
+        m = self.blur + self.radius
+        target = card_rect.translated(*self.offset).adjusted(-self.blur, -self.blur, self.blur, self.blur)
+        x0, y0, x1, y1 = target.left(), target.top(), target.right() + 1, target.bottom() + 1
+        w, h = target.width() - 2 * m, target.height() - 2 * m
+        if w < 0 or h < 0:
+            return
+        s = self.pixmap.width()
+        # Ortadaki parça kartın altında kaldığı için çizilmez
+        pieces = (
+            (QRect(x0, y0, m, m), QRect(0, 0, m, m)),
+            (QRect(x1 - m, y0, m, m), QRect(s - m, 0, m, m)),
+            (QRect(x0, y1 - m, m, m), QRect(0, s - m, m, m)),
+            (QRect(x1 - m, y1 - m, m, m), QRect(s - m, s - m, m, m)),
+            (QRect(x0 + m, y0, w, m), QRect(m, 0, 1, m)),
+            (QRect(x0 + m, y1 - m, w, m), QRect(m, s - m, 1, m)),
+            (QRect(x0, y0 + m, m, h), QRect(0, m, m, 1)),
+            (QRect(x1 - m, y0 + m, m, h), QRect(s - m, m, m, 1)),
+        )
+        for dst, src in pieces:
+            painter.drawPixmap(dst, self.pixmap, src)
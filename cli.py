@@ -0,0 +1,158 @@
+"""
+VIGGA - Komut Satırı
+Ekransız sunucular için toplu indirme; PyQt yüklenmez, indirme çekirdeği GUI ile ortaktır.
+URL'ler argüman, dosya ya da stdin'den akış olarak okunur, ilerleme satır başına JSON olarak yazılır.
+İşler asyncio motorunda coroutine olarak bekler; yalnızca çalışan indirmeler thread kullanır.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from settings import get_setting
+from download_core import DOWNLOAD_DIR, get_available_formats
+from engine import DownloadEngine, RUNNING, PROCESSING, PAUSED
+
+class JsonEmitter:
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+        self._lock = threading.Lock()
+    def emit(self, event, **fields):
+        fields = dict(event=event, time=round(time.time(), 3), **fields)
+        line = json.dumps(fields, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+def read_urls(args):
+    # Kaynaklar sırayla ve tembel okunur; stdin'den gelen satırlar geldikçe kuyruğa girer
+    yield from args.urls
+    sources = []
+    if args.batch_file:
+        sources.append(args.batch_file)
+    elif not args.urls and not sys.stdin.isatty():
+        sources.append('-')
+    for source in sources:
+        fh = sys.stdin if source == '-' else open(source, 'r', encoding='utf-8')
+        try:
+            for line in fh:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+        finally:
+            if fh is not sys.stdin:
+                fh.close()
+
+def format_id_for(args):
+    if args.format_id:
+        return args.format_id
+    if args.format == "Audio Only (MP3)":
+        return 'bestaudio'
+    return f"bestvideo[height<={args.max_height}]" if args.max_height else 'bestvideo'
+
+class BatchRunner:
+    def __init__(self, jobs, format_id, selected_format, outtmpl, emitter, interval, archive=None):
+        self.format_id = format_id
+        self.archive = archive
+        self.selected_format = selected_format
+        self.outtmpl = outtmpl
+        self.emitter = emitter
+        # CLI işleri GUI'nin devam günlüğüne yazılmaz
+        # Extractor süreçleri açılmaz; URL eşleştirmesi bu süreçte yapılır
+        self.engine = DownloadEngine(max_parallel=jobs, journal=False, hz=1 / interval, history=False, extractor_pool=False)
+        self.engine.subscribe(self._on_event)
+        self.failed = 0
+        self.completed = 0
+    async def run(self, urls):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.cancel)
+            except NotImplementedError:
+                # Windows: döngü sinyal işleyicisi yok; Ctrl-C ana thread'de yakalanıp döngüye aktarılır
+                signal.signal(sig, lambda *_: loop.call_soon_threadsafe(self.cancel))
+        self._incoming = asyncio.Queue()
+        self._seen = set()
+        # stdin bloklayan bir okuma; ayrı daemon thread satırları geldikçe döngüye aktarır
+        threading.Thread(target=self._feed, args=(urls, loop, self._incoming), name='vigga-input', daemon=True).start()
+        while not self.engine.closed:
+            url = await self._incoming.get()
+            if url is None:
+                break
+            job = await self.engine.add(url, self.format_id, self.selected_format, outtmpl=self.outtmpl, archive=self.archive)
+            if job.job_id in self._seen:
+                # Aynı medya listede ikinci kez: mevcut işe bağlanır
+                self.emitter.emit('duplicate', id=job.job_id, url=url, of=job.url)
+            self._seen.add(job.job_id)
+        await self.engine.join()
+        self.emitter.emit('summary', completed=self.completed, failed=self.failed)
+        if self.engine.closed:
+            return 130
+        return 1 if self.failed else 0
+    def cancel(self):
+        # Ctrl-C / SIGTERM: .part dosyaları bırakılır, aynı komut tekrar çalıştırılınca devam eder
+        self._incoming.put_nowait(None)
+        asyncio.get_running_loop().create_task(self.engine.shutdown())
+    def _feed(self, urls, loop, incoming):
+        try:
+            for url in urls:
+                loop.call_soon_threadsafe(incoming.put_nowait, url)
+        finally:
+            loop.call_soon_threadsafe(incoming.put_nowait, None)
+    def _on_event(self, event, job):
+        if job is None:
+            return
+        snap = job.snapshot()
+        if event == 'changed' and snap['state'] == RUNNING:
+            self.emitter.emit('started', id=snap['id'], url=snap['url'])
+        elif event == 'changed' and snap['state'] == PROCESSING:
+            self.emitter.emit('processing', id=snap['id'], url=snap['url'])
+        elif event == 'progress':
+            self.emitter.emit('progress', id=snap['id'], url=snap['url'], phase=snap['phase'],
+                              downloaded=snap['downloaded'], total=snap['total'],
+                              percent=round(snap['downloaded'] * 100 / snap['total'], 1) if snap['total'] else None,
+                              speed=snap['speed'], eta=snap['eta'])
+        elif event == 'finished':
+            self.completed += 1
+            self.emitter.emit('finished', id=snap['id'], url=snap['url'], downloaded=snap['downloaded'], total=snap['total'],
+                              message=snap['message'])
+        elif event == 'failed':
+            self.failed += 1
+            self.emitter.emit('error', id=snap['id'], url=snap['url'], message=snap['message'])
+        elif event == 'changed' and snap['state'] == PAUSED:
+            self.emitter.emit('paused', id=snap['id'], url=snap['url'], downloaded=snap['downloaded'])
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='vigga', description='Headless VIGGA downloader')
+    parser.add_argument('urls', nargs='*', help='video URLs; read from stdin when omitted')
+    parser.add_argument('-a', '--batch-file', help="file with one URL per line ('-' for stdin)")
+    parser.add_argument('-j', '--jobs', type=int, default=get_setting('max_parallel_downloads'),
+                        help='parallel downloads (default: max_parallel_downloads setting)')
+    parser.add_argument('-f', '--format', default='MP4', choices=get_available_formats(), help='container / audio mode')
+    parser.add_argument('--max-height', type=int, default=0, help='limit video height, e.g. 1080')
+    parser.add_argument('--format-id', help='raw yt-dlp format id / selector (overrides --max-height)')
+    parser.add_argument('-o', '--output', default=DOWNLOAD_DIR, help='output directory')
+    parser.add_argument('--no-archive', action='store_true', help='download even if the download archive has the item')
+    parser.add_argument('--progress-interval', type=float, default=1.0, help='seconds between progress events')
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    os.makedirs(args.output, exist_ok=True)
+    return asyncio.run(_run(args))
+
+async def _run(args):
+    runner = BatchRunner(jobs=max(1, args.jobs),
+                         format_id=format_id_for(args),
+                         selected_format=args.format,
+                         outtmpl=os.path.join(args.output, '%(title)s.%(ext)s'),
+                         emitter=JsonEmitter(),
+                         interval=max(0.1, args.progress_interval),
+                         archive=False if args.no_archive else None)
+    return await runner.run(read_urls(args))
+
+if __name__ == '__main__':
+    sys.exit(main())
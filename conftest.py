@@ -0,0 +1,23 @@
+"""
+VIGGA - Test Ortamı
+Qt testleri ekransız (offscreen) platformda tek bir QApplication ile çalışır.
+"""
+import os
+import time
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+def wait_until(app, predicate, timeout=5.0):
+    # Qt olay döngüsü koşul sağlanana kadar işletilir
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError('timed out')
+        app.processEvents()
+        time.sleep(0.005)
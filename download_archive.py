@@ -0,0 +1,139 @@
+"""
+VIGGA - İndirme Arşivi
+İndirilen medya extractor+id+format anahtarıyla SQLite'ta indekslenir; bilinen öğeler çıkarım
+ve indirme öncesi atlanır. Dosyası silinen kayıtlar sorguda ya da toplu temizlikte düşürülür.
+Kayıt boyut ve mtime ile hemen yazılır; SHA-1 indirme slotunu tutmamak için arka planda hesaplanır.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from settings import DATA_DIR
+
+ARCHIVE_PATH = os.path.join(DATA_DIR, 'archive.sqlite3')
+HASH_CHUNK = 1024 * 1024
+
+def format_key(format_id, selected_format):
+    return f"{selected_format}|{format_id}"
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+class DownloadArchive:
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('''CREATE TABLE IF NOT EXISTS downloads (
+            media_key TEXT NOT NULL,
+            format_key TEXT NOT NULL,
+            url TEXT,
+            path TEXT NOT NULL,
+            size INTEGER,
+            sha1 TEXT,
+            created REAL,
+            mtime REAL,
+            PRIMARY KEY (media_key, format_key))''')
+        columns = [row[1] for row in self._db.execute('PRAGMA table_info(downloads)')]
+        if 'mtime' not in columns:
+            self._db.execute('ALTER TABLE downloads ADD COLUMN mtime REAL')
+        self._db.execute('CREATE INDEX IF NOT EXISTS downloads_path ON downloads(path)')
+        self._db.commit()
+        self._hasher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='vigga-archive-hash')
+    def lookup(self, media_key, fmt):
+        # Dosya silinmiş ya da boyutu değişmişse kayıt düşürülür ve yeniden indirilir
+        if not media_key:
+            return None
+        with self._lock:
+            row = self._db.execute('SELECT path, size, sha1 FROM downloads WHERE media_key=? AND format_key=?',
+                                   (media_key, fmt)).fetchone()
+        if row is None:
+            return None
+        path, size, sha1 = row
+        try:
+            if os.path.getsize(path) == size:
+                return {'path': path, 'size': size, 'sha1': sha1}
+        except OSError:
+            pass
+        self.forget_path(path)
+        return None
+    def record(self, media_key, fmt, url, path):
+        if not media_key or not path:
+            return
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO downloads (media_key, format_key, url, path, size, sha1, created, mtime) '
+                             'VALUES (?, ?, ?, ?, ?, NULL, ?, ?)',
+                             (media_key, fmt, url, path, st.st_size, time.time(), st.st_mtime))
+            self._db.commit()
+        self._hasher.submit(self._hash_later, path, st.st_size, st.st_mtime)
+    def _hash_later(self, path, size, mtime):
+        # Dosya bu arada değiştiyse ya da silindiyse hash yazılmaz
+        try:
+            digest = file_hash(path)
+            st = os.stat(path)
+        except OSError:
+            return
+        if (st.st_size, st.st_mtime) != (size, mtime):
+            return
+        with self._lock:
+            self._db.execute('UPDATE downloads SET sha1=? WHERE path=? AND size=? AND mtime=?', (digest, path, size, mtime))
+            self._db.commit()
+    def forget_path(self, path):
+        with self._lock:
+            self._db.execute('DELETE FROM downloads WHERE path=?', (os.path.abspath(path),))
+            self._db.commit()
+    def prune(self):
+        # Arşivi diskle eşitler: dosyası olmayan ya da boyutu tutmayan kayıtlar silinir
+        with self._lock:
+            rows = self._db.execute('SELECT path, size FROM downloads').fetchall()
+        stale = []
+        for path, size in rows:
+            try:
+                if os.path.getsize(path) == size:
+                    continue
+            except OSError:
+                pass
+            stale.append((path,))
+        if stale:
+            with self._lock:
+                self._db.executemany('DELETE FROM downloads WHERE path=?', stale)
+                self._db.commit()
+        return len(stale)
+    def count(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM downloads').fetchone()[0]
+
+def archive_postprocessor(archive, fmt, url):
+    # Son dosya taşındıktan sonra (birleştirme/dönüştürme dahil) kaydedilir
+    from yt_dlp.postprocessor.common import PostProcessor
+    from metadata_cache import extractor_key_for_info
+
+    class ArchiveRecorder(PostProcessor):
+        def run(self, info):
+            archive.record(extractor_key_for_info(info), fmt, info.get('webpage_url') or url, info.get('filepath'))
+            return [], info
+    return ArchiveRecorder()
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def get_download_archive():
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = DownloadArchive()
+        return _archive
@@ -0,0 +1,260 @@
+"""
+VIGGA - İndirme Çekirdeği
+Format seçimi, yt-dlp ayarları, ilerleme sayaçları ve iptal; PyQt içermez, GUI ve CLI ortak kullanır.
+Önizlemede çıkarılmış tam bilgi verilirse indirme ondan başlar; URL'ler reddedilirse yeniden çıkarıma düşülür.
+"""
+import os
+import json
+import threading
+import glob
+import re
+from segmented_download import install_segmented_downloaders, segmented_opts
+from download_journal import get_download_journal
+from bandwidth import get_bandwidth_scheduler
+from settings import get_setting
+from metadata_cache import extractor_key_for_info
+from download_archive import get_download_archive, archive_postprocessor, format_key
+from postprocess import PendingPostprocess, container_postprocessor
+from format_planner import CONTAINER_SORT, container_for
+
+# Saklı çıkarımdaki imzalı URL'lerin süresinin dolduğunu gösteren yanıtlar
+EXPIRED_STATUSES = (403, 410)
+_EXPIRED_MESSAGE = re.compile(r'HTTP Error (403|410)|expired', re.IGNORECASE)
+
+def _urls_expired(error):
+    # DownloadError asıl hatayı exc_info'da taşır; zincir boyunca HTTP durum kodu aranır
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = getattr(error, 'status', None) or getattr(error, 'code', None)
+        if status in EXPIRED_STATUSES:
+            return True
+        exc_info = getattr(error, 'exc_info', None)
+        error = (exc_info[1] if exc_info else None) or error.__cause__ or error.__context__
+    return False
+
+DOWNLOAD_DIR = os.path.join(os.path.dirname(__file__), 'downloads')
+os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+
+def _deferring_ydl_class(task):
+    # yt-dlp son işlemi indirme bittiği anda aynı thread'de çalıştırır; burada yalnızca kaydedilir
+    import yt_dlp
+
+    class DeferringYoutubeDL(yt_dlp.YoutubeDL):
+        def post_process(self, filename, info, files_to_move=None):
+            pps = info.get('__postprocessors') or []
+            # Container adımı dosya zaten hedef container'daysa iş yapmaz; yalnızca bunun için havuza gidilmez
+            active = [pp for pp in self._pps['post_process'] if not hasattr(pp, 'action') or pp.action(info)]
+            if not (pps or active):
+                return super().post_process(filename, info, files_to_move)
+            item = dict(info)
+            item.pop('__postprocessors', None)
+            task.pending.append(PendingPostprocess(task.postprocess_opts(), filename, self.sanitize_info(item),
+                                                   dict(files_to_move or {}), [type(pp).__name__ for pp in pps],
+                                                   container_for(task.selected_format)))
+            info['filepath'] = filename
+            return info
+    return DeferringYoutubeDL
+
+def build_download_opts(format_id, selected_format):
+    opts = {
+        'quiet': True,
+        'no_warnings': True,
+        'noprogress': True,
+        'outtmpl': os.path.join(DOWNLOAD_DIR, '%(title)s.%(ext)s'),
+        'continuedl': True,
+    }
+    if selected_format == "Audio Only (MP3)":
+        opts['format'] = 'bestaudio/best'
+        opts['postprocessors'] = [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3', 'preferredquality': '192'}]
+    elif format_id == 'bestaudio':
+        opts['format'] = 'bestaudio/best'
+    elif '+' in format_id:
+        # Planlayıcıdan gelen birleşik seçim (video+ses); ses kimliği geçersizse en iyi sese düşülür
+        video_id = format_id.split('+')[0]
+        opts['format'] = f"{format_id}/{video_id}+bestaudio/best"
+    else:
+        opts['format'] = f"{format_id}+bestaudio/{format_id}/best"
+    container = container_for(selected_format)
+    if container:
+        # Birleştirme hep stream copy: codec'ler container'a uymuyorsa MKV'ye birleştirilir,
+        # gerekirse son adımda container_postprocessor yeniden kodlar
+        opts['merge_output_format'] = container if container == 'mkv' else f"{container}/mkv"
+        if container in CONTAINER_SORT:
+            # Genel seçicilerde (bestvideo[height<=720] gibi) aynı çözünürlükte container'a uyan akış seçilir
+            opts['format_sort'] = ['res', 'fps', CONTAINER_SORT[container]]
+    return opts
+
+class DownloadTask:
+    def __init__(self, url, format_id, selected_format, journal_id=None, weight=1.0, outtmpl=None, extra_opts=None, archive=None,
+                 defer_postprocess=False, info_json=None, media_key=None):
+        self.url = url
+        self.format_id = format_id
+        self.selected_format = selected_format
+        self.journal_id = journal_id
+        self.weight = weight
+        self.outtmpl = outtmpl
+        self.extra_opts = extra_opts
+        self.archive = get_setting('download_archive') if archive is None else archive
+        self.defer_postprocess = defer_postprocess
+        self.info_json = info_json
+        self.media_key = media_key
+        self.pending = []
+        self.info_rejected = False
+        self.filepath = None
+        self.meta = {}
+        self._skipped = 0
+        self._flow = None
+        self._seen_bytes = {}
+        self._totals = {}
+        self._phase = 'downloading'
+        self._bytes_lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._keep_partial = False
+        self._files = set()
+    def set_weight(self, weight):
+        self.weight = weight
+        if self._flow:
+            self._flow.weight = max(0.1, float(weight))
+    def cancel(self, keep_partial=False):
+        # keep_partial=True: duraklatma, .part dosyaları devam için bırakılır
+        self._keep_partial = keep_partial
+        self._cancel.set()
+    def progress_hook(self, d):
+        # Dosyalar iptalden önce kaydedilir; ilk hook çağrısında iptal edilen indirmenin .part'ı da temizlenir
+        for key in ('filename', 'tmpfilename'):
+            if d.get(key):
+                self._files.add(d[key])
+        if self._cancel.is_set():
+            from yt_dlp.utils import DownloadCancelled
+            raise DownloadCancelled()
+        if self.journal_id:
+            get_download_journal().update_progress(self.journal_id, d)
+        if d['status'] == 'downloading':
+            self._account(d)
+        elif d['status'] == 'finished':
+            self._phase = 'processing'
+            info = d.get('info_dict') or {}
+            # Geçmiş kaydı için: ilk biten parçanın başlık/kanal/thumbnail bilgisi yeterli
+            self.meta = self.meta or {'title': info.get('title'), 'channel': info.get('channel') or info.get('uploader'),
+                                      'thumbnail': info.get('thumbnail'), 'url': info.get('webpage_url')}
+    def _account(self, d):
+        # Hook her blokta çağrılır: burada sinyal yayılmaz, yalnızca sayaçlar güncellenir (UI örnekleyerek okur).
+        # Hook indirme thread'inde senkron çalıştığından bant genişliği beklemesi de burada yapılır.
+        key = d.get('tmpfilename') or d.get('filename')
+        done = d.get('downloaded_bytes') or 0
+        with self._bytes_lock:
+            self._phase = 'downloading'
+            last = self._seen_bytes.get(key)
+            self._seen_bytes[key] = max(done, last or 0)
+            total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            if total:
+                self._totals[key] = total
+        if last is not None and self._flow:
+            self._flow.consume(done - last, self._cancel)
+    def snapshot(self):
+        with self._bytes_lock:
+            return sum(self._seen_bytes.values()), sum(self._totals.values()), self._phase
+    def run(self):
+        # (başarılı mı, mesaj) döner; Qt thread'i ve CLI aynı çekirdeği kullanır
+        self._flow = get_bandwidth_scheduler().open_flow(self.weight)
+        try:
+            return self._run()
+        finally:
+            self._flow.close()
+    def postprocess_opts(self):
+        opts = build_download_opts(self.format_id, self.selected_format)
+        if self.outtmpl:
+            opts['outtmpl'] = self.outtmpl
+        opts.update(self.extra_opts or {})
+        return opts
+    def finish_postprocess(self, item, path):
+        # Havuzda tamamlanan son işlemden sonra: arşiv kaydı ana süreçte yazılır
+        self.filepath = path or self.filepath
+        if self.archive and path:
+            get_download_archive().record(extractor_key_for_info(item.info), format_key(self.format_id, self.selected_format),
+                                          item.info.get('webpage_url') or self.url, path)
+    def _run(self):
+        # yt_dlp ağır bir modül; pencere açılışını geciktirmemek için ilk kullanımda yüklenir
+        import yt_dlp
+        from yt_dlp.utils import DownloadCancelled
+        install_segmented_downloaders()
+        opts = self.postprocess_opts()
+        opts.update(segmented_opts())
+        opts.update(self.extra_opts or {})
+        opts['progress_hooks'] = [self.progress_hook]
+        opts['post_hooks'] = [self._on_file_ready]
+        archive = get_download_archive() if self.archive else None
+        fmt = format_key(self.format_id, self.selected_format)
+        if archive:
+            # Önizlemede extractor anahtarı öğrenildiyse bilinen öğe çıkarım yapılmadan atlanır
+            if archive.lookup(self.media_key, fmt):
+                return True, "Already downloaded"
+            opts['match_filter'] = self._archive_filter(archive, fmt)
+        ydl_class = _deferring_ydl_class(self) if self.defer_postprocess else yt_dlp.YoutubeDL
+        try:
+            with ydl_class(opts) as ydl:
+                container = container_for(self.selected_format)
+                if container:
+                    ydl.add_post_processor(container_postprocessor(container), when='post_process')
+                if archive:
+                    ydl.add_post_processor(archive_postprocessor(archive, fmt, self.url), when='after_move')
+                if not self.info_json or not self._download_from_info(ydl):
+                    ydl.download([self.url])
+            if self._skipped and not self._files:
+                return True, "Already downloaded"
+            return True, "Download complete"
+        except DownloadCancelled:
+            if not self._keep_partial:
+                self._cleanup()
+            return False, 'Cancelled'
+        except Exception as e:
+            if self._cancel.is_set():
+                if not self._keep_partial:
+                    self._cleanup()
+                return False, 'Cancelled'
+            return False, str(e)
+    def _on_file_ready(self, path):
+        # Son işlemden sonraki dosya adı; ertelenen son işlemde finish_postprocess günceller
+        self.filepath = path
+    def _download_from_info(self, ydl):
+        # yt-dlp'nin --load-info-json yolu: format seçimi ve indirme hazır bilgiyle yapılır.
+        # Yalnızca imzalı URL'ler reddedilirse (403/410, süresi dolmuş) False döner ve URL'den yeniden çıkarılır;
+        # format bulunamadı, disk dolu, son işlem hataları olduğu gibi yükselir
+        from yt_dlp.utils import DownloadError, ReExtractInfo
+        info = ydl.sanitize_info(json.loads(self.info_json), remove_private_keys=True)
+        try:
+            ydl.process_ie_result(info, download=True)
+            return True
+        except ReExtractInfo:
+            pass
+        except DownloadError as e:
+            if self._cancel.is_set() or not (_urls_expired(e) or _EXPIRED_MESSAGE.search(str(e))):
+                raise
+        self.info_rejected = True
+        return False
+    def _archive_filter(self, archive, fmt):
+        # Çıkarımdan sonra, indirmeden önce: playlist öğeleri dahil her video arşivde aranır
+        def check(info, incomplete=False):
+            if archive.lookup(extractor_key_for_info(info), fmt):
+                self._skipped += 1
+                return f"{info.get('title') or info.get('id')} already downloaded"
+            return None
+        return check
+    def partial_files(self):
+        return set(self._files)
+    def _cleanup(self):
+        remove_partial(self._files)
+
+def remove_partial(files):
+    # Yalnızca yarım parçalar silinir (.part, .ytdl, parça dosyaları); tamamlanmış dosyalara dokunulmaz
+    for name in files:
+        for path in glob.glob(glob.escape(name) + '*'):
+            if path.endswith(('.part', '.ytdl')) or '.part-Frag' in path:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+def get_available_formats():
+    return ["MP4", "WEBM", "MKV", "Audio Only (MP3)"]
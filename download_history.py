@@ -0,0 +1,103 @@
+"""
+VIGGA - İndirme Geçmişi
+Tamamlanan indirmeler SQLite'ta tutulur; görünüm satırları sayfa sayfa, sıralama indeksleri üzerinden okur.
+Arama başlık ve kanal üzerinde yapılır; tablo hiçbir zaman tümüyle belleğe alınmaz.
+"""
+import os
+import sqlite3
+import threading
+import time
+from settings import DATA_DIR
+
+HISTORY_PATH = os.path.join(DATA_DIR, 'history.sqlite3')
+COLUMNS = 'id, url, title, channel, format, path, size, thumbnail, created'
+
+# Sıralama: ORDER BY ifadesi, keyset karşılaştırması ve anahtar alanları
+ORDERS = {
+    'newest': ('created DESC, id DESC', '(created, id) < (?, ?)', ('created', 'id')),
+    'oldest': ('created ASC, id ASC', '(created, id) > (?, ?)', ('created', 'id')),
+    'title': ('title COLLATE NOCASE ASC, id ASC', '(title COLLATE NOCASE, id) > (?, ?)', ('title', 'id')),
+    'size': ('size DESC, id DESC', '(size, id) < (?, ?)', ('size', 'id')),
+}
+
+class DownloadHistory:
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('''CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY,
+            url TEXT,
+            title TEXT NOT NULL DEFAULT '',
+            channel TEXT NOT NULL DEFAULT '',
+            format TEXT,
+            path TEXT,
+            size INTEGER NOT NULL DEFAULT 0,
+            thumbnail TEXT,
+            created REAL NOT NULL)''')
+        # Her sıralama kendi indeksinden okunur; derin sayfalar da tablo taraması yapmaz
+        self._db.execute('CREATE INDEX IF NOT EXISTS history_created ON history(created, id)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS history_title ON history(title COLLATE NOCASE, id)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS history_size ON history(size, id)')
+        self._db.commit()
+    def add(self, url, title, channel='', fmt='', path=None, size=None, thumbnail=None, created=None):
+        if size is None and path:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+        # Geçmiş yazılamazsa (disk dolu, kilitli) indirme başarısız sayılmaz
+        try:
+            with self._lock:
+                cur = self._db.execute('INSERT INTO history (url, title, channel, format, path, size, thumbnail, created) '
+                                       'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                       (url, title or url or '', channel or '', fmt or '', os.path.abspath(path) if path else None,
+                                        size or 0, thumbnail, created or time.time()))
+                self._db.commit()
+                return cur.lastrowid
+        except sqlite3.Error:
+            return None
+    def count(self, search=''):
+        where, args = self._where(search)
+        with self._lock:
+            return self._db.execute(f'SELECT COUNT(*) FROM history{where}', args).fetchone()[0]
+    def page(self, limit, offset=0, search='', order='newest', after=None):
+        # after: önceki sayfanın son satırı; verilirse OFFSET yerine indeks üzerinden kaldığı yerden devam edilir
+        order_by, seek, key = ORDERS.get(order) or ORDERS['newest']
+        where, args = self._where(search)
+        if after is not None:
+            where = (where + ' AND ' if where else ' WHERE ') + seek
+            args += tuple(after[c] for c in key)
+            offset = 0
+        with self._lock:
+            cur = self._db.execute(f'SELECT {COLUMNS} FROM history{where} ORDER BY {order_by} LIMIT ? OFFSET ?',
+                                   args + (limit, offset))
+            names = [d[0] for d in cur.description]
+            return [dict(zip(names, row)) for row in cur.fetchall()]
+    def remove(self, entry_id):
+        with self._lock:
+            self._db.execute('DELETE FROM history WHERE id=?', (entry_id,))
+            self._db.commit()
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM history')
+            self._db.commit()
+    def _where(self, search):
+        search = (search or '').strip()
+        if not search:
+            return '', ()
+        pattern = '%' + search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return " WHERE (title LIKE ? ESCAPE '\\' OR channel LIKE ? ESCAPE '\\')", (pattern, pattern)
+
+_history = None
+_history_lock = threading.Lock()
+
+def get_download_history():
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = DownloadHistory()
+        return _history
@@ -0,0 +1,169 @@
+"""
+VIGGA - İndirme Günlüğü
+Yarım kalan indirmelerin URL, format, hedef dosya, bayt offset ve parça indeksleri diske yazılır;
+uygulama çöktükten ya da kapandıktan sonra son doğrulanmış offset'ten devam edilebilir.
+"""
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from settings import DATA_DIR
+
+JOURNAL_PATH = os.path.join(DATA_DIR, 'journal.json')
+FLUSH_INTERVAL = 1.0
+# Kurtarma için önemli geçişler hemen diske yazılır; kuyruğa ekleme ve ilerleme gecikmeli yazılır
+DURABLE_STATES = ('paused', 'failed')
+
+class DownloadJournal:
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._last_flush = 0.0
+        self._dirty = False
+        self._timer = None
+        self._load()
+    def record(self, url, format_id, selected_format, title='', journal_id=None):
+        return self.record_many([(url, format_id, selected_format, title, journal_id)])[0]
+    def record_many(self, items):
+        # items: (url, format_id, selected_format, title, journal_id); liste için tek yazım planlanır
+        ids = []
+        with self._lock:
+            for url, format_id, selected_format, title, journal_id in items:
+                journal_id = journal_id or uuid.uuid4().hex
+                entry = self._entries.setdefault(journal_id, {
+                    'id': journal_id,
+                    'url': url,
+                    'format_id': format_id,
+                    'selected_format': selected_format,
+                    'title': title,
+                    'files': {},
+                    'created': time.time(),
+                })
+                entry['state'] = 'queued'
+                ids.append(journal_id)
+            self._dirty = True
+            self._flush()
+        return ids
+    def update_progress(self, journal_id, d):
+        if not journal_id:
+            return
+        with self._lock:
+            entry = self._entries.get(journal_id)
+            if not entry:
+                return
+            entry['state'] = 'running'
+            if d.get('status') == 'finished':
+                for f in entry['files'].values():
+                    if f.get('filename') == d.get('filename'):
+                        f['complete'] = True
+                self._flush(force=True)
+                return
+            tmp = d.get('tmpfilename')
+            if not tmp:
+                return
+            info = d.get('info_dict') or {}
+            entry['files'].setdefault(tmp, {}).update({
+                'filename': d.get('filename'),
+                'format_id': info.get('format_id'),
+                'offset': d.get('downloaded_bytes') or 0,
+                'total': d.get('total_bytes') or d.get('total_bytes_estimate'),
+                'fragment_index': d.get('fragment_index'),
+                'fragment_count': d.get('fragment_count'),
+            })
+            self._dirty = True
+            self._flush()
+    def set_state(self, journal_id, state):
+        with self._lock:
+            entry = self._entries.get(journal_id)
+            if entry:
+                entry['state'] = state
+                self._dirty = True
+                self._flush(force=state in DURABLE_STATES)
+    def remove(self, journal_id):
+        with self._lock:
+            if self._entries.pop(journal_id, None):
+                self._flush(force=True)
+    def unfinished(self):
+        with self._lock:
+            return [dict(e) for e in self._entries.values()]
+    def prepare_resume(self, journal_id):
+        # Düz HTTP .part dosyası kayıtlı offset'ten uzunsa o noktaya kırpılır; son yazılan kuyruk
+        # çökme anında yarım kalmış olabilir. Parçalı indirmelerde devam bilgisini yt-dlp'nin .ytdl dosyası tutar.
+        with self._lock:
+            entry = self._entries.get(journal_id)
+            files = dict(entry['files']) if entry else {}
+        for tmp, f in files.items():
+            if f.get('complete') or f.get('fragment_count') or not os.path.exists(tmp):
+                continue
+            offset = f.get('offset') or 0
+            try:
+                if os.path.getsize(tmp) > offset:
+                    with open(tmp, 'r+b') as fh:
+                        fh.truncate(offset)
+            except OSError:
+                pass
+    def discard(self, journal_id):
+        with self._lock:
+            entry = self._entries.pop(journal_id, None)
+            self._flush(force=True)
+        for tmp, f in (entry or {}).get('files', {}).items():
+            if f.get('complete'):
+                continue
+            # Parçalı indirmeler (HLS/DASH, segmentli HTTP) .part-FragN dosyaları bırakır
+            for path in [tmp, tmp + '.ytdl'] + glob.glob(glob.escape(tmp) + '-Frag*'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    def flush(self):
+        with self._lock:
+            self._flush(force=True)
+    def _flush(self, force=False):
+        now = time.monotonic()
+        if not force and not self._dirty:
+            return
+        if not force and now - self._last_flush < FLUSH_INTERVAL:
+            # Aralık dolmadıysa son değişiklik kaybolmasın diye tek bir gecikmeli yazım planlanır
+            if self._timer is None:
+                self._timer = threading.Timer(FLUSH_INTERVAL - (now - self._last_flush), self._deferred_flush)
+                self._timer.daemon = True
+                self._timer.start()
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump(list(self._entries.values()), fh, ensure_ascii=False)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, self.path)
+            self._last_flush = now
+            self._dirty = False
+        except OSError:
+            pass
+    def _deferred_flush(self):
+        with self._lock:
+            self._timer = None
+            self._flush(force=self._dirty)
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        for entry in data:
+            if isinstance(entry, dict) and entry.get('id'):
+                self._entries[entry['id']] = entry
+
+_journal = None
+_journal_lock = threading.Lock()
+
+def get_download_journal():
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = DownloadJournal()
+        return _journal
@@ -0,0 +1,103 @@
+"""
+VIGGA - İndirme Kuyruğu
+Motor üzerinde ince Qt adaptörü: öncelik, öğe bazında duraklat/devam et ve iptal motorda yürür,
+olaylar GUI thread'ine sinyal olarak taşınır ve öğelerin kopyası burada tutulur.
+"""
+from PyQt5.QtCore import QObject, pyqtSignal
+from engine import QUEUED, RUNNING, PROCESSING, get_engine_thread
+
+class DownloadItem:
+    def __init__(self, snap):
+        self.item_id = snap['id']
+        self.url = snap['url']
+        self.update(snap)
+    def update(self, snap):
+        self.title = snap['title']
+        self.priority = snap['priority']
+        self.weight = snap['weight']
+        self.state = snap['state']
+        self.progress = snap['progress']
+        self.text = snap['text']
+
+class DownloadQueue(QObject):
+    item_added = pyqtSignal(int)
+    item_changed = pyqtSignal(int)
+    item_progress = pyqtSignal(int, int, str)
+    item_finished = pyqtSignal(int, str)
+    item_failed = pyqtSignal(int, str)
+    item_removed = pyqtSignal(int)
+    idle = pyqtSignal()
+    _engine_event = pyqtSignal(str, object)
+    def __init__(self, max_workers=None, parent=None):
+        super().__init__(parent)
+        self._host = get_engine_thread()
+        self._engine = self._host.engine
+        self._items = {}
+        # Motor callback'leri kendi thread'inde çalışır; sinyal kuyruklu bağlantıyla GUI thread'ine geçer
+        self._engine_event.connect(self._on_engine_event)
+        self._host.call(self._engine.subscribe, lambda event, job: self._engine_event.emit(event, job.snapshot() if job else None))
+        if max_workers:
+            self.set_max_workers(max_workers)
+    def items(self):
+        return list(self._items.values())
+    def item(self, item_id):
+        return self._items.get(item_id)
+    def active_count(self):
+        return sum(1 for it in self._items.values() if it.state == RUNNING)
+    def pending_count(self):
+        return sum(1 for it in self._items.values() if it.state in (QUEUED, RUNNING, PROCESSING))
+    def processing_count(self):
+        return sum(1 for it in self._items.values() if it.state == PROCESSING)
+    def set_max_workers(self, n):
+        self._host.call(self._engine.set_max_parallel, n)
+    def add(self, url, format_id, selected_format, title='', priority=0, journal_id=None, weight=1.0):
+        return self.add_many([{'url': url, 'format_id': format_id, 'selected_format': selected_format, 'title': title,
+                               'priority': priority, 'journal_id': journal_id, 'weight': weight}])
+    def add_many(self, items):
+        # Liste motora tek istekle gider ve GUI beklemez: anahtar eşleştirmesi motorda sürer, satırlar 'added' olayıyla açılır.
+        # Aynı medya zaten kuyruktaysa yeni satır açılmaz. Dönen future iş id'lerini verir
+        return self._host.submit(self._add_many(items))
+    async def _add_many(self, items):
+        return [job.job_id for job in await self._engine.add_many(items)]
+    def set_priority(self, item_id, priority):
+        self._host.call(self._engine.set_priority, item_id, priority)
+    def set_weight(self, item_id, weight):
+        self._host.call(self._engine.set_weight, item_id, weight)
+    def pause(self, item_id):
+        self._host.call(self._engine.pause, item_id)
+    def resume(self, item_id):
+        self._host.call(self._engine.resume, item_id)
+    def cancel(self, item_id):
+        self._host.call(self._engine.cancel, item_id)
+    def remove(self, item_id):
+        self._host.call(self._engine.remove, item_id)
+    def clear_finished(self):
+        self._host.call(self._engine.clear_finished)
+    def cancel_all(self):
+        self._host.call(self._engine.cancel_all)
+    def shutdown(self):
+        # Uygulama kapanırken: çalışanlar duraklatılır, .part dosyaları sonraki açılış için kalır
+        self._host.stop()
+    def _on_engine_event(self, event, snap):
+        if event == 'idle':
+            self.idle.emit()
+            return
+        if event == 'added':
+            self._items[snap['id']] = DownloadItem(snap)
+            self.item_added.emit(snap['id'])
+            return
+        item = self._items.get(snap['id'])
+        if item is None:
+            return
+        item.update(snap)
+        if event == 'changed':
+            self.item_changed.emit(item.item_id)
+        elif event == 'progress':
+            self.item_progress.emit(item.item_id, item.progress, item.text)
+        elif event == 'finished':
+            self.item_finished.emit(item.item_id, snap['message'])
+        elif event == 'failed':
+            self.item_failed.emit(item.item_id, snap['message'])
+        elif event == 'removed':
+            del self._items[item.item_id]
+            self.item_removed.emit(item.item_id)
@@ -0,0 +1,591 @@
+"""
+VIGGA - İndirme Motoru
+Çıkarım, zamanlama, indirme ve iptal asyncio üzerinde, Qt'den bağımsız çalışır.
+Bekleyen işler thread değil coroutine'dir; ilerleme callback ya da async iterator ile okunur.
+ffmpeg son işlemi indirme slotunu tutmaz, ayrı süreç havuzunda sıraya girer.
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from settings import get_setting
+from download_core import DownloadTask, remove_partial
+from download_journal import get_download_journal
+from download_history import get_download_history
+from format_planner import observe_bandwidth
+from bandwidth import get_bandwidth_scheduler
+from metadata_cache import get_metadata_cache, canonical_url
+from media_info import _human_bytes, probe_targets, apply_probed_sizes
+from size_prober import probe_sizes
+from info_store import get_info_store
+from extractor_pool import get_extractor_pool, match_urls
+from postprocess import get_postprocess_pool
+
+QUEUED = 'queued'
+RUNNING = 'running'
+PROCESSING = 'processing'
+PAUSED = 'paused'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+PENDING_STATES = (QUEUED, RUNNING, PROCESSING)
+
+PROGRESS_HZ = 5
+SPEED_ALPHA = 0.3
+# yt-dlp indirmesi bloklayan bir çağrı; thread yalnızca çalışan iş için açılır, sıradakiler coroutine olarak bekler
+EXECUTOR_THREADS = 64
+
+def format_eta(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+def render_progress(done, total, phase, speed):
+    if phase == 'processing':
+        return 100, "Processing…"
+    value = min(100, int(done * 100 / total)) if total else 0
+    parts = [f"{_human_bytes(done)} / {_human_bytes(total)}" if total else _human_bytes(done)]
+    if speed:
+        parts.append(f"{_human_bytes(speed)}/s")
+        if total and total > done:
+            parts.append(format_eta((total - done) / speed))
+    return value, '  '.join(parts)
+
+class Job:
+    def __init__(self, job_id, url, format_id, selected_format, title='', priority=0, journal_id=None, weight=1.0, outtmpl=None, archive=None):
+        self.job_id = job_id
+        self.url = url
+        self.format_id = format_id
+        self.selected_format = selected_format
+        self.title = title or url
+        self.priority = priority
+        self.journal_id = journal_id
+        self.weight = weight
+        self.outtmpl = outtmpl
+        self.archive = archive
+        self.key = None
+        self.state = QUEUED
+        self.progress = 0
+        self.text = ''
+        self.message = ''
+        self.downloaded = 0
+        self.total = 0
+        self.phase = None
+        self.speed = None
+        self.task = None
+        self.result = None
+        # Duraklatma/hata sonrası bırakılan yarım dosyalar; iptalde silinir
+        self.partial = set()
+        self.pause_requested = False
+        self._last = None
+        self._shown = None
+        self._settled = asyncio.Event()
+        self._queues = []
+    def snapshot(self):
+        eta = (self.total - self.downloaded) / self.speed if self.speed and self.total > self.downloaded else None
+        return {
+            'id': self.job_id, 'url': self.url, 'title': self.title, 'state': self.state,
+            'priority': self.priority, 'weight': self.weight, 'progress': self.progress, 'text': self.text,
+            'message': self.message, 'phase': self.phase, 'downloaded': self.downloaded,
+            'total': self.total or None, 'speed': round(self.speed) if self.speed is not None else None,
+            'eta': round(eta) if eta is not None else None,
+        }
+    async def wait(self):
+        # DONE, FAILED ya da CANCELLED olana kadar bekler
+        await self._settled.wait()
+        return self.state
+    async def events(self):
+        queue = asyncio.Queue()
+        self._queues.append(queue)
+        try:
+            while True:
+                event, snap = await queue.get()
+                yield event, snap
+                if event in ('finished', 'failed', 'removed'):
+                    break
+        finally:
+            self._queues.remove(queue)
+
+class SharedExtraction:
+    # Aynı medyaya eşzamanlı gelen çıkarımlar tek havuz isteğini paylaşır; geç katılan önceki ilerleme ve liste parçalarını alır
+    def __init__(self):
+        self.task = None
+        self.progress = None
+        self.batches = []
+        self.listeners = []
+    def join(self, progress, entries):
+        if progress and self.progress is not None:
+            progress(self.progress)
+        if entries:
+            for batch in self.batches:
+                entries(batch)
+        listener = (progress, entries)
+        self.listeners.append(listener)
+        return listener
+    def leave(self, listener):
+        self.listeners.remove(listener)
+    def on_progress(self, value):
+        self.progress = value
+        for progress, _ in list(self.listeners):
+            if progress:
+                progress(value)
+    def on_entries(self, batch):
+        self.batches.append(batch)
+        for _, entries in list(self.listeners):
+            if entries:
+                entries(batch)
+
+class DownloadEngine:
+    # Tüm metotlar motorun event loop thread'inde çağrılır; başka thread'lerden EngineThread.call kullanılır
+    def __init__(self, max_parallel=None, journal=True, hz=PROGRESS_HZ, history=True, extractor_pool=True):
+        self.max_parallel = max(1, int(max_parallel or get_setting('max_parallel_downloads')))
+        self.hz = hz
+        self.closed = False
+        self._journal = get_download_journal() if journal is True else (journal or None)
+        self._history = get_download_history() if history is True else (history or None)
+        # Havuz yoksa (CLI) URL eşleştirmesi bu süreçte, executor'da yapılır
+        self._pool = get_extractor_pool() if extractor_pool is True else (extractor_pool or None)
+        self._jobs = {}
+        self._pending = 0
+        # Bitmemiş işler (kanonik anahtar, format, seçim, hedef) ile indekslenir; tekilleştirme taramasız yapılır
+        self._unfinished = {}
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._callbacks = []
+        self._running = {}
+        self._processing = {}
+        self._pp_pool = get_postprocess_pool()
+        self._pp_slots = asyncio.Semaphore(self._pp_pool.size)
+        self._pp_waiting = []
+        self._executor = ThreadPoolExecutor(max_workers=EXECUTOR_THREADS, thread_name_prefix='vigga-dl')
+        self._ticker = None
+        self._extractions = {}
+        self._idle = asyncio.Event()
+        self._idle.set()
+    def subscribe(self, callback):
+        # callback(event, job); event: added, changed, progress, finished, failed, removed, idle (job=None)
+        self._callbacks.append(callback)
+    def jobs(self):
+        return list(self._jobs.values())
+    def job(self, job_id):
+        return self._jobs.get(job_id)
+    def active_count(self):
+        return len(self._running)
+    def pending_count(self):
+        return self._pending
+    def processing_count(self):
+        return len(self._processing)
+    def set_max_parallel(self, n):
+        self.max_parallel = max(1, int(n))
+        self._pump()
+    def find_duplicate(self, key, format_id, selected_format, outtmpl=None):
+        # Aynı medya (kanonik anahtar), format ve hedef için bitmemiş iş varsa o döner
+        return self._unfinished.get((key, format_id, selected_format, outtmpl))
+    async def media_keys(self, urls):
+        # Önbellekte takma adı olan URL'nin anahtarı, yoksa extractor eşleşmesi ("Youtube:<id>"), o da yoksa temiz URL.
+        # Böylece youtu.be ve watch?v= biçimleri ilk çıkarımdan önce de aynı anahtara düşer
+        loop = asyncio.get_running_loop()
+        cache = get_metadata_cache()
+        keys = await loop.run_in_executor(None, lambda: [cache.media_key(url) for url in urls])
+        missing = [canonical_url(url) for url, key in zip(urls, keys) if not key]
+        if missing:
+            try:
+                if self._pool:
+                    matched = await asyncio.wrap_future(self._pool.match(missing))
+                else:
+                    matched = await loop.run_in_executor(None, match_urls, missing)
+            except Exception:
+                matched = [None] * len(missing)
+            found = iter(matched)
+            keys = [key or next(found) for key in keys]
+        return [key or canonical_url(url) for url, key in zip(urls, keys)]
+    async def add(self, url, format_id, selected_format, title='', priority=0, journal_id=None, weight=1.0, outtmpl=None,
+                  archive=None, key=None):
+        return (await self.add_many([{'url': url, 'format_id': format_id, 'selected_format': selected_format, 'title': title,
+                                      'priority': priority, 'journal_id': journal_id, 'weight': weight, 'outtmpl': outtmpl,
+                                      'archive': archive, 'key': key}]))[0]
+    async def add_many(self, items):
+        # items: add() argümanlarından oluşan dict'ler (değiştirilmez). Anahtarlar tek istekte çözülür,
+        # yeni işler günlüğe tek yazımla girer; aynı medya için mevcut iş döner
+        items = [dict(item) for item in items]
+        unresolved = [item for item in items if not item.get('key')]
+        if unresolved:
+            for item, key in zip(unresolved, await self.media_keys([item['url'] for item in unresolved])):
+                item['key'] = key
+        fresh, seen = [], set()
+        for item in items:
+            dedupe = (item['key'], item['format_id'], item['selected_format'], item.get('outtmpl'))
+            if dedupe not in seen and dedupe not in self._unfinished:
+                seen.add(dedupe)
+                fresh.append(item)
+        if self._journal and fresh:
+            ids = self._journal.record_many([(it['url'], it['format_id'], it['selected_format'], it.get('title', ''),
+                                              it.get('journal_id')) for it in fresh])
+            for item, journal_id in zip(fresh, ids):
+                item['journal_id'] = journal_id
+        jobs = [self._add(**item) for item in items]
+        self._pump()
+        return jobs
+    def _add(self, url, format_id, selected_format, title='', priority=0, journal_id=None, weight=1.0, outtmpl=None,
+             archive=None, key=None):
+        # Anahtar çözülmüş ve günlüğe yazılmış olarak gelir
+        existing = self.find_duplicate(key, format_id, selected_format, outtmpl)
+        if existing:
+            return existing
+        job = Job(next(self._ids), url, format_id, selected_format, title, priority, journal_id, weight, outtmpl, archive)
+        job.key = key
+        self._jobs[job.job_id] = job
+        self._unfinished[self._dedupe_key(job)] = job
+        self._pending += 1
+        self._push(job)
+        self._emit('added', job)
+        return job
+    def set_priority(self, job_id, priority):
+        job = self._jobs.get(job_id)
+        if not job:
+            return
+        job.priority = priority
+        if job.state == QUEUED:
+            # Eski heap kaydı _pop_next içinde tembel olarak atlanır
+            self._push(job)
+        self._emit('changed', job)
+    def set_weight(self, job_id, weight):
+        # Çalışan indirmenin payı bir sonraki hook çağrısında güncellenir
+        job = self._jobs.get(job_id)
+        if not job:
+            return
+        job.weight = weight
+        if job.task:
+            job.task.set_weight(weight)
+        self._emit('changed', job)
+    def pause(self, job_id):
+        job = self._jobs.get(job_id)
+        if not job:
+            return
+        if job.state == RUNNING and job.task:
+            job.pause_requested = True
+            job.task.cancel(keep_partial=True)
+        elif job.state == QUEUED:
+            self._set_state(job, PAUSED)
+            self._pump()
+    def resume(self, job_id):
+        job = self._jobs.get(job_id)
+        if job and job.state in (PAUSED, FAILED):
+            self._set_state(job, QUEUED)
+            self._push(job)
+            self._pump()
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if not job:
+            return
+        if job.state == RUNNING and job.task:
+            job.task.cancel()
+        elif job.state == PROCESSING:
+            # Sıradaki dönüştürme hiç başlamaz; süren ffmpeg süreci bitirilir ama iş iptal sayılır
+            self._processing[job_id].cancel()
+        elif job.state in (QUEUED, PAUSED, FAILED):
+            self._set_state(job, CANCELLED)
+            if job.partial:
+                # Duraklatmanın sakladığı .part dosyaları; günlük kapalıyken (CLI) başka silen yok
+                files, job.partial = job.partial, set()
+                asyncio.get_running_loop().run_in_executor(None, remove_partial, files)
+            self.remove(job_id)
+            self._pump()
+    def remove(self, job_id):
+        job = self._jobs.get(job_id)
+        if job and job.state not in (RUNNING, PROCESSING):
+            del self._jobs[job_id]
+            self._forget_unfinished(job)
+            if job.state == QUEUED:
+                self._pending -= 1
+            if job.state != DONE and self._journal:
+                self._journal.discard(job.journal_id)
+            job._settled.set()
+            self._emit('removed', job)
+    def clear_finished(self):
+        for job_id in [i for i, j in self._jobs.items() if j.state in (DONE, CANCELLED)]:
+            self.remove(job_id)
+    def cancel_all(self):
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+    async def join(self):
+        # Kuyruk boşalana (ya da kapanışta çalışanlar durana) kadar bekler
+        await self._idle.wait()
+    async def shutdown(self):
+        # Kapanış: çalışanlar duraklatılır, .part dosyaları ve günlük sonraki açılış için kalır
+        self.closed = True
+        for job in list(self._jobs.values()):
+            if job.state == RUNNING and job.task:
+                job.pause_requested = True
+                job.task.cancel(keep_partial=True)
+        for job_id, task in self._processing.items():
+            self._jobs[job_id].pause_requested = True
+            task.cancel()
+        pending = list(self._running.values()) + list(self._processing.values())
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._journal:
+            for job in self._jobs.values():
+                if job.state in (QUEUED, PAUSED):
+                    self._journal.set_state(job.journal_id, PAUSED)
+            self._journal.flush()
+        self._idle.set()
+        self._executor.shutdown(wait=False)
+        self._pp_pool.shutdown()
+    async def extract(self, url, progress=None, entries=None):
+        # Aynı kanonik anahtar için uçuşta bir çıkarım varsa ona katılınır; bir çağıranın iptali ortak işi durdurmaz
+        loop = asyncio.get_running_loop()
+        key, = await self.media_keys([url])
+        shared = self._extractions.get(key)
+        if shared is None:
+            shared = self._extractions[key] = SharedExtraction()
+            shared.task = loop.create_task(self._extract(url, key, shared))
+            shared.task.add_done_callback(lambda _: self._extractions.pop(key) if self._extractions.get(key) is shared else None)
+        listener = shared.join(progress, entries)
+        try:
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.leave(listener)
+    async def _extract(self, url, key, shared):
+        # Ağır çıkarım extractor havuzunda; callback'ler motor thread'ine taşınır
+        loop = asyncio.get_running_loop()
+        cache = get_metadata_cache()
+        cached = await loop.run_in_executor(None, cache.get, key)
+        if cached:
+            shared.on_progress(100)
+            return cached
+        relay = lambda cb: (lambda value: loop.call_soon_threadsafe(cb, value))
+        future = (self._pool or get_extractor_pool()).submit(url, progress=relay(shared.on_progress), entries=relay(shared.on_entries))
+        with get_bandwidth_scheduler().interactive():
+            result = await asyncio.wrap_future(future)
+        # Worker'ın bulduğu extractor anahtarına kanonik URL bağlanır; sonraki aramalar regex çalıştırmaz
+        await loop.run_in_executor(None, cache.put, result['key'], result['payload'], result['expires'], url)
+        # Tam bilgi indirme için saklanır; süresi format URL'lerinin imza süresiyle sınırlı
+        get_info_store().put(result['key'] or key, result.get('info_json'), result['expires'])
+        shared.on_progress(100)
+        return result['payload']
+    async def probe_sizes(self, url, payload):
+        # Kalite listesi beklemeden gösterilir; kesin boyutlar sonradan önbelleğe ve arayüze yansır
+        targets = probe_targets(payload)
+        if not targets:
+            return None
+        loop = asyncio.get_running_loop()
+        sizes = await loop.run_in_executor(None, probe_sizes, targets)
+        if not sizes:
+            return None
+        payload = apply_probed_sizes(payload, sizes)
+        cache = get_metadata_cache()
+        await loop.run_in_executor(None, cache.update_for_url, url, payload)
+        return payload
+    def _emit(self, event, job=None):
+        for callback in list(self._callbacks):
+            callback(event, job)
+        if job is not None and job._queues:
+            snap = job.snapshot()
+            for queue in job._queues:
+                queue.put_nowait((event, snap))
+    def _push(self, job):
+        heapq.heappush(self._heap, (-job.priority, next(self._seq), job.job_id, job.priority))
+    def _pop_next(self):
+        while self._heap:
+            _, _, job_id, priority = heapq.heappop(self._heap)
+            job = self._jobs.get(job_id)
+            if job and job.state == QUEUED and job.priority == priority:
+                return job
+        return None
+    def _pump(self):
+        while not self.closed and len(self._running) < self.max_parallel:
+            job = self._pop_next()
+            if not job:
+                break
+            self._start(job)
+        if self._running or self._processing or (not self.closed and self.pending_count()):
+            self._idle.clear()
+        else:
+            self._idle.set()
+            self._emit('idle')
+    def _start(self, job):
+        job.task = DownloadTask(job.url, job.format_id, job.selected_format, job.journal_id, job.weight, job.outtmpl,
+                                archive=job.archive, defer_postprocess=True, info_json=get_info_store().get(job.key),
+                                media_key=job.key)
+        job._last = None
+        job.speed = None
+        self._set_state(job, RUNNING)
+        self._running[job.job_id] = asyncio.get_running_loop().create_task(self._run(job))
+        if self._ticker is None:
+            self._ticker = asyncio.get_running_loop().create_task(self._tick())
+    async def _run(self, job):
+        loop = asyncio.get_running_loop()
+        try:
+            ok, message = await loop.run_in_executor(self._executor, job.task.run)
+        except Exception as e:
+            ok, message = False, str(e)
+        self._sample_job(job, time.monotonic())
+        del self._running[job.job_id]
+        task, job.task = job.task, None
+        job.result = task
+        if task.info_rejected:
+            # Süresi dolmuş çıkarım depodan düşer; aynı anahtarlı sonraki iş ölü URL'leri denemez
+            get_info_store().discard(job.key)
+        if ok and task.pending:
+            # İndirme slotu burada boşalır; sıradaki ağ aktarımı dönüştürmeyi beklemeden başlar
+            self._set_state(job, PROCESSING)
+            self._processing[job.job_id] = loop.create_task(self._postprocess(job, task, message))
+        else:
+            self._finish(job, ok, message)
+        self._pump()
+    async def _postprocess(self, job, task, message):
+        # Havuz CPU sayısı kadar süreç çalıştırır; semafor sayesinde bekleyenler burada sıralı görünür
+        ok = False
+        self._pp_waiting.append(job)
+        self._show_pp_queue()
+        try:
+            async with self._pp_slots:
+                self._pp_waiting.remove(job)
+                self._show_pp_queue()
+                job.progress, job.text = 100, "Processing…"
+                self._emit('progress', job)
+                for item in task.pending:
+                    path = await asyncio.wrap_future(self._pp_pool.submit(item))
+                    await asyncio.get_running_loop().run_in_executor(None, task.finish_postprocess, item, path)
+            ok = True
+        except asyncio.CancelledError:
+            message = 'Cancelled'
+        except Exception as e:
+            message = str(e)
+        finally:
+            if job in self._pp_waiting:
+                self._pp_waiting.remove(job)
+                self._show_pp_queue()
+        del self._processing[job.job_id]
+        self._finish(job, ok, message)
+        self._pump()
+    def _show_pp_queue(self):
+        for position, job in enumerate(self._pp_waiting, 1):
+            text = f"Waiting to process (#{position})"
+            if job.text != text:
+                job.progress, job.text = 100, text
+                self._emit('progress', job)
+    def _finish(self, job, ok, message):
+        task, job.result = job.result, None
+        if task and not ok:
+            job.partial |= task.partial_files()
+        if ok:
+            job.partial.clear()
+            job.progress = 100
+            job.message = message
+            if self._history and task and task.filepath:
+                self._record_history(job, task)
+            self._set_state(job, DONE)
+            self._emit('finished', job)
+        elif message == 'Cancelled':
+            paused = job.pause_requested
+            job.pause_requested = False
+            self._set_state(job, PAUSED if paused else CANCELLED)
+            if not paused:
+                self.remove(job.job_id)
+        else:
+            job.message = job.text = message
+            self._set_state(job, FAILED)
+            self._emit('failed', job)
+    def _record_history(self, job, task):
+        # Yalnızca gerçekten dosya üreten indirmeler; arşivden atlananların dosyası yoktur
+        meta = task.meta
+        self._history.add(meta.get('url') or job.url, meta.get('title') or job.title, meta.get('channel'),
+                          job.selected_format, task.filepath, thumbnail=meta.get('thumbnail'))
+    def _dedupe_key(self, job):
+        return (job.key, job.format_id, job.selected_format, job.outtmpl)
+    def _forget_unfinished(self, job):
+        if self._unfinished.get(self._dedupe_key(job)) is job:
+            del self._unfinished[self._dedupe_key(job)]
+    def _set_state(self, job, state):
+        self._pending += (state in PENDING_STATES) - (job.state in PENDING_STATES)
+        job.state = state
+        if state in (DONE, FAILED, CANCELLED):
+            self._forget_unfinished(job)
+        else:
+            self._unfinished.setdefault(self._dedupe_key(job), job)
+        if self._journal:
+            if state == DONE:
+                self._journal.remove(job.journal_id)
+            elif state in (QUEUED, PAUSED, FAILED):
+                self._journal.set_state(job.journal_id, state)
+        if state in (DONE, FAILED, CANCELLED):
+            job._settled.set()
+        else:
+            job._settled.clear()
+        self._emit('changed', job)
+    async def _tick(self):
+        # Tek bir coroutine tüm çalışan işleri sabit hızda örnekler; hook başına olay üretilmez
+        try:
+            while self._running:
+                await asyncio.sleep(1 / self.hz)
+                now = time.monotonic()
+                total_speed = 0
+                for job in [self._jobs.get(i) for i in list(self._running)]:
+                    if job is None or job.task is None:
+                        continue
+                    if self._sample_job(job, now):
+                        self._emit('progress', job)
+                    total_speed += job.speed or 0
+                observe_bandwidth(total_speed)
+        finally:
+            self._ticker = None
+    def _sample_job(self, job, now):
+        if job.task is None:
+            return False
+        done, total, phase = job.task.snapshot()
+        if job._last is not None and now > job._last[1]:
+            inst = max(0, done - job._last[0]) / (now - job._last[1])
+            job.speed = inst if job.speed is None else job.speed + SPEED_ALPHA * (inst - job.speed)
+        job._last = (done, now)
+        job.downloaded, job.total, job.phase = done, total, phase
+        job.progress, job.text = render_progress(done, total, phase, job.speed)
+        if (job.progress, job.text) == job._shown:
+            return False
+        job._shown = (job.progress, job.text)
+        return True
+
+class EngineThread:
+    # Motoru kendi event loop'uyla arka plan thread'inde çalıştırır; GUI gibi senkron çağıranlar için köprü
+    def __init__(self, **engine_kwargs):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._main, name='vigga-engine', daemon=True)
+        self._thread.start()
+        self.engine = self.call(lambda: DownloadEngine(**engine_kwargs))
+    def _main(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    def call(self, fn, *args, **kwargs):
+        if threading.current_thread() is self._thread:
+            return fn(*args, **kwargs)
+        future = Future()
+        def invoke():
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+        self.loop.call_soon_threadsafe(invoke)
+        return future.result()
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+    def stop(self, timeout=None):
+        if not self.loop.is_running():
+            return
+        self.submit(self.engine.shutdown()).result(timeout)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+_engine_thread = None
+_engine_lock = threading.Lock()
+
+def get_engine_thread():
+    global _engine_thread
+    with _engine_lock:
+        if _engine_thread is None:
+            _engine_thread = EngineThread()
+        return _engine_thread
@@ -0,0 +1,244 @@
+"""
+VIGGA - Extractor Süreç Havuzu
+yt-dlp çıkarımı GUI sürecinin GIL'ini meşgul etmesin diye uzun ömürlü worker süreçlerinde çalışır.
+Her worker kendi YoutubeDL örneğini sıcak tutar; istekler kuyrukla gider, küçültülmüş sonuç ve
+indirmenin yeniden çıkarım yapmadan kullanacağı tam info JSON'u geri akar.
+"""
+import itertools
+import json
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from settings import get_setting
+from media_info import reduce_info, reduce_entry, reduce_playlist
+
+EXTRACT_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'skip_download': True,
+    'noplaylist': True,
+    'extract_flat': 'in_playlist',
+    'lazy_playlist': True,
+}
+ENTRY_BATCH_SIZE = 25
+ENTRY_BATCH_INTERVAL = 0.25
+REAP_INTERVAL = 0.5
+
+_matchers = None
+
+def match_urls(urls):
+    # Çıkarım yapmadan extractor'ın URL kalıbı ve id'si: "Youtube:<id>". Generic her URL'ye uyduğu için anahtar üretmez
+    global _matchers
+    if _matchers is None:
+        from yt_dlp.extractor import gen_extractor_classes
+        _matchers = [ie for ie in gen_extractor_classes() if ie.ie_key() != 'Generic']
+    return [_match_url(url) for url in urls]
+
+def _match_url(url):
+    for ie in _matchers:
+        try:
+            if not ie.suitable(url):
+                continue
+            video_id = ie.get_temp_id(url)
+        except Exception:
+            continue
+        return f"{ie.ie_key()}:{video_id}" if video_id else None
+    return None
+
+def _stream_entries(req_id, info, results):
+    # Liste elemanları bulundukça küçük gruplar halinde gönderilir; tam info dict'leri tutulmaz
+    batch = []
+    count = 0
+    last_flush = time.monotonic()
+    for entry in info.get('entries') or []:
+        if not entry:
+            continue
+        count += 1
+        batch.append(reduce_entry(entry, count))
+        if count == 1 or len(batch) >= ENTRY_BATCH_SIZE or time.monotonic() - last_flush >= ENTRY_BATCH_INTERVAL:
+            results.put(('entries', req_id, batch))
+            batch = []
+            last_flush = time.monotonic()
+    if batch:
+        results.put(('entries', req_id, batch))
+    return count
+
+def _worker_main(requests, results):
+    import yt_dlp
+    from metadata_cache import extractor_key_for_info, expiry_for_info
+    ydl = yt_dlp.YoutubeDL(dict(EXTRACT_OPTS))
+    default_ttl = get_setting('metadata_cache_ttl_hours') * 3600
+    match_urls([])
+    while True:
+        job = requests.get()
+        if job is None:
+            break
+        kind, req_id, url = job
+        try:
+            if kind == 'match':
+                results.put(('result', req_id, match_urls(url)))
+                continue
+            results.put(('progress', req_id, 30))
+            info = ydl.extract_info(url, download=False, process=False)
+            if info.get('_type') in ('playlist', 'multi_video'):
+                count = _stream_entries(req_id, info, results)
+                results.put(('result', req_id, {'payload': reduce_playlist(info, count), 'key': None, 'expires': None}))
+                continue
+            info = ydl.process_ie_result(info, download=False)
+            results.put(('progress', req_id, 70))
+            results.put(('result', req_id, {
+                'payload': reduce_info(info),
+                'key': extractor_key_for_info(info),
+                'expires': expiry_for_info(info, default_ttl),
+                # Tek string olarak taşınır: kuyrukta ucuz, ana süreçte indirme thread'ine kadar çözülmez
+                'info_json': json.dumps(ydl.sanitize_info(info)),
+            }))
+        except Exception as e:
+            results.put(('error', req_id, str(e)))
+    ydl.close()
+
+class ExtractorPool:
+    def __init__(self, size=None):
+        self.size = max(1, int(size or get_setting('extractor_workers')))
+        self._ctx = multiprocessing.get_context('spawn')
+        self._results = None
+        # pid -> [süreç, kendi istek kuyruğu, elindeki istek]; her isteğin hangi worker'da olduğu bilinir
+        self._workers = {}
+        self._pending = deque()
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._dispatcher = None
+        self._closed = False
+    def start(self):
+        with self._lock:
+            if self._workers or self._closed:
+                return
+            self._results = self._ctx.Queue()
+            for _ in range(self.size):
+                self._spawn()
+            self._dispatcher = threading.Thread(target=self._dispatch, name='extractor-dispatch', daemon=True)
+            self._dispatcher.start()
+    def submit(self, url, progress=None, entries=None):
+        return self._submit('extract', url, progress, entries)
+    def match(self, urls):
+        # Yalnızca URL kalıbı eşleştirilir (birkaç ms); bekleyen çıkarımların önüne alınır
+        return self._submit('match', list(urls), front=True)
+    def shutdown(self, timeout=2.0):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers.values())
+            self._pending.clear()
+        for _, inbox, _ in workers:
+            inbox.put(None)
+        for proc, _, _ in workers:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        self._fail_all('Extractor pool closed')
+    def _submit(self, kind, value, progress=None, entries=None, front=False):
+        self.start()
+        future = Future()
+        with self._lock:
+            if self._closed:
+                # Kapanmış havuz isteği hiç okumaz; bekleyen hiç çözülmeyecek future'a takılmasın
+                future.set_exception(RuntimeError('Extractor pool closed'))
+                return future
+            req_id = next(self._ids)
+            self._jobs[req_id] = (future, progress, entries)
+            request = (kind, req_id, value)
+            if front:
+                self._pending.appendleft(request)
+            else:
+                self._pending.append(request)
+            self._assign()
+        return future
+    def _assign(self):
+        # Kilit altında çağrılır: boştaki worker'lara sıradaki istekler verilir
+        for worker in self._workers.values():
+            if not self._pending:
+                break
+            if worker[2] is None:
+                request = self._pending.popleft()
+                worker[2] = request[1]
+                worker[1].put(request)
+    def _spawn(self):
+        inbox = self._ctx.Queue()
+        proc = self._ctx.Process(target=_worker_main, args=(inbox, self._results), daemon=True)
+        proc.start()
+        self._workers[proc.pid] = [proc, inbox, None]
+    def _dispatch(self):
+        while not self._closed:
+            try:
+                message = self._results.get(timeout=REAP_INTERVAL)
+            except queue.Empty:
+                message = None
+            except (EOFError, OSError):
+                break
+            # Sonuçlar hiç durmasa da ölen worker her turda fark edilir
+            self._reap()
+            if message:
+                self._handle(*message)
+    def _handle(self, kind, req_id, value):
+        with self._lock:
+            job = self._jobs.get(req_id)
+            if kind in ('result', 'error'):
+                self._jobs.pop(req_id, None)
+                for worker in self._workers.values():
+                    if worker[2] == req_id:
+                        worker[2] = None
+                self._assign()
+        if job:
+            future, progress, entries = job
+            if kind == 'progress' and progress:
+                progress(value)
+            elif kind == 'entries' and entries:
+                entries(value)
+            elif kind == 'result' and not future.cancelled():
+                future.set_result(value)
+            elif kind == 'error' and not future.cancelled():
+                future.set_exception(RuntimeError(value))
+    def _reap(self):
+        # Çöken worker'a verilmiş istek (başlamış olsun olmasın) hata ile biter, yerine yenisi başlar
+        lost = []
+        with self._lock:
+            for pid, (proc, _, req_id) in list(self._workers.items()):
+                if proc.is_alive():
+                    continue
+                del self._workers[pid]
+                job = self._jobs.pop(req_id, None) if req_id else None
+                if job:
+                    lost.append(job[0])
+                if not self._closed:
+                    self._spawn()
+            self._assign()
+        for future in lost:
+            if not future.done():
+                future.set_exception(RuntimeError('Extractor worker exited'))
+    def _fail_all(self, message):
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for future, _, _ in jobs:
+            if not future.done():
+                future.set_exception(RuntimeError(message))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_extractor_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ExtractorPool()
+        return _pool
+
+def shutdown_extractor_pool():
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
@@ -0,0 +1,81 @@
+"""
+VIGGA - Bilgi Çekme Zamanlayıcısı
+URL yazılırken debounce; aynı (kanonik) URL için tek istek, eskiyen isteklerin sonuçları generation id ile elenir.
+Bilgi geldikten sonra kesin boyutlar arka planda yoklanır ve güncellenmiş bilgi ayrıca yayılır.
+"""
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from video_downloader import VideoInfoFetcher, SizeProbe
+from metadata_cache import canonical_url
+
+FETCH_DEBOUNCE_MS = 400
+
+class FetchScheduler(QObject):
+    fetch_started = pyqtSignal(str)
+    info_ready = pyqtSignal(dict)
+    entries_found = pyqtSignal(list)
+    error = pyqtSignal(str)
+    sizes_ready = pyqtSignal(dict)
+    def __init__(self, debounce_ms=FETCH_DEBOUNCE_MS, probe_sizes=True, parent=None):
+        super().__init__(parent)
+        self.probe_sizes = probe_sizes
+        self.generation = 0
+        self._pending_url = None
+        self._in_flight = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._fire)
+    def request(self, url):
+        self._pending_url = url
+        self._timer.start()
+    def cancel(self):
+        # Bekleyen debounce durur, uçuştaki isteklerin sonuçları artık UI'a ulaşmaz
+        self._timer.stop()
+        self._pending_url = None
+        self.generation += 1
+    def is_busy(self):
+        return self._timer.isActive() or any(t.generation == self.generation for t in self._in_flight.values())
+    def _fire(self):
+        url = self._pending_url
+        self._pending_url = None
+        if not url:
+            return
+        self.generation += 1
+        key = canonical_url(url)
+        fetch = self._in_flight.get(key)
+        if fetch is None:
+            fetch = VideoInfoFetcher(url)
+            fetch.info_ready.connect(lambda info, u=url, t=fetch: self._on_info(u, t, info))
+            fetch.entries_found.connect(lambda batch, t=fetch: self._on_entries(t, batch))
+            fetch.error.connect(lambda err, t=fetch: self._on_error(t, err))
+            fetch.finished.connect(lambda k=key, t=fetch: self._on_fetch_done(k, t))
+            self._in_flight[key] = fetch
+            fetch.generation = self.generation
+            fetch.start()
+        else:
+            # Aynı URL zaten çekiliyor: yeni istek açmak yerine sonucunu sahiplen
+            fetch.generation = self.generation
+        self.fetch_started.emit(url)
+    def _on_info(self, url, fetch, info):
+        if fetch.generation != self.generation:
+            return
+        self.info_ready.emit(info)
+        if self.probe_sizes and not info.get('playlist'):
+            probe = SizeProbe(url, info, self)
+            probe.generation = fetch.generation
+            probe.sizes_ready.connect(lambda info, p=probe: self._on_sizes(p, info))
+            probe.finished.connect(probe.deleteLater)
+            probe.start()
+    def _on_sizes(self, probe, info):
+        if probe.generation == self.generation:
+            self.sizes_ready.emit(info)
+    def _on_entries(self, fetch, batch):
+        if fetch.generation == self.generation:
+            self.entries_found.emit(batch)
+    def _on_error(self, fetch, error):
+        if fetch.generation == self.generation:
+            self.error.emit(error)
+    def _on_fetch_done(self, key, fetch):
+        if self._in_flight.get(key) is fetch:
+            del self._in_flight[key]
+        fetch.deleteLater()
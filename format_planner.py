@@ -0,0 +1,210 @@
+"""
+VIGGA - Format Planlayıcı
+Formatları codec, container, bitrate, fps ve tahmini boyuta göre indeksler; video-only akışları en iyi
+sesle eşleştirip birleşik seçimler üretir ve boyut/süre/çözünürlük politikalarıyla seçim yapar. Qt bağımlılığı yok.
+Hedef container'a (MP4/WEBM/MKV) codec'i uyan seçimler öne alınır: stream copy yeniden kodlamadan dakikalarca ucuzdur.
+"""
+import threading
+from settings import get_setting
+
+VIDEO_CODECS = [('av01', 'AV1'), ('vp09', 'VP9'), ('vp9', 'VP9'), ('vp8', 'VP8'), ('avc', 'H.264'),
+                ('h264', 'H.264'), ('hev', 'H.265'), ('hvc', 'H.265'), ('h265', 'H.265')]
+AUDIO_CODECS = [('opus', 'Opus'), ('mp4a', 'AAC'), ('aac', 'AAC'), ('vorbis', 'Vorbis'), ('mp3', 'MP3'),
+                ('ec-3', 'EAC3'), ('ac-3', 'AC3'), ('flac', 'FLAC')]
+
+# MKV her codec'i taşır; listede olmayan container'lar için kontrol yapılmaz
+CONTAINER_CODECS = {
+    'mp4': ({'H.264', 'H.265', 'AV1'}, {'AAC', 'MP3', 'AC3', 'EAC3'}),
+    'webm': ({'VP9', 'VP8', 'AV1'}, {'Opus', 'Vorbis'}),
+}
+CONTAINERS = {'MP4': 'mp4', 'WEBM': 'webm', 'MKV': 'mkv'}
+# yt-dlp format_sort karşılığı: aynı çözünürlük/fps'te container'ın kendi uzantıları
+CONTAINER_SORT = {'mp4': 'ext:mp4:m4a', 'webm': 'ext:webm:webm'}
+
+NATIVE = 'native'
+REMUX = 'remux'
+TRANSCODE = 'transcode'
+
+POLICY_BEST = 'best'
+POLICY_MAX_SIZE = 'max_size'
+POLICY_MAX_TIME = 'max_time'
+POLICY_SMALLEST = 'smallest'
+
+def codec_family(codec, table):
+    codec = (codec or '').lower()
+    if not codec or codec == 'none':
+        return None
+    for prefix, name in table:
+        if codec.startswith(prefix):
+            return name
+    return codec.split('.')[0].upper()
+
+def container_for(selected_format):
+    return CONTAINERS.get(selected_format)
+
+def codecs_fit(vcodec, acodec, container):
+    if container not in CONTAINER_CODECS:
+        return True
+    video, audio = CONTAINER_CODECS[container]
+    return (not vcodec or vcodec in video) and (not acodec or acodec in audio)
+
+def container_fit(sel, container):
+    # NATIVE: dosya zaten hedef container'da; REMUX: birleştirme/container değişimi stream copy; TRANSCODE: yeniden kodlama
+    if not container:
+        return None
+    if not sel.get('audio_id') and sel.get('ext') == container:
+        return NATIVE
+    return REMUX if codecs_fit(sel.get('vcodec'), sel.get('acodec'), container) else TRANSCODE
+
+def container_action(info, container):
+    # İndirilen son dosya için (birleştirmeden sonra): None ise dokunulmaz
+    vcodec = codec_family(info.get('vcodec'), VIDEO_CODECS)
+    if not container or not vcodec or info.get('ext') == container:
+        return None
+    return REMUX if codecs_fit(vcodec, codec_family(info.get('acodec'), AUDIO_CODECS), container) else TRANSCODE
+
+def estimate_size(f, duration):
+    size = f.get('filesize') or f.get('filesize_approx')
+    if not size and duration and f.get('tbr'):
+        size = int((f['tbr'] * 1000 / 8) * duration)
+    return size or None
+
+class FormatIndex:
+    def __init__(self, info):
+        self.duration = info.get('duration') or 0
+        self.video_only = []
+        self.audio_only = []
+        self.combined = []
+        for f in info.get('formats') or []:
+            if not f.get('format_id') or (f.get('protocol') or '').startswith('mhtml'):
+                continue
+            entry = {
+                'format_id': f['format_id'],
+                'ext': f.get('ext'),
+                'vcodec': codec_family(f.get('vcodec'), VIDEO_CODECS),
+                'acodec': codec_family(f.get('acodec'), AUDIO_CODECS),
+                'height': f.get('height') or 0,
+                'fps': f.get('fps') or 0,
+                'tbr': f.get('tbr') or 0,
+                'abr': f.get('abr') or 0,
+                'size': estimate_size(f, self.duration),
+                'exact': bool(f.get('filesize')),
+                'protocol': f.get('protocol'),
+                'url': f.get('url'),
+                'headers': f.get('http_headers'),
+            }
+            if entry['vcodec'] and entry['acodec']:
+                self.combined.append(entry)
+            elif entry['vcodec']:
+                self.video_only.append(entry)
+            elif entry['acodec']:
+                self.audio_only.append(entry)
+    def best_audio(self, video_ext=None, container=None):
+        if not self.audio_only:
+            return None
+        # Önce hedef container'a uyan codec, sonra aynı container ailesindeki ses (mp4→m4a, webm→webm);
+        # böylece birleştirme stream copy kalır
+        want = {'mp4': 'm4a', 'webm': 'webm'}.get(video_ext)
+        pool = ([a for a in self.audio_only if container in CONTAINER_CODECS and codecs_fit(None, a['acodec'], container)]
+                or [a for a in self.audio_only if want and a['ext'] == want] or self.audio_only)
+        return max(pool, key=lambda a: (a['abr'] or a['tbr'], a['size'] or 0))
+    def stream(self, format_id):
+        for entry in self.combined + self.video_only + self.audio_only:
+            if entry['format_id'] == format_id:
+                return entry
+        return None
+    def selections(self, container=None):
+        result = []
+        for c in self.combined:
+            result.append(dict(c, video_id=c['format_id'], audio_id=None))
+        for v in self.video_only:
+            a = self.best_audio(v['ext'], container)
+            sel = dict(v, video_id=v['format_id'], audio_id=None)
+            if a:
+                sel.update({
+                    'format_id': f"{v['format_id']}+{a['format_id']}",
+                    'audio_id': a['format_id'],
+                    'acodec': a['acodec'],
+                    'size': (v['size'] + a['size']) if v['size'] and a['size'] else v['size'],
+                    'exact': v['exact'] and a['exact'],
+                })
+            result.append(sel)
+        for sel in result:
+            sel['fit'] = container_fit(sel, container)
+        return result
+
+def compact_selection(sel):
+    return {k: sel.get(k) for k in ('format_id', 'height', 'fps', 'vcodec', 'acodec', 'ext', 'size', 'tbr', 'protocol', 'fit', 'exact')}
+
+def _rank(sel):
+    # Yüksek çözünürlük/fps önce; eşitlikte stream copy ile alınabilen, sonra daha az bayt
+    # (ör. AV1, aynı görüntü için VP9'un yarısı olabilir)
+    return (sel.get('height') or 0, round(sel.get('fps') or 0), sel.get('fit') != TRANSCODE,
+            -(sel.get('size') or float('inf')))
+
+def best_quality(selections):
+    return max(selections, key=_rank) if selections else None
+
+def best_under_size(selections, max_bytes):
+    known = [s for s in selections if s.get('size') and s['size'] <= max_bytes]
+    return best_quality(known)
+
+def finish_within(selections, seconds, bandwidth_bps):
+    if not bandwidth_bps:
+        return best_quality(selections)
+    return best_under_size(selections, seconds * bandwidth_bps)
+
+def smallest_for_height(selections, height):
+    matches = [s for s in selections if s.get('height') == height]
+    sized = [s for s in matches if s.get('size')]
+    if sized:
+        return min(sized, key=lambda s: s['size'])
+    return matches[0] if matches else None
+
+def quality_ladder(selections):
+    # Her çözünürlük için en yüksek fps, aynı fps'te en küçük bayt
+    by_height = {}
+    for sel in selections:
+        h = sel.get('height')
+        if not h:
+            continue
+        cur = by_height.get(h)
+        if cur is None or _rank(sel) > _rank(cur):
+            by_height[h] = sel
+    return [by_height[h] for h in sorted(by_height, reverse=True)]
+
+def plan(selections, policy=POLICY_BEST, max_bytes=None, max_seconds=None, bandwidth_bps=None, height=None):
+    if policy == POLICY_MAX_SIZE and max_bytes:
+        return best_under_size(selections, max_bytes)
+    if policy == POLICY_MAX_TIME and max_seconds:
+        return finish_within(selections, max_seconds, bandwidth_bps)
+    if policy == POLICY_SMALLEST and height:
+        return smallest_for_height(selections, height)
+    return best_quality(selections)
+
+def plan_from_settings(selections):
+    return plan(
+        selections,
+        policy=get_setting('quality_policy'),
+        max_bytes=(get_setting('quality_max_mb') or 0) * 1024 * 1024,
+        max_seconds=(get_setting('quality_max_minutes') or 0) * 60,
+        bandwidth_bps=measured_bandwidth(),
+        height=get_setting('quality_height'),
+    )
+
+_bandwidth_lock = threading.Lock()
+_bandwidth_bps = None
+BANDWIDTH_ALPHA = 0.2
+
+def observe_bandwidth(bytes_per_sec):
+    global _bandwidth_bps
+    if not bytes_per_sec or bytes_per_sec <= 0:
+        return
+    with _bandwidth_lock:
+        if _bandwidth_bps is None:
+            _bandwidth_bps = bytes_per_sec
+        else:
+            _bandwidth_bps += BANDWIDTH_ALPHA * (bytes_per_sec - _bandwidth_bps)
+
+def measured_bandwidth():
+    return _bandwidth_bps
@@ -0,0 +1,285 @@
+"""
+VIGGA - Geçmiş Görünümü
+SQLite geçmişini gösteren sanal liste: model yalnızca görünen satırların bloklarını okur ve sınırlı sayıda blok tutar.
+Thumbnail'ler satır ekrana geldiğinde diskten (yoksa ağdan) yüklenip arka planda satır boyutuna çözülür.
+"""
+import os
+import time
+from collections import OrderedDict
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView, QStyledItemDelegate, QStyle,
+                             QAbstractItemView)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect, QTimer, QUrl, pyqtSignal
+from PyQt5.QtGui import QColor, QDesktopServices, QFontMetrics, QPixmap
+from download_history import ORDERS, get_download_history
+from image_decoder import get_image_decoder
+from thumbnail_cache import get_thumbnail_cache
+from styles import palette
+from ui_components import ModernLineEdit, ModernComboBox
+
+BLOCK_ROWS = 100
+MAX_BLOCKS = 30
+ROW_HEIGHT = 44
+THUMB_W, THUMB_H = 64, 36
+SEARCH_DEBOUNCE_MS = 250
+THUMB_RETRY_S = 60
+ORDER_LABELS = {'newest': 'Newest', 'oldest': 'Oldest', 'title': 'Title', 'size': 'Largest'}
+
+def _size_text(n):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{n:.0f}{unit}" if unit == 'B' else f"{n:.1f}{unit}"
+        n /= 1024
+    return ''
+
+class HistoryModel(QAbstractListModel):
+    EntryRole = Qt.UserRole + 1
+    def __init__(self, history=None, parent=None):
+        super().__init__(parent)
+        self.history = history or get_download_history()
+        self._search = ''
+        self._order = 'newest'
+        self._count = self.history.count()
+        self._blocks = OrderedDict()
+        self._waiting = {}
+        self._failed = {}
+        self._network_manager = None
+        get_image_decoder().decoded.connect(self._on_decoded)
+    def set_query(self, search=None, order=None):
+        # Arama/sıralama değişince yalnızca satır sayısı yeniden sorulur; satırlar görünür oldukça okunur
+        self.beginResetModel()
+        if search is not None:
+            self._search = search
+        if order in ORDERS:
+            self._order = order
+        self.refresh_rows()
+        self.endResetModel()
+    def refresh(self):
+        self.beginResetModel()
+        self.refresh_rows()
+        self.endResetModel()
+    def refresh_rows(self):
+        self._blocks.clear()
+        self._count = self.history.count(self._search)
+        # Satır numaraları değişti: uçuştaki thumbnail'ler kalır, bekleyen satırlar görünüm yeniden sorunca eklenir
+        for rows in self._waiting.values():
+            rows.clear()
+    def remove(self, row):
+        entry = self.entry(row)
+        if entry:
+            self.history.remove(entry['id'])
+            self.refresh()
+    def clear(self):
+        self.history.clear()
+        self.refresh()
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+    def entry(self, row):
+        if not 0 <= row < self._count:
+            return None
+        rows = self._block(row // BLOCK_ROWS)
+        offset = row % BLOCK_ROWS
+        return rows[offset] if offset < len(rows) else None
+    def data(self, index, role=Qt.DisplayRole):
+        entry = self.entry(index.row()) if index.isValid() else None
+        if entry is None:
+            return None
+        if role == Qt.DisplayRole:
+            return entry['title']
+        if role == Qt.ToolTipRole:
+            return entry['path'] or entry['url']
+        if role == Qt.DecorationRole:
+            return self._thumbnail(index.row(), entry['thumbnail'])
+        if role == self.EntryRole:
+            return entry
+        return None
+    def _block(self, number):
+        rows = self._blocks.get(number)
+        if rows is not None:
+            self._blocks.move_to_end(number)
+            return rows
+        # Bir önceki blok elimizdeyse OFFSET yerine onun son satırından devam edilir (kaydırmanın olağan yolu)
+        previous = self._blocks.get(number - 1)
+        after = previous[-1] if previous and len(previous) == BLOCK_ROWS else None
+        rows = self.history.page(BLOCK_ROWS, number * BLOCK_ROWS, self._search, self._order, after)
+        self._blocks[number] = rows
+        while len(self._blocks) > MAX_BLOCKS:
+            self._blocks.popitem(last=False)
+        return rows
+    def _thumbnail(self, row, url):
+        if not url:
+            return None
+        cache = get_thumbnail_cache()
+        pixmap = cache.scaled(url, THUMB_W, THUMB_H)
+        if pixmap is not None:
+            return pixmap
+        rows = self._waiting.get(url)
+        if rows is not None:
+            rows.add(row)
+            return None
+        failed = self._failed.get(url)
+        if failed and time.monotonic() - failed < THUMB_RETRY_S:
+            return None
+        self._waiting[url] = {row}
+        data, _ = cache.load(url)
+        if data is not None:
+            get_image_decoder().submit(url, data, THUMB_W, THUMB_H)
+        else:
+            from PyQt5.QtNetwork import QNetworkRequest
+            request = QNetworkRequest(QUrl(url))
+            request.setPriority(QNetworkRequest.LowPriority)
+            request.setAttribute(QNetworkRequest.User, url)
+            self._network().get(request)
+        return None
+    def _network(self):
+        if self._network_manager is None:
+            from PyQt5.QtNetwork import QNetworkAccessManager
+            self._network_manager = QNetworkAccessManager(self)
+            self._network_manager.finished.connect(self._on_thumbnail_loaded)
+        return self._network_manager
+    def _on_thumbnail_loaded(self, reply):
+        from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply
+        url = reply.request().attribute(QNetworkRequest.User)
+        if reply.error() == QNetworkReply.NoError:
+            data = bytes(reply.readAll())
+            get_thumbnail_cache().save(url, data,
+                                       bytes(reply.rawHeader(b'ETag')).decode('latin-1') or None,
+                                       bytes(reply.rawHeader(b'Last-Modified')).decode('latin-1') or None)
+            get_image_decoder().submit(url, data, THUMB_W, THUMB_H)
+        else:
+            self._fail(url)
+        reply.deleteLater()
+    def _fail(self, url):
+        # Başarısız thumbnail bir süre yeniden istenmez; süre dolunca satır görünür olduğunda tekrar denenir
+        self._waiting.pop(url, None)
+        self._failed[url] = time.monotonic()
+    def _on_decoded(self, key, w, h, image):
+        if (w, h) != (THUMB_W, THUMB_H) or key not in self._waiting:
+            return
+        if image.isNull():
+            self._fail(key)
+            return
+        rows = self._waiting.pop(key)
+        self._failed.pop(key, None)
+        get_thumbnail_cache().store_scaled(key, w, h, QPixmap.fromImage(image))
+        for row in rows:
+            if row < self._count:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+class HistoryDelegate(QStyledItemDelegate):
+    # Satırlar widget değil, doğrudan çizilir; görünüm sabit satır yüksekliğiyle yalnızca görüneni sorar
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+    def paint(self, painter, option, index):
+        entry = index.data(HistoryModel.EntryRole)
+        if entry is None:
+            return
+        colors = palette()
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        painter.save()
+        painter.setRenderHint(painter.Antialiasing)
+        if option.state & (QStyle.State_Selected | QStyle.State_MouseOver):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(colors['surface_light']))
+            painter.drawRoundedRect(rect, 8, 8)
+        thumb = QRect(rect.left() + 4, rect.top() + (rect.height() - THUMB_H) // 2, THUMB_W, THUMB_H)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            painter.drawPixmap(thumb, pixmap)
+        else:
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(colors['surface']))
+            painter.drawRoundedRect(thumb, 4, 4)
+        text_left = thumb.right() + 8
+        text_width = rect.right() - text_left - 4
+        font = option.font
+        font.setPixelSize(12)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor(colors['text_primary']))
+        title = QFontMetrics(font).elidedText(entry['title'], Qt.ElideRight, text_width)
+        painter.drawText(QRect(text_left, rect.top() + 4, text_width, 18), Qt.AlignLeft | Qt.AlignVCenter, title)
+        font.setPixelSize(11)
+        font.setBold(False)
+        painter.setFont(font)
+        painter.setPen(QColor(colors['text_muted']))
+        parts = [entry['format'], _size_text(entry['size']) if entry['size'] else '',
+                 time.strftime('%Y-%m-%d', time.localtime(entry['created']))]
+        detail = QFontMetrics(font).elidedText(' · '.join(p for p in parts if p), Qt.ElideRight, text_width)
+        painter.drawText(QRect(text_left, rect.top() + 22, text_width, 16), Qt.AlignLeft | Qt.AlignVCenter, detail)
+        painter.restore()
+
+class HistoryView(QWidget):
+    count_changed = pyqtSignal(int)
+    def __init__(self, history=None, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(8)
+        controls = QHBoxLayout()
+        controls.setSpacing(6)
+        self.search_input = ModernLineEdit("Search history")
+        self.search_input.textChanged.connect(self._on_search_changed)
+        controls.addWidget(self.search_input, 1)
+        self.order_combo = ModernComboBox()
+        for order, label in ORDER_LABELS.items():
+            self.order_combo.addItem(label, order)
+        self.order_combo.currentIndexChanged.connect(self._on_order_changed)
+        controls.addWidget(self.order_combo, 0)
+        layout.addLayout(controls)
+        self.model = HistoryModel(history, self)
+        # QListView her satır için yerleşim hesaplar (100k satırda açılış yarım saniyeyi geçer);
+        # tek sütunlu tablo sabit satır yüksekliğiyle yalnızca görünen satırları sorar
+        self.list = QTableView()
+        self.list.horizontalHeader().hide()
+        self.list.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.list.verticalHeader().hide()
+        self.list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.list.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.list.setShowGrid(False)
+        self.list.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.list.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.list.setMouseTracking(True)
+        self.list.setItemDelegate(HistoryDelegate(self.list))
+        self.list.setModel(self.model)
+        self.list.doubleClicked.connect(self._open)
+        layout.addWidget(self.list, 1)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._apply_search)
+    def refresh(self):
+        self.model.refresh()
+        self.count_changed.emit(self.model.rowCount())
+    def clear(self):
+        self.model.clear()
+        self.count_changed.emit(self.model.rowCount())
+    def keyPressEvent(self, event):
+        # Delete: seçili kayıt geçmişten silinir (dosyaya dokunulmaz)
+        index = self.list.currentIndex()
+        if event.key() == Qt.Key_Delete and index.isValid():
+            self.model.remove(index.row())
+            self.count_changed.emit(self.model.rowCount())
+            return
+        super().keyPressEvent(event)
+    def _on_search_changed(self, _text):
+        self._search_timer.start()
+    def _apply_search(self):
+        self.model.set_query(search=self.search_input.text())
+        self.list.scrollToTop()
+        self.count_changed.emit(self.model.rowCount())
+    def _on_order_changed(self, _index):
+        self.model.set_query(order=self.order_combo.currentData())
+        self.list.scrollToTop()
+    def _open(self, index):
+        # Dosya duruyorsa açılır, yoksa sayfası tarayıcıda açılır
+        entry = index.data(HistoryModel.EntryRole)
+        if not entry:
+            return
+        if entry['path'] and os.path.exists(entry['path']):
+            QDesktopServices.openUrl(QUrl.fromLocalFile(entry['path']))
+        elif entry['url']:
+            QDesktopServices.openUrl(QUrl(entry['url']))
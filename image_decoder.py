@@ -0,0 +1,59 @@
+"""
+VIGGA - Görüntü Çözücü
+Thumbnail'ler GUI thread dışında, QImageReader ile doğrudan hedef boyuta ölçeklenerek çözülür;
+geriye yalnızca küçük görüntü döner, tam boy pixmap bellekte tutulmaz.
+"""
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QByteArray, QBuffer, QIODevice, QSize, QRect, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+
+DECODER_THREADS = 2
+
+def decode_scaled(data, width, height):
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAutoTransform(True)
+    source = reader.size()
+    if source.isValid() and source.width() > 0 and source.height() > 0:
+        # KeepAspectRatioByExpanding karşılığı: kısa kenar hedefi doldurur, fazlası kırpılır
+        scaled = QSize(source)
+        scaled.scale(QSize(width, height), Qt.KeepAspectRatioByExpanding)
+        reader.setScaledSize(scaled)
+    image = reader.read()
+    if image.isNull():
+        return image
+    if image.width() != width or image.height() != height:
+        if not source.isValid():
+            image = image.scaled(width, height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        image = image.copy(QRect((image.width() - width) // 2, (image.height() - height) // 2, width, height))
+    return image
+
+class _DecodeTask(QRunnable):
+    def __init__(self, decoder, key, data, width, height):
+        super().__init__()
+        self.decoder = decoder
+        self.key = key
+        self.data = data
+        self.width = width
+        self.height = height
+    def run(self):
+        image = decode_scaled(self.data, self.width, self.height)
+        self.decoder.decoded.emit(self.key, self.width, self.height, image)
+
+class ImageDecoder(QObject):
+    decoded = pyqtSignal(str, int, int, QImage)
+    def __init__(self, threads=DECODER_THREADS, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(threads)
+    def submit(self, key, data, width, height):
+        self._pool.start(_DecodeTask(self, key, data, width, height))
+
+_decoder = None
+
+def get_image_decoder():
+    global _decoder
+    if _decoder is None:
+        _decoder = ImageDecoder()
+    return _decoder
@@ -0,0 +1,58 @@
+"""
+VIGGA - Çıkarım Deposu
+Önizleme için yapılan tam çıkarımın JSON'u bellekte, kanonik anahtarla tutulur; indirme bu bilgiyle
+yeniden çıkarım yapmadan başlar. Boyut ve adet sınırlı LRU; imzalı format URL'lerinin süresi dolunca kayıt düşer.
+"""
+import threading
+import time
+from collections import OrderedDict
+from settings import get_setting
+
+class InfoStore:
+    def __init__(self, max_entries=None, max_bytes=None):
+        self.max_entries = max_entries or get_setting('info_store_entries')
+        self.max_bytes = max_bytes or get_setting('info_store_mb') * 1024 * 1024
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._total = 0
+    def put(self, key, info_json, expires):
+        if not key or not info_json or not expires or expires <= time.time():
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (info_json, expires)
+            self._total += len(info_json)
+            self._evict()
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key) if key else None
+            if not entry:
+                return None
+            if entry[1] <= time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    def discard(self, key):
+        with self._lock:
+            self._drop(key)
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._total -= len(entry[0])
+    def _evict(self):
+        now = time.time()
+        for key in [k for k, e in self._entries.items() if e[1] <= now]:
+            self._drop(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._total > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_info_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = InfoStore()
+        return _store
@@ -5,32 +5,53 @@ Küçültülmüş boyut, yeni layout: progress bar download butonunun altında,
 
 import os
 import sys
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QSpacerItem, QSizePolicy, QHBoxLayout, QProgressBar
-from PyQt5.QtGui import QFont, QIcon
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QGraphicsDropShadowEffect, QGraphicsOpacityEffect
+import startup
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QSpacerItem, QSizePolicy, QHBoxLayout, QProgressBar, QMessageBox, QStackedWidget, QShortcut
+from PyQt5.QtGui import QFont, QIcon, QPainter, QKeySequence
+from PyQt5.QtCore import Qt, QTimer
+startup.mark('qt imported')
 from ui_components import *
-from video_downloader import VideoDownloadThread, VideoInfoFetcher, get_available_formats, DOWNLOAD_DIR
-from styles import MAIN_WINDOW_STYLE, CARD_STYLE, COLORS, RADIUS, PROGRESS_STYLE
+from video_downloader import get_available_formats, DOWNLOAD_DIR
+from media_info import PLAYLIST_QUALITY_OPTIONS, quality_label
+from format_planner import plan_from_settings
+from download_journal import get_download_journal
+from download_queue import DownloadQueue
+from metadata_cache import canonical_url, flush_metadata_cache
+from fetch_scheduler import FetchScheduler
+from extractor_pool import get_extractor_pool, shutdown_extractor_pool
+from styles import apply_theme, current_theme, THEMES, RADIUS
+from card_shadow import CardShadow
+from history_view import HistoryView
+import paint_stats
+from settings import get_setting
+startup.mark('app modules imported')
 
 class ViggaApp(QWidget):
     def __init__(self):
         super().__init__()
-        self.download_thread = None
-        self.info_thread = None
         self._drag_pos = None
         self.current_url = ""
         self.current_video_info = None
-        self.is_downloading = False
+        self.queue = DownloadQueue(parent=self)
+        self.fetcher = FetchScheduler(parent=self)
+        self.fetcher.fetch_started.connect(self.on_fetch_started)
+        self.fetcher.info_ready.connect(self.on_info_ready)
+        self.fetcher.error.connect(self.on_info_error)
+        self.fetcher.entries_found.connect(self.on_entries_found)
+        self.fetcher.sizes_ready.connect(self.on_sizes_ready)
+        self.entry_fetcher = FetchScheduler(debounce_ms=250, probe_sizes=False, parent=self)
+        self.entry_fetcher.info_ready.connect(self.on_entry_info_ready)
+        self.playlist_mode = False
+        self._active_entry_url = None
         self.init_window()
         self.init_ui()
+        QTimer.singleShot(0, self.offer_resume)
 
     def init_window(self):
         self.setWindowTitle("VIGGA")
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
         self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setStyleSheet(MAIN_WINDOW_STYLE + CARD_STYLE)
-        self.setFixedSize(336, 546)
+        self.setFixedSize(336, 640)
         self.setWindowIcon(QIcon(icon_path('close.svg')))
 
     def init_ui(self):
@@ -42,14 +63,21 @@ class ViggaApp(QWidget):
         card_layout = QVBoxLayout(self.card)
         card_layout.setContentsMargins(12, 12, 12, 12)
         card_layout.setSpacing(12)
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(24)
-        shadow.setOffset(0, 6)
-        shadow.setColor(Qt.black)
-        self.card.setGraphicsEffect(shadow)
+        # Gölge pencerenin kendi paintEvent'inde önbellekteki pixmap'ten çizilir; kartta graphics effect yok
+        self.card_shadow = CardShadow(RADIUS, 12, (0, 6))
         self.header = HeaderBar()
         self.header.close_btn.clicked.connect(self.close)
+        self.header.history_btn.clicked.connect(self.toggle_history)
+        QShortcut(QKeySequence('Ctrl+T'), self, activated=self.toggle_theme)
         card_layout.addWidget(self.header)
+        # Ana sayfa ve geçmiş aynı kartta sayfa olarak durur; geçmiş ilk açılışta oluşturulur
+        self.pages = QStackedWidget()
+        main_page = QWidget()
+        page = QVBoxLayout(main_page)
+        page.setContentsMargins(0, 0, 0, 0)
+        page.setSpacing(12)
+        self.pages.addWidget(main_page)
+        self.history_view = None
         url_row = QHBoxLayout()
         url_row.setSpacing(6)
         self.url_input = ModernLineEdit("Paste video URL here")
@@ -62,41 +90,83 @@ class ViggaApp(QWidget):
         url_row.addWidget(self.spinner, 0)
         url_row.setStretch(0, 1)
         url_row.setStretch(1, 0)
-        card_layout.addLayout(url_row)
+        page.addLayout(url_row)
         self.fetch_bar = QProgressBar()
-        self.fetch_bar.setStyleSheet(PROGRESS_STYLE)
         self.fetch_bar.setTextVisible(False)
         self.fetch_bar.setFixedHeight(4)
         self.fetch_bar.hide()
-        card_layout.addWidget(self.fetch_bar)
+        page.addWidget(self.fetch_bar)
         self.preview = VideoPreviewCard()
-        card_layout.addWidget(self.preview)
+        page.addWidget(self.preview)
+        self.playlist_view = PlaylistView()
+        self.playlist_view.setFixedHeight(self.preview.sizeHint().height())
+        self.playlist_view.entry_activated.connect(self.on_entry_activated)
+        self.playlist_view.hide()
+        page.addWidget(self.playlist_view)
         format_label = QLabel("Format")
-        format_label.setStyleSheet(LABEL_STYLE)
-        card_layout.addWidget(format_label)
+        format_label.setProperty('role', 'heading')
+        page.addWidget(format_label)
         self.format_combo = ModernComboBox()
         for fmt in get_available_formats():
             self.format_combo.addItem(fmt)
         self.format_combo.currentTextChanged.connect(self.on_format_changed)
-        card_layout.addWidget(self.format_combo)
+        page.addWidget(self.format_combo)
         resolution_label = QLabel("Resolution")
-        resolution_label.setStyleSheet(LABEL_STYLE)
-        card_layout.addWidget(resolution_label)
+        resolution_label.setProperty('role', 'heading')
+        page.addWidget(resolution_label)
         self.resolution_combo = ModernComboBox()
         self.resolution_combo.addItem("Select quality")
-        card_layout.addWidget(self.resolution_combo)
+        page.addWidget(self.resolution_combo)
         self.download_btn = PrimaryButton("Download")
         self.download_btn.clicked.connect(self.on_download_button_clicked)
-        card_layout.addWidget(self.download_btn)
-        self.progress_widget = ProgressWidget()
-        card_layout.addWidget(self.progress_widget)
-        card_layout.addSpacerItem(QSpacerItem(10, 8, QSizePolicy.Minimum, QSizePolicy.Expanding))
+        page.addWidget(self.download_btn)
+        self.queue_view = QueueView()
+        self.queue_view.setFixedHeight(150)
+        self.queue_view.pause_requested.connect(self.queue.pause)
+        self.queue_view.resume_requested.connect(self.queue.resume)
+        self.queue_view.cancel_requested.connect(self.queue.cancel)
+        self.queue_view.priority_requested.connect(self.queue.set_priority)
+        page.addWidget(self.queue_view)
+        self.queue.item_added.connect(self.on_queue_item_added)
+        self.queue.item_changed.connect(self.on_queue_item_changed)
+        self.queue.item_progress.connect(self.queue_view.update_progress)
+        self.queue.item_removed.connect(self.queue_view.remove_row)
+        self.queue.item_finished.connect(self.on_download_finished)
+        self.queue.item_failed.connect(self.on_download_error)
+        page.addSpacerItem(QSpacerItem(10, 8, QSizePolicy.Minimum, QSizePolicy.Expanding))
+        card_layout.addWidget(self.pages, 1)
         self.status_bar = StatusBar()
         self.status_bar.folder_btn.clicked.connect(self.open_folder)
         self.status_bar.delete_btn.clicked.connect(self.clear_all)
         card_layout.addWidget(self.status_bar)
         outer.addWidget(self.card)
 
+    def toggle_history(self):
+        if self.history_view is None:
+            self.history_view = HistoryView()
+            self.history_view.count_changed.connect(lambda n: self.status_bar.set_status(f"{n} in history"))
+            self.pages.addWidget(self.history_view)
+        showing = self.pages.currentWidget() is self.history_view
+        if showing:
+            self.pages.setCurrentIndex(0)
+            self.status_bar.set_status("Ready")
+        else:
+            self.history_view.refresh()
+            self.pages.setCurrentWidget(self.history_view)
+
+    def toggle_theme(self):
+        # Sıradaki temaya geç: tek setStyleSheet, widget başına CSS yok
+        names = list(THEMES)
+        apply_theme(QApplication.instance(), names[(names.index(current_theme()) + 1) % len(names)])
+
+    def paintEvent(self, event):
+        card_rect = self.card.geometry()
+        if self.card_shadow.covers(card_rect, event.rect()):
+            return
+        painter = QPainter(self)
+        painter.setClipRegion(event.region())
+        self.card_shadow.paint(painter, card_rect)
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self._drag_pos = event.globalPos() - self.frameGeometry().topLeft()
@@ -107,23 +177,71 @@ class ViggaApp(QWidget):
             event.accept()
     def mouseReleaseEvent(self, event):
         self._drag_pos = None
+    def closeEvent(self, event):
+        self.queue.shutdown()
+        shutdown_extractor_pool()
+        flush_metadata_cache()
+        super().closeEvent(event)
     def on_url_changed(self, url):
-        if url and len(url) > 10 and url != self.current_url:
+        url = url.strip()
+        if not url or len(url) <= 10:
+            # Silinen/kısalan URL için bekleyen debounce ve uçuştaki sonuç önizlemeyi doldurmamalı
+            self.fetcher.cancel()
+            self.current_url = ""
+            self.fetch_bar.hide()
+            return
+        # Yalnızca izleme parametresi/fragment farkı olan URL yeniden çekilmez; farklı biçimdeki aynı medya motorda birleşir
+        if not self.current_url or canonical_url(url) != canonical_url(self.current_url):
+            startup.warm_up()
             self.current_url = url
-            self.status_bar.set_status("Fetching…")
-            self.fetch_bar.setRange(0, 0)
-            self.fetch_bar.show()
-            self.spinner.hide()
-            self.info_thread = VideoInfoFetcher(url)
-            self.info_thread.info_ready.connect(self.on_info_ready)
-            self.info_thread.error.connect(self.on_info_error)
-            self.info_thread.start()
+            self.fetcher.request(url)
+    def on_fetch_started(self, url):
+        self._set_playlist_mode(False)
+        self.status_bar.set_status("Fetching…")
+        self.fetch_bar.setRange(0, 0)
+        self.fetch_bar.show()
+        self.spinner.hide()
     def on_info_ready(self, info):
         self.fetch_bar.hide()
         self.current_video_info = info
-        self.preview.set_video_info(info['title'], info['channel'], info['thumbnail'])
+        if info.get('playlist'):
+            self._set_playlist_mode(True)
+            self.playlist_view.set_finished(info['title'], info.get('entry_count', 0))
+        else:
+            self.preview.set_video_info(info['title'], info['channel'], info['thumbnail'])
         self.update_resolution_options()
         self.status_bar.set_status("Ready")
+    def on_sizes_ready(self, info):
+        # Kesin boyutlar: liste aynı kalır, etiketler güncellenir, seçim korunur
+        if self.current_video_info and not self.current_video_info.get('playlist'):
+            self.current_video_info = info
+            self.update_resolution_options()
+    def on_entries_found(self, entries):
+        # Liste çıkarımı sürerken ilk elemanlar gelir gelmez seçilip kuyruğa eklenebilir
+        if not self.playlist_mode:
+            self._set_playlist_mode(True)
+            self.current_video_info = {'title': 'Playlist', 'quality_options': list(PLAYLIST_QUALITY_OPTIONS), 'playlist': True}
+            self.update_resolution_options()
+        self.playlist_view.add_entries(entries)
+        self.status_bar.set_status(f"Listing… {self.playlist_view.list.count()}")
+    def on_entry_activated(self, url):
+        self._active_entry_url = url
+        self.entry_fetcher.request(url)
+    def on_entry_info_ready(self, info):
+        if self._active_entry_url:
+            self.playlist_view.set_entry_details(self._active_entry_url, info)
+    def _set_playlist_mode(self, enabled):
+        if enabled == self.playlist_mode:
+            return
+        self.playlist_mode = enabled
+        if enabled:
+            self.playlist_view.reset()
+            self.preview.reset()
+        else:
+            self.entry_fetcher.cancel()
+            self.playlist_view.reset()
+        self.preview.setVisible(not enabled)
+        self.playlist_view.setVisible(enabled)
     def on_info_error(self, error):
         self.fetch_bar.hide()
         self.status_bar.set_status("Error")
@@ -140,28 +258,20 @@ class ViggaApp(QWidget):
             self.resolution_combo.set_quality_options([("Best Quality", "bestaudio")])
             self.resolution_combo.setEnabled(True)
         else:
-            quality_options = self.current_video_info.get('quality_options', [])
+            # Container'a özel plan yoksa (playlist, eski önbellek kaydı) genel listeye düşülür
+            plan = (self.current_video_info.get('containers') or {}).get(selected_format) or self.current_video_info
+            quality_options = plan.get('quality_options', [])
             video_options = [opt for opt in quality_options if 'Audio Only' not in opt[0]]
+            if not video_options:
+                video_options = [opt for opt in self.current_video_info.get('quality_options', []) if 'Audio Only' not in opt[0]]
+            auto = plan_from_settings(plan.get('selections') or [])
+            # Politika zaten listenin ilk seçeneğini seçtiyse (varsayılan 'best') aynı seçenek iki kez gösterilmez
+            if auto and (not video_options or auto['format_id'] != video_options[0][1]):
+                video_options.insert(0, (f"Auto · {quality_label(auto)}", auto['format_id']))
             self.resolution_combo.set_quality_options(video_options)
             self.resolution_combo.setEnabled(True)
-    def _dim_widget(self, w, dim=True):
-        if dim:
-            eff = QGraphicsOpacityEffect(w)
-            eff.setOpacity(0.5)
-            w.setGraphicsEffect(eff)
-            w.setEnabled(False)
-        else:
-            w.setGraphicsEffect(None)
-            w.setEnabled(True)
-    def _set_controls_enabled(self, enabled: bool):
-        widgets = [self.url_input, self.format_combo, self.resolution_combo, self.status_bar.delete_btn]
-        for w in widgets:
-            self._dim_widget(w, dim=not enabled)
     def on_download_button_clicked(self):
-        if self.is_downloading:
-            self.cancel_download()
-        else:
-            self.start_download()
+        self.start_download()
     def start_download(self):
         url = self.url_input.text()
         if not url:
@@ -172,38 +282,61 @@ class ViggaApp(QWidget):
             self.status_bar.set_status("Select quality")
             return
         selected_format = self.format_combo.currentText()
-        self.is_downloading = True
-        self.download_btn.setText("Cancel")
-        self._set_controls_enabled(False)
-        self.status_bar.set_status("Downloading")
-        self.progress_widget.reset()
-        self.progress_widget.show()
-        self.down_thread = VideoDownloadThread(url, format_id, selected_format)
-        self.down_thread.progress.connect(self.on_progress)
-        self.down_thread.finished.connect(self.on_download_finished)
-        self.down_thread.error.connect(self.on_download_error)
-        self.down_thread.start()
-    def cancel_download(self):
-        if self.down_thread and self.down_thread.isRunning():
-            self.down_thread.cancel()
-            self.status_bar.set_status("Cancelling...")
-    def on_progress(self, value, text):
-        self.progress_widget.update_progress(value, text)
-    def on_download_finished(self, message):
-        self.is_downloading = False
-        self.download_btn.setText("Download")
-        self._set_controls_enabled(True)
-        self.status_bar.set_status("Complete")
-        self.progress_widget.reset()
-    def on_download_error(self, error):
-        self.is_downloading = False
-        self.download_btn.setText("Download")
-        self._set_controls_enabled(True)
-        if error == 'Cancelled':
-            self.status_bar.set_status("Cancelled")
-        else:
-            self.status_bar.set_status("Error")
-        self.progress_widget.reset()
+        if self.playlist_mode:
+            entries = self.playlist_view.checked_entries()
+            if not entries:
+                self.status_bar.set_status("Select entries")
+                return
+            self.queue.add_many([{'url': entry_url, 'format_id': format_id, 'selected_format': selected_format, 'title': title}
+                                 for entry_url, title in entries])
+            return
+        title = (self.current_video_info or {}).get('title', '')
+        self.queue.add(url, format_id, selected_format, title=title)
+    def on_queue_item_added(self, item_id):
+        item = self.queue.item(item_id)
+        self.queue_view.add_row(item_id, item.title)
+        self._update_queue_status()
+    def on_queue_item_changed(self, item_id):
+        item = self.queue.item(item_id)
+        if item:
+            self.queue_view.set_state(item_id, item.state)
+            self.queue_view.set_priority(item_id, item.priority)
+        self._update_queue_status()
+    def _update_queue_status(self):
+        active = self.queue.active_count()
+        processing = self.queue.processing_count()
+        waiting = self.queue.pending_count() - active - processing
+        if active or waiting or processing:
+            parts = [f"Downloading {active}"] if active or waiting else []
+            if waiting:
+                parts.append(f"{waiting} queued")
+            if processing:
+                parts.append(f"Processing {processing}")
+            self.status_bar.set_status(' · '.join(parts))
+    def on_download_finished(self, item_id, message):
+        if self.history_view is not None and self.pages.currentWidget() is self.history_view:
+            self.history_view.refresh()
+        if not self.queue.pending_count():
+            self.status_bar.set_status("Complete")
+    def on_download_error(self, item_id, error):
+        self.status_bar.set_status("Error")
+    def offer_resume(self):
+        journal = get_download_journal()
+        entries = journal.unfinished()
+        if not entries:
+            return
+        answer = QMessageBox.question(self, "VIGGA", f"{len(entries)} unfinished download(s) found. Resume them?",
+                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+        resumed = []
+        for entry in entries:
+            if answer == QMessageBox.Yes:
+                journal.prepare_resume(entry['id'])
+                resumed.append({'url': entry['url'], 'format_id': entry['format_id'], 'selected_format': entry['selected_format'],
+                                'title': entry.get('title', ''), 'journal_id': entry['id']})
+            else:
+                journal.discard(entry['id'])
+        if resumed:
+            self.queue.add_many(resumed)
     def open_folder(self):
         import subprocess
         if sys.platform == 'win32':
@@ -213,6 +346,16 @@ class ViggaApp(QWidget):
         else:
             subprocess.Popen(['xdg-open', DOWNLOAD_DIR])
     def clear_all(self):
+        if self.history_view is not None and self.pages.currentWidget() is self.history_view:
+            # Geçmiş sayfasında çöp kutusu geçmişi temizler
+            answer = QMessageBox.question(self, "VIGGA", "Clear download history?",
+                                          QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if answer == QMessageBox.Yes:
+                self.history_view.clear()
+            return
+        self.fetcher.cancel()
+        self.fetch_bar.hide()
+        self._set_playlist_mode(False)
         self.url_input.clear()
         self.current_url = ""
         self.current_video_info = None
@@ -220,13 +363,25 @@ class ViggaApp(QWidget):
         self.resolution_combo.clear()
         self.resolution_combo.addItem("Select quality")
         self.format_combo.setCurrentIndex(0)
-        self.progress_widget.reset()
+        self.queue.clear_finished()
         self.status_bar.set_status("Ready")
 
+def _after_first_frame():
+    # Ağır modüller ve extractor worker'ları pencere göründükten sonra yüklenir
+    startup.mark('event loop running')
+    startup.warm_up()
+    get_extractor_pool().start()
+
 def main():
     app = QApplication(sys.argv)
+    # Stylesheet widget'lar oluşturulmadan uygulamaya bir kez verilir
+    apply_theme(app, get_setting('theme'))
+    paint_stats.install(app)
     window = ViggaApp()
+    startup.mark('window built')
     window.show()
+    startup.mark('window shown')
+    QTimer.singleShot(0, _after_first_frame)
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
@@ -0,0 +1,145 @@
+"""
+VIGGA - Medya Bilgisi
+yt-dlp info dict'inden arayüzün ihtiyaç duyduğu küçük özetin çıkarılması. Qt bağımlılığı yok.
+"""
+from format_planner import FormatIndex, CONTAINERS, TRANSCODE, compact_selection, quality_ladder
+
+def _human_bytes(n):
+    try:
+        for unit in ['B', 'KB', 'MB', 'GB']:
+            if n < 1024.0:
+                return f"{n:.1f}{unit}"
+            n /= 1024.0
+    except Exception:
+        pass
+    return "-"
+
+def _fps_label(fps):
+    if not fps:
+        return ''
+    f = int(round(fps))
+    if 58 <= f <= 62:
+        return ' 60fps'
+    if 28 <= f <= 32:
+        return ' 30fps'
+    return ''
+
+def quality_label(sel):
+    h = sel.get('height') or 0
+    label_res = '8K' if h == 4320 else ('4K' if h == 2160 else f'{h}p')
+    label = f"{label_res}{_fps_label(sel.get('fps'))}"
+    if sel.get('vcodec'):
+        label += f" {sel['vcodec']}"
+    if sel.get('size'):
+        # Kesin olmayan (filesize_approx ya da bitrate tahmini) boyutlar ~ ile gösterilir
+        label += f" {'' if sel.get('exact') else '~'}{int(sel['size']/1024/1024)}MB"
+    if sel.get('fit') == TRANSCODE:
+        label += " · re-encode"
+    return label
+
+def _container_plan(index, container):
+    selections = index.selections(container)
+    return {
+        'quality_options': [(quality_label(sel), sel['format_id']) for sel in quality_ladder(selections)],
+        'selections': [compact_selection(sel) for sel in selections if sel.get('height')],
+    }
+
+def _streams(index, quality_options):
+    # Listede görünen seçimlerin parçaları; boyutu kesin olmayan doğrudan HTTP akışlarının URL'si yoklama için saklanır
+    streams = {}
+    for _, format_id in quality_options:
+        for part in format_id.split('+'):
+            entry = index.stream(part)
+            if entry is None or part in streams:
+                continue
+            probe = not entry['exact'] and entry['url'] and entry['protocol'] in ('http', 'https')
+            streams[part] = {
+                'size': entry['size'],
+                'exact': entry['exact'],
+                'url': entry['url'] if probe else None,
+                'headers': entry['headers'] if probe else None,
+            }
+    return streams
+
+def probe_targets(payload):
+    return {fid: (s['url'], s['headers']) for fid, s in (payload.get('streams') or {}).items() if s.get('url')}
+
+def apply_probed_sizes(payload, sizes):
+    data = dict(payload)
+    streams = {fid: dict(s) for fid, s in payload['streams'].items()}
+    for fid, size in sizes.items():
+        streams[fid].update(size=size, exact=True, url=None, headers=None)
+    data['streams'] = streams
+    def resize(sel):
+        parts = [streams.get(p) for p in sel['format_id'].split('+')]
+        if not all(p and p['size'] for p in parts):
+            return sel
+        return dict(sel, size=sum(p['size'] for p in parts), exact=all(p['exact'] for p in parts))
+    def relabel(plan):
+        # Seçenek sırası korunur; yalnızca etiketlerdeki boyutlar güncellenir
+        plan['selections'] = [resize(sel) for sel in plan.get('selections') or []]
+        by_id = {sel['format_id']: sel for sel in plan['selections']}
+        plan['quality_options'] = [(quality_label(by_id[fid]) if fid in by_id else label, fid)
+                                   for label, fid in plan.get('quality_options') or []]
+        return plan
+    relabel(data)
+    if data.get('containers'):
+        data['containers'] = {name: relabel(dict(plan)) for name, plan in data['containers'].items()}
+    return data
+
+def reduce_info(info):
+    index = FormatIndex(info)
+    # Ses eşleştirmesi ve stream copy/yeniden kodlama durumu container'a göre değişir
+    containers = {name: _container_plan(index, ext) for name, ext in CONTAINERS.items()}
+    selections = index.selections()
+    quality_options = [(quality_label(sel), sel['format_id']) for sel in quality_ladder(selections)]
+    if not quality_options:
+        # Hiç height yoksa (ör: IG, Pinterest), best video/audio fallback
+        best_format = None
+        for fmt in info.get('formats', []):
+            if fmt.get('vcodec') != 'none' or fmt.get('acodec') != 'none':
+                if fmt.get('format_id'):
+                    best_format = fmt['format_id']
+                    break
+        if best_format:
+            quality_options.append(("Best Video / Audio", best_format))
+    # Her durumda audio only ekle
+    quality_options.append(("Audio Only (Best)", "bestaudio"))
+    return {
+        'title': info.get('title','Unknown'),
+        'channel': info.get('uploader', info.get('channel','Unknown')),
+        'thumbnail': info.get('thumbnail',''),
+        'duration': info.get('duration') or 0,
+        'quality_options': quality_options,
+        'selections': [compact_selection(sel) for sel in selections if sel.get('height')],
+        'containers': containers,
+        'streams': _streams(index, quality_options + [opt for plan in containers.values() for opt in plan['quality_options']]),
+    }
+
+PLAYLIST_QUALITY_OPTIONS = [
+    ("Best Available", "bestvideo"),
+    ("1080p max", "bestvideo[height<=1080]"),
+    ("720p max", "bestvideo[height<=720]"),
+    ("480p max", "bestvideo[height<=480]"),
+    ("Audio Only (Best)", "bestaudio"),
+]
+
+def reduce_entry(entry, index):
+    url = entry.get('webpage_url') or entry.get('url') or ''
+    return {
+        'index': index,
+        'id': entry.get('id'),
+        'title': entry.get('title') or url,
+        'url': url,
+        'duration': entry.get('duration'),
+    }
+
+def reduce_playlist(info, count):
+    return {
+        'title': info.get('title','Playlist'),
+        'channel': info.get('uploader', info.get('channel','')),
+        'thumbnail': info.get('thumbnail',''),
+        'quality_options': list(PLAYLIST_QUALITY_OPTIONS),
+        'playlist': True,
+        'entry_count': count,
+    }
@@ -0,0 +1,183 @@
+"""
+VIGGA - Yerel Medya Sunucusu
+Benchmark için sentetik progressive dosya, HLS ve DASH manifest'leri sunan HTTP taklidi.
+Yanıt gecikmesi ve bağlantı başına bant genişliği ayarlanabilir; eşzamanlı bağlantı sayısı ölçülür.
+"""
+import http.server
+import json
+import random
+import re
+import threading
+import time
+
+CHUNK = 64 * 1024
+BLOCK_SIZE = 1024 * 1024
+SEGMENT_SECONDS = 2
+
+_PROGRESSIVE = re.compile(r'^/progressive/(\d+)\.mp4$')
+_STREAM = re.compile(r'^/(hls|dash)/(\d+)x(\d+)/(.+)$')
+
+def progressive_path(size):
+    return f"/progressive/{int(size)}.mp4"
+
+def hls_path(segments, segment_size):
+    return f"/hls/{int(segments)}x{int(segment_size)}/index.m3u8"
+
+def dash_path(segments, segment_size):
+    return f"/dash/{int(segments)}x{int(segment_size)}/manifest.mpd"
+
+def _m3u8(segments):
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3', f'#EXT-X-TARGETDURATION:{SEGMENT_SECONDS}', '#EXT-X-MEDIA-SEQUENCE:0']
+    for i in range(segments):
+        lines += [f'#EXTINF:{SEGMENT_SECONDS:.1f},', f'seg{i}.ts']
+    lines.append('#EXT-X-ENDLIST')
+    return '\n'.join(lines) + '\n'
+
+def _mpd(segments, segment_size):
+    bandwidth = segment_size * 8 // SEGMENT_SECONDS
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" minBufferTime="PT{SEGMENT_SECONDS}S"
+     mediaPresentationDuration="PT{segments * SEGMENT_SECONDS}S" profiles="urn:mpeg:dash:profile:isoff-live:2011">
+  <Period>
+    <AdaptationSet mimeType="video/mp4" contentType="video">
+      <Representation id="video" codecs="avc1.4d401f" width="1280" height="720" bandwidth="{bandwidth}">
+        <SegmentTemplate timescale="1" duration="{SEGMENT_SECONDS}" startNumber="0" initialization="init.mp4" media="seg$Number$.m4s"/>
+      </Representation>
+    </AdaptationSet>
+  </Period>
+</MPD>
+'''
+
+class MediaServer:
+    def __init__(self, latency_ms=0, bandwidth_kbps=0, host='127.0.0.1', port=0):
+        self.latency = latency_ms / 1000
+        self.bandwidth = bandwidth_kbps * 1024
+        self._block = random.Random(0).randbytes(BLOCK_SIZE)
+        self._lock = threading.Lock()
+        self.reset_stats()
+        server = self
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            def log_message(self, *args):
+                pass
+            def do_HEAD(self):
+                server._handle(self, head=True)
+            def do_GET(self):
+                server._handle(self, head=False)
+        self._httpd = http.server.ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='vigga-media-server', daemon=True)
+        self._thread.start()
+        return self
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {'requests': 0, 'bytes_sent': 0, 'active': 0, 'peak_connections': 0}
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+    def _handle(self, handler, head):
+        path = handler.path.split('?', 1)[0]
+        if path == '/_stats':
+            return self._send(handler, 200, json.dumps(self.stats()).encode(), 'application/json', head, shaped=False)
+        if path == '/_reset':
+            self.reset_stats()
+            return self._send(handler, 200, b'{}', 'application/json', head, shaped=False)
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['active'] += 1
+            self._stats['peak_connections'] = max(self._stats['peak_connections'], self._stats['active'])
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            self._route(handler, path, head)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self._lock:
+                self._stats['active'] -= 1
+    def _route(self, handler, path, head):
+        if path.startswith('/expired/'):
+            # Süresi dolmuş imzalı URL benzetimi
+            return self._send(handler, 403, b'expired', 'text/plain', head)
+        m = _PROGRESSIVE.match(path)
+        if m:
+            return self._send_range(handler, int(m.group(1)), 'video/mp4', head)
+        m = _STREAM.match(path)
+        if not m:
+            return self._send(handler, 404, b'not found', 'text/plain', head)
+        kind, segments, size, name = m.group(1), int(m.group(2)), int(m.group(3)), m.group(4)
+        if kind == 'hls' and name == 'index.m3u8':
+            return self._send(handler, 200, _m3u8(segments).encode(), 'application/vnd.apple.mpegurl', head)
+        if kind == 'dash' and name == 'manifest.mpd':
+            return self._send(handler, 200, _mpd(segments, size).encode(), 'application/dash+xml', head)
+        if kind == 'dash' and name == 'init.mp4':
+            return self._send_range(handler, 1024, 'video/mp4', head)
+        seg = re.match(r'^seg(\d+)\.(ts|m4s)$', name)
+        if seg and int(seg.group(1)) < segments:
+            return self._send_range(handler, size, 'video/mp2t' if kind == 'hls' else 'video/iso.segment', head)
+        return self._send(handler, 404, b'not found', 'text/plain', head)
+    def _send(self, handler, status, body, content_type, head, shaped=True):
+        handler.send_response(status)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        if not head:
+            self._write(handler, body, shaped)
+    def _send_range(self, handler, size, content_type, head):
+        start, end = 0, size - 1
+        rng = handler.headers.get('Range')
+        m = re.match(r'bytes=(\d+)-(\d*)', rng or '')
+        if m:
+            start = int(m.group(1))
+            end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+            if start >= size:
+                handler.send_response(416)
+                handler.send_header('Content-Range', f'bytes */{size}')
+                handler.send_header('Content-Length', '0')
+                handler.end_headers()
+                return
+            handler.send_response(206)
+            handler.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        else:
+            handler.send_response(200)
+        handler.send_header('Accept-Ranges', 'bytes')
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(end - start + 1))
+        handler.end_headers()
+        if not head:
+            self._write_synthetic(handler, start, end + 1)
+    def _write_synthetic(self, handler, start, stop):
+        began = time.monotonic()
+        sent = 0
+        offset = start
+        while offset < stop:
+            pos = offset % BLOCK_SIZE
+            n = min(CHUNK, stop - offset, BLOCK_SIZE - pos)
+            handler.wfile.write(self._block[pos:pos + n])
+            offset += n
+            sent += n
+            self._account(n)
+            self._pace(began, sent)
+    def _write(self, handler, body, shaped):
+        handler.wfile.write(body)
+        if shaped:
+            self._account(len(body))
+    def _account(self, n):
+        with self._lock:
+            self._stats['bytes_sent'] += n
+    def _pace(self, began, sent):
+        # Bağlantı başına hız sınırı: gönderilen bayt zamanın önüne geçtiyse beklenir
+        if not self.bandwidth:
+            return
+        ahead = sent / self.bandwidth - (time.monotonic() - began)
+        if ahead > 0:
+            time.sleep(ahead)
@@ -0,0 +1,203 @@
+"""
+VIGGA - Metadata Önbelleği
+extractor:id anahtarlı, diskte kalıcı LRU önbellek. Süre, format URL'lerindeki expire parametresine göre kısalır.
+URL'ler metin düzeyinde kanonikleştirilir; extractor anahtarını çıkarım worker'ı bulur ve kanonik URL ona takma ad olarak
+bağlanır. GUI sürecinde extractor regex'leri hiç derlenmez.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs, parse_qsl, urlencode, urlsplit, urlunsplit
+from settings import CACHE_DIR, get_setting
+
+METADATA_CACHE_PATH = os.path.join(CACHE_DIR, 'metadata.json')
+EXPIRY_MARGIN = 300
+# Yalnızca LRU sırası değiştiğinde dosya hemen yazılmaz; bu süre içinde tek yazım yapılır
+RECENCY_SAVE_DELAY = 5.0
+# Extractor eşleşmeyen URL'lerde medyayı değiştirmeyen parametreler (utm_* ayrıca elenir)
+TRACKING_PARAMS = {'si', 'feature', 'fbclid', 'gclid', 'igshid', 'igsh', 'ref', 'ref_src', 'pp', 'ab_channel',
+                   't', 'start', 'time_continue', 'mc_cid', 'mc_eid'}
+
+def canonical_url(url):
+    # Ucuz, yalnızca metin düzeyinde: şema eklenir, host küçültülür, izleme parametreleri ve fragment atılır
+    url = url.strip()
+    parts = urlsplit(url if '://' in url else 'https://' + url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k.lower() not in TRACKING_PARAMS and not k.lower().startswith('utm_')]
+    netloc = parts.netloc.lower()
+    for default in (':80', ':443'):
+        if netloc.endswith(default):
+            netloc = netloc[:-len(default)]
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path or '/', urlencode(sorted(query)), ''))
+
+def extractor_key_for_info(info):
+    ie_key = info.get('extractor_key') or info.get('ie_key')
+    if ie_key and info.get('id'):
+        return f"{ie_key}:{info['id']}"
+    return None
+
+def _url_expiry(url):
+    parsed = urlparse(url)
+    value = parse_qs(parsed.query).get('expire', [None])[0]
+    if value is None:
+        # Manifest URL'lerinde expire path içinde: .../expire/1700000000/...
+        parts = parsed.path.split('/')
+        if 'expire' in parts[:-1]:
+            value = parts[parts.index('expire') + 1]
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def expiry_for_info(info, default_ttl):
+    expires = time.time() + default_ttl
+    for f in info.get('formats') or []:
+        for url in (f.get('url'), f.get('manifest_url')):
+            ts = _url_expiry(url) if url and 'expire' in url else None
+            if ts:
+                expires = min(expires, ts - EXPIRY_MARGIN)
+    return expires
+
+class MetadataCache:
+    def __init__(self, path=METADATA_CACHE_PATH, max_entries=None, max_bytes=None, default_ttl=None):
+        self.path = path
+        self.max_entries = max_entries or get_setting('metadata_cache_entries')
+        self.max_bytes = max_bytes or get_setting('metadata_cache_mb') * 1024 * 1024
+        self.default_ttl = default_ttl or get_setting('metadata_cache_ttl_hours') * 3600
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._total = 0
+        self._aliases = {}
+        self._urls = {}
+        self._save_timer = None
+        self._load()
+    def get(self, key):
+        # Okuma yalnızca sırayı/süresi dolanı değiştirir; çökmede kaybolması sorun değil, yazım ertelenir
+        if not key:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if entry['expires'] <= time.time():
+                self._drop(key)
+                self._save_later()
+                return None
+            self._entries.move_to_end(key)
+            self._save_later()
+            return self._decode(entry['data'])
+    def media_key(self, url):
+        # Yalnızca sözlük araması: kanonik URL daha önce bir extractor anahtarına bağlandıysa o döner
+        with self._lock:
+            return self._aliases.get(canonical_url(url))
+    def put(self, key, payload, expires=None, url=None):
+        if not key:
+            return
+        entry = {'expires': expires or time.time() + self.default_ttl, 'data': payload}
+        with self._lock:
+            aliases = self._urls.get(key, set())
+            self._drop(key)
+            self._add(key, entry)
+            for alias in aliases | ({canonical_url(url)} if url else set()):
+                self._alias(alias, key)
+            self._evict()
+            self._save()
+    def update_for_url(self, url, payload):
+        self.update(self.media_key(url), payload)
+    def update(self, key, payload):
+        # Sonradan öğrenilen bilgi (ör. kesin boyutlar) yazılır; kaydın süresi korunur
+        with self._lock:
+            entry = self._entries.get(key) if key else None
+            expires = entry['expires'] if entry else None
+        if expires:
+            self.put(key, payload, expires)
+    def put_info(self, info, payload):
+        self.put(extractor_key_for_info(info), payload, expiry_for_info(info, self.default_ttl))
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._aliases.clear()
+            self._urls.clear()
+            self._total = 0
+            self._save()
+    def _decode(self, payload):
+        data = dict(payload)
+        data['quality_options'] = [tuple(opt) for opt in data.get('quality_options', [])]
+        if data.get('containers'):
+            data['containers'] = {name: dict(plan, quality_options=[tuple(opt) for opt in plan['quality_options']])
+                                  for name, plan in data['containers'].items()}
+        return data
+    def _add(self, key, entry):
+        self._entries[key] = entry
+        self._sizes[key] = len(json.dumps(entry, ensure_ascii=False))
+        self._total += self._sizes[key]
+    def _alias(self, url, key):
+        previous = self._aliases.get(url)
+        if previous and previous != key:
+            self._urls.get(previous, set()).discard(url)
+        self._aliases[url] = key
+        self._urls.setdefault(key, set()).add(url)
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        self._total -= self._sizes.pop(key, 0)
+        for url in self._urls.pop(key, ()):
+            self._aliases.pop(url, None)
+    def _evict(self):
+        now = time.time()
+        for key in [k for k, e in self._entries.items() if e['expires'] <= now]:
+            self._drop(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._total > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return
+        for key, entry in data.get('entries', []):
+            self._add(key, entry)
+        for url, key in data.get('aliases', {}).items():
+            if key in self._entries:
+                self._alias(url, key)
+        self._evict()
+    def flush(self):
+        with self._lock:
+            self._save()
+    def _save_later(self):
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(RECENCY_SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    def _save(self):
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump({'entries': list(self._entries.items()), 'aliases': self._aliases}, fh, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_metadata_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MetadataCache()
+        return _cache
+
+def flush_metadata_cache():
+    # Kapanışta ertelenmiş LRU yazımı; önbellek hiç açılmadıysa dokunulmaz
+    with _cache_lock:
+        cache = _cache
+    if cache is not None:
+        cache.flush()
@@ -0,0 +1,63 @@
+"""
+VIGGA - Çizim Sayacı
+--paint-report (ya da VIGGA_PAINT_REPORT=1) ile pencere başına çizim turu sayısı ve süresi, widget sınıfı başına
+paint olayı sayısı toplanır; çıkışta raporlanır. Kapalıyken hiçbir olay filtresi kurulmaz.
+"""
+import os
+import sys
+import time
+from collections import Counter
+from PyQt5.QtCore import QObject, QEvent
+
+def report_enabled():
+    return '--paint-report' in sys.argv or os.environ.get('VIGGA_PAINT_REPORT') == '1'
+
+class PaintStats(QObject):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frames = 0
+        self.frame_ms = 0.0
+        self.worst_ms = 0.0
+        self.paints = Counter()
+        self._started = time.perf_counter()
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind == QEvent.Paint:
+            self.paints[type(obj).__name__] += 1
+        elif kind == QEvent.UpdateRequest and obj.isWidgetType() and obj.isWindow():
+            # Üst pencerenin UpdateRequest'i tüm kirli bölgeyi eşzamanlı çizer; süre burada ölçülür
+            t0 = time.perf_counter()
+            handled = obj.event(event)
+            ms = (time.perf_counter() - t0) * 1000
+            self.frames += 1
+            self.frame_ms += ms
+            self.worst_ms = max(self.worst_ms, ms)
+            return handled
+        return False
+    def report(self):
+        elapsed = max(time.perf_counter() - self._started, 1e-6)
+        return {
+            'frames': self.frames,
+            'frames_per_s': round(self.frames / elapsed, 1),
+            'paint_ms': round(self.frame_ms, 1),
+            'avg_ms': round(self.frame_ms / self.frames, 2) if self.frames else 0.0,
+            'worst_ms': round(self.worst_ms, 1),
+            'busy_pct': round(self.frame_ms / (elapsed * 10), 2),
+            'paints': dict(self.paints.most_common()),
+        }
+    def print_report(self):
+        data = self.report()
+        lines = [f"VIGGA paint: {data['frames']} frames ({data['frames_per_s']}/s), "
+                 f"{data['paint_ms']} ms total, avg {data['avg_ms']} ms, worst {data['worst_ms']} ms, "
+                 f"{data['busy_pct']}% of wall time"]
+        for name, count in data['paints'].items():
+            lines.append(f"  {count:>8}  {name}")
+        print('\n'.join(lines), file=sys.stderr)
+
+def install(app):
+    if not report_enabled():
+        return None
+    stats = PaintStats(app)
+    app.installEventFilter(stats)
+    app.aboutToQuit.connect(stats.print_report)
+    return stats
@@ -0,0 +1,84 @@
+"""
+VIGGA - Son İşlem Havuzu
+ffmpeg birleştirme ve MP3 dönüştürme indirme slotlarından ayrı, CPU sayısıyla sınırlı bir süreç havuzunda çalışır.
+İndirmesi biten iş slotunu hemen bırakır; ağ aktarımı ile CPU işi üst üste biner.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from settings import get_setting
+
+def postprocess_workers():
+    return max(1, int(get_setting('postprocess_workers') or os.cpu_count() or 1))
+
+class PendingPostprocess:
+    # Süreçler arası taşınabilir iş: yt-dlp ayarları, indirilen dosya ve temizlenmiş info dict
+    def __init__(self, opts, filename, info, files_to_move, pp_names, container=None):
+        self.opts = opts
+        self.filename = filename
+        self.info = info
+        self.files_to_move = files_to_move
+        self.pp_names = pp_names
+        self.container = container
+
+def _run_postprocess(item):
+    # Worker sürecinde: ayarlardaki son işlemciler (ör. FFmpegExtractAudio) YoutubeDL ile yeniden kurulur,
+    # indirme sırasında eklenenler (birleştirme, fixup) sınıf adından oluşturulur
+    import yt_dlp
+    from yt_dlp import postprocessor
+    try:
+        with yt_dlp.YoutubeDL(item.opts) as ydl:
+            if item.container:
+                ydl.add_post_processor(container_postprocessor(item.container), when='post_process')
+            info = dict(item.info, __postprocessors=[getattr(postprocessor, name)(ydl) for name in item.pp_names])
+            info = ydl.post_process(item.filename, info, item.files_to_move)
+            return info.get('filepath')
+    except Exception as e:
+        # yt-dlp hataları traceback taşır; ana sürece yalnızca mesaj döner
+        raise RuntimeError(str(e)) from None
+
+def container_postprocessor(container):
+    # Birleştirme ve fixup'lardan sonra çalışır: codec'ler hedef container'a uyuyorsa stream copy (remux),
+    # uymuyorsa yeniden kodlama
+    from yt_dlp.postprocessor.common import PostProcessor
+    from yt_dlp.postprocessor import FFmpegVideoConvertorPP, FFmpegVideoRemuxerPP
+    from format_planner import REMUX, container_action
+
+    class ContainerPP(PostProcessor):
+        def action(self, info):
+            return container_action(info, container)
+        def run(self, info):
+            action = self.action(info)
+            if action is None:
+                return [], info
+            cls = FFmpegVideoRemuxerPP if action == REMUX else FFmpegVideoConvertorPP
+            return cls(self._downloader, container).run(info)
+    return ContainerPP()
+
+class PostprocessPool:
+    def __init__(self, size=None):
+        self.size = max(1, int(size or postprocess_workers()))
+        self._executor = None
+        self._lock = threading.Lock()
+    def submit(self, item):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.size, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor.submit(_run_postprocess, item)
+    def shutdown(self):
+        # Bekleyenler iptal edilir; süren dönüştürmeler tamamlanır (yt-dlp çıktıyı geçici adla yazar)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_postprocess_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PostprocessPool()
+        return _pool
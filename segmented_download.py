@@ -0,0 +1,91 @@
+"""
+VIGGA - Segmentli İndirme
+Progressive HTTP dosyaları paralel Range istekleriyle, DASH/HLS parçaları eşzamanlı indirilir.
+Aynı host'a açılan bağlantılar tüm indirmeler genelinde sınırlanır.
+"""
+import math
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from settings import get_setting
+
+_host_lock = threading.Lock()
+_host_slots = {}
+
+@contextmanager
+def host_slot(url):
+    host = urlparse(url).hostname or ''
+    with _host_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(max(1, get_setting('max_connections_per_host')))
+    with slot:
+        yield
+
+def segmented_opts():
+    connections = max(1, int(get_setting('segmented_connections')))
+    return {'segmented_connections': connections, 'concurrent_fragment_downloads': connections}
+
+_installed = False
+
+def install_segmented_downloaders():
+    # yt-dlp'nin downloader seçiminde tek genişletme noktası PROTOCOL_MAP; sınıflar
+    # segmented_connections parametresi yoksa orijinal davranışa düşer
+    global _installed
+    if _installed:
+        return
+    from yt_dlp import downloader
+    from yt_dlp.downloader.dash import DashSegmentsFD
+    from yt_dlp.downloader.fragment import FragmentFD
+    from yt_dlp.downloader.hls import HlsFD
+    from yt_dlp.downloader.http import HttpFD
+    from yt_dlp.networking import Request
+
+    class HostLimitedMixin:
+        def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_data=None):
+            with host_slot(frag_url):
+                return super()._download_fragment(ctx, frag_url, info_dict, headers, request_data)
+
+    class LimitedDashFD(HostLimitedMixin, DashSegmentsFD):
+        pass
+
+    class LimitedHlsFD(HostLimitedMixin, HlsFD):
+        pass
+
+    class SegmentedHttpFD(HostLimitedMixin, FragmentFD, HttpFD):
+        FD_NAME = 'segmented'
+        def real_download(self, filename, info_dict):
+            connections = self.params.get('segmented_connections') or 1
+            min_segment = max(1, get_setting('segment_size_mb')) * 1024 * 1024
+            headers = info_dict.get('http_headers') or {}
+            size = None
+            if connections > 1 and not info_dict.get('request_data') and 'Range' not in headers:
+                size = info_dict.get('filesize') or self._probe_size(info_dict['url'], headers)
+            if not size or size < 2 * min_segment:
+                with host_slot(info_dict['url']):
+                    return HttpFD.real_download(self, filename, info_dict)
+            segment = max(min_segment, math.ceil(size / (connections * 4)))
+            fragments = [
+                {'frag_index': i + 1, 'url': info_dict['url'], 'byte_range': {'start': start, 'end': min(start + segment, size)}}
+                for i, start in enumerate(range(0, size, segment))
+            ]
+            ctx = {'filename': filename, 'total_frags': len(fragments)}
+            self._prepare_and_start_frag_download(ctx, info_dict)
+            # .ytdl kaydındaki son parçadan devam
+            fragments = [f for f in fragments if f['frag_index'] > ctx['fragment_index']]
+            return self.download_and_append_fragments(ctx, fragments, info_dict)
+        def _probe_size(self, url, headers):
+            try:
+                with self.ydl.urlopen(Request(url, headers={**headers, 'Range': 'bytes=0-0'})) as resp:
+                    content_range = resp.headers.get('Content-Range') or ''
+                    if resp.status == 206 and '/' in content_range:
+                        return int(content_range.rsplit('/', 1)[1])
+            except Exception:
+                pass
+            return None
+
+    downloader.PROTOCOL_MAP.setdefault('http', SegmentedHttpFD)
+    downloader.PROTOCOL_MAP.setdefault('https', SegmentedHttpFD)
+    downloader.PROTOCOL_MAP['http_dash_segments'] = LimitedDashFD
+    downloader.PROTOCOL_MAP['m3u8_native'] = LimitedHlsFD
+    _installed = True
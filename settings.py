@@ -0,0 +1,50 @@
+"""
+VIGGA - Ayarlar
+Varsayılan değerler burada; uygulama klasöründeki settings.json varsa üzerine yazılır.
+"""
+import json
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SETTINGS_PATH = os.path.join(BASE_DIR, 'settings.json')
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+DEFAULTS = {
+    'max_parallel_downloads': 3,
+    'extractor_workers': 2,
+    'metadata_cache_entries': 500,
+    'metadata_cache_mb': 8,
+    'metadata_cache_ttl_hours': 6,
+    'quality_policy': 'best',
+    'quality_max_mb': 0,
+    'quality_max_minutes': 0,
+    'quality_height': 0,
+    'segmented_connections': 4,
+    'max_connections_per_host': 8,
+    'segment_size_mb': 4,
+    'bandwidth_limit_kbps': 0,
+    'bandwidth_schedule': [],
+    'thumbnail_cache_mb': 50,
+    'download_archive': True,
+    'postprocess_workers': 0,
+    'info_store_entries': 50,
+    'info_store_mb': 64,
+    'theme': 'dark',
+}
+
+def load_settings(path=SETTINGS_PATH):
+    settings = dict(DEFAULTS)
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            data = json.load(fh)
+        if isinstance(data, dict):
+            settings.update(data)
+    except (OSError, ValueError):
+        pass
+    return settings
+
+SETTINGS = load_settings()
+
+def get_setting(key):
+    return SETTINGS.get(key, DEFAULTS.get(key))
@@ -0,0 +1,54 @@
+"""
+VIGGA - Boyut Yoklayıcı
+Kalite listesindeki akışların kesin boyutu eşzamanlı HEAD (olmazsa 0-0 range GET) istekleriyle öğrenilir.
+Kısa bir süre sınırı vardır; yetişmeyen akışlar tahmini boyutla kalır.
+"""
+import http.client
+import re
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+
+PROBE_TIMEOUT = 3.0
+PROBE_WORKERS = 8
+_CONTENT_RANGE = re.compile(r'bytes\s+\d+-\d+/(\d+)')
+
+def _request(url, headers, method, extra=None):
+    req = urllib.request.Request(url, headers=dict(headers or {}, **(extra or {})), method=method)
+    return urllib.request.urlopen(req, timeout=PROBE_TIMEOUT)
+
+def probe_size(url, headers=None):
+    # Sıkıştırılmış yanıtın Content-Length'i dosya boyutu değildir; o durumda range isteğine düşülür
+    try:
+        with _request(url, headers, 'HEAD') as resp:
+            length = resp.headers.get('Content-Length')
+            if length and not resp.headers.get('Content-Encoding'):
+                return int(length)
+    except (OSError, ValueError, http.client.HTTPException):
+        pass
+    try:
+        with _request(url, headers, 'GET', {'Range': 'bytes=0-0'}) as resp:
+            match = _CONTENT_RANGE.match(resp.headers.get('Content-Range') or '')
+            if match:
+                return int(match.group(1))
+    except (OSError, ValueError, http.client.HTTPException):
+        pass
+    return None
+
+def probe_sizes(targets, timeout=PROBE_TIMEOUT):
+    # targets: {format_id: (url, headers)}; süre dolunca yalnızca tamamlananlar döner
+    if not targets:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(targets)), thread_name_prefix='vigga-probe')
+    futures = {executor.submit(probe_size, url, headers): fid for fid, (url, headers) in targets.items()}
+    done, _ = wait(futures, timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+    sizes = {}
+    for future in done:
+        # Tek bir bozuk sunucu diğer akışların sonuçlarını düşürmemeli
+        try:
+            size = future.result()
+        except Exception:
+            continue
+        if size:
+            sizes[futures[future]] = size
+    return sizes
@@ -0,0 +1,99 @@
+"""
+VIGGA - Açılış Zamanlaması
+Pencere önce açılır; yt_dlp, metadata önbelleği ve QtNetwork arka planda ısıtılır, indirme arşivi diskle eşitlenir.
+--startup-report (ya da VIGGA_STARTUP_REPORT=1) ile aşama ve import süreleri raporlanır.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from settings import DATA_DIR
+
+_START = time.perf_counter()
+STARTUP_LOG_PATH = os.path.join(DATA_DIR, 'startup.jsonl')
+STARTUP_LOG_KEEP = 200
+
+_marks = []
+_imports = []
+_lock = threading.Lock()
+_warm_thread = None
+
+def report_enabled():
+    return '--startup-report' in sys.argv or os.environ.get('VIGGA_STARTUP_REPORT') == '1'
+
+def mark(label):
+    with _lock:
+        _marks.append((label, time.perf_counter() - _START))
+
+def _timed_import(name):
+    t0 = time.perf_counter()
+    __import__(name)
+    with _lock:
+        _imports.append((name, time.perf_counter() - t0))
+
+def _warm():
+    # Modül importları thread'ler arası import kilidiyle korunur; GUI tarafı aynı modülü isterse ısınmanın bitmesini bekler
+    for name in ('yt_dlp', 'PyQt5.QtNetwork'):
+        try:
+            _timed_import(name)
+        except ImportError:
+            pass
+    from metadata_cache import get_metadata_cache
+    t0 = time.perf_counter()
+    # Extractor regex'leri worker süreçlerinde derlenir; burada yalnızca önbellek diskten okunur
+    get_metadata_cache()
+    with _lock:
+        _imports.append(('metadata cache', time.perf_counter() - t0))
+    from download_archive import get_download_archive
+    t0 = time.perf_counter()
+    # Uygulama kapalıyken silinen dosyaların arşiv kayıtları düşürülür
+    get_download_archive().prune()
+    with _lock:
+        _imports.append(('archive prune', time.perf_counter() - t0))
+    mark('warm-up done')
+    if report_enabled():
+        print_report()
+
+def warm_up():
+    global _warm_thread
+    with _lock:
+        if _warm_thread is not None:
+            return
+        _warm_thread = threading.Thread(target=_warm, name='vigga-warmup', daemon=True)
+    _warm_thread.start()
+
+def report():
+    with _lock:
+        return {
+            'time': time.time(),
+            'marks': [{'label': label, 'ms': round(t * 1000, 1)} for label, t in _marks],
+            'imports': [{'module': name, 'ms': round(t * 1000, 1)} for name, t in _imports],
+        }
+
+def print_report():
+    data = report()
+    lines = ['VIGGA startup']
+    for m in data['marks']:
+        lines.append(f"  {m['ms']:>8.1f} ms  {m['label']}")
+    if data['imports']:
+        lines.append('  background:')
+        for i in data['imports']:
+            lines.append(f"  {i['ms']:>8.1f} ms  {i['module']}")
+    print('\n'.join(lines), file=sys.stderr)
+    _append_log(data)
+
+def _append_log(data):
+    try:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        try:
+            with open(STARTUP_LOG_PATH, 'r', encoding='utf-8') as fh:
+                lines = fh.readlines()[-(STARTUP_LOG_KEEP - 1):]
+        except OSError:
+            lines = []
+        lines.append(json.dumps(data) + '\n')
+        with open(STARTUP_LOG_PATH + '.tmp', 'w', encoding='utf-8') as fh:
+            fh.writelines(lines)
+        os.replace(STARTUP_LOG_PATH + '.tmp', STARTUP_LOG_PATH)
+    except OSError:
+        pass
@@ -1,177 +1,275 @@
 """
 VIGGA - Stil Tanımlamaları
-Tüm hatalı/uyumsuz CSS kaldırıldı. Soft mor arka plan, round butonlar, text için okunaklı font ve bold header, spacing optimize. box-shadow ve transition yok, pastel ve kontrastlar uyumlu.
+Tüm uygulama için tek stylesheet: bileşenler sınıf adı, objectName ve role/slim property'leriyle seçilir.
+Devre dışı görünüm de :disabled kurallarıyla verilir; opaklık efekti kullanılmaz.
+Tema başına bir kez üretilip önbelleğe alınır; tema değişimi tek setStyleSheet çağrısıdır, widget başına CSS yok.
 """
+import functools
 
 RADIUS = 15
 FONT_FAMILY = "Segoe UI, Arial, Helvetica, sans-serif"
 
-COLORS = {
-    'background': '#362A42',
-    'surface': '#4D3A5D',
-    'surface_light': '#65507C',
-    'primary': '#C9A8FF',
-    'primary_dark': '#B491FF',
-    'text_primary': '#F8F6FB',
-    'text_secondary': '#E9DEF9',
-    'text_muted': '#BCA6D4',
-    'accent': '#E8D4FF',
-    'progress': 'qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #A185FF, stop:1 #EBCFFF)',
+THEMES = {
+    'dark': {
+        'background': '#362A42',
+        'surface': '#4D3A5D',
+        'surface_light': '#65507C',
+        'primary': '#C9A8FF',
+        'primary_dark': '#B491FF',
+        'text_primary': '#F8F6FB',
+        'text_secondary': '#E9DEF9',
+        'text_muted': '#BCA6D4',
+        'accent': '#E8D4FF',
+        'progress': 'qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #A185FF, stop:1 #EBCFFF)',
+    },
+    'light': {
+        'background': '#F6F1FC',
+        'surface': '#EADFF7',
+        'surface_light': '#DCCBF0',
+        'primary': '#8E62E0',
+        'primary_dark': '#7445CC',
+        'text_primary': '#2A1F35',
+        'text_secondary': '#4A3B5C',
+        'text_muted': '#7D6A93',
+        'accent': '#C9A8FF',
+        'progress': 'qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #7F5AF0, stop:1 #C9A8FF)',
+    },
 }
+DEFAULT_THEME = 'dark'
+COLORS = THEMES[DEFAULT_THEME]
 
-MAIN_WINDOW_STYLE = f"""
-    QWidget {{
-        background: transparent;
-        color: {COLORS['text_primary']};
-        font-family: {FONT_FAMILY};
-    }}
-"""
-
-CARD_STYLE = f"""
-    QWidget#Card {{
-        background: {COLORS['background']};
-        border-radius: {RADIUS}px;
-    }}
-"""
-
-URL_INPUT_STYLE = f"""
-    QLineEdit {{
-        background: {COLORS['surface_light']};
-        border: 2px solid {COLORS['primary']};
-        border-radius: 13px;
-        padding: 10px 15px;
-        color: {COLORS['text_primary']};
-        font-size: 14px;
-    }}
-    QLineEdit:focus {{
-        border: 2px solid {COLORS['accent']};
-        background: {COLORS['surface']};
-    }}
-"""
-
-PREVIEW_STYLE = f"""
-    QLabel {{
-        background: {COLORS['surface']};
-        border: 2px solid {COLORS['surface_light']};
-        border-radius: 12px;
-        color: {COLORS['text_muted']};
-        font-size: 14px;
-    }}
-"""
+_current = DEFAULT_THEME
 
-COMBO_STYLE = f"""
-    QComboBox {{
-        background: {COLORS['surface_light']};
-        border: 2px solid {COLORS['primary']};
-        border-radius: 13px;
-        padding: 8px 16px;
-        color: {COLORS['text_primary']};
-        font-size: 14px;
-    }}
-    QComboBox:hover {{
-        background: {COLORS['surface']};
-        border: 2px solid {COLORS['primary_dark']};
-    }}
-    QComboBox::drop-down {{
-        border: none;
-        width: 25px;
-    }}
-    QComboBox::down-arrow {{
-        image: none;
-        border-left: 5px solid transparent;
-        border-right: 5px solid transparent;
-        border-top: 5px solid {COLORS['text_secondary']};
-        margin-right: 7px;
-    }}
-    QComboBox QAbstractItemView {{
-        background: {COLORS['surface_light']};
-        border: 2px solid {COLORS['primary']};
-        border-radius: 9px;
-        selection-background-color: {COLORS['accent']};
-        color: {COLORS['text_primary']};
-        padding: 3px;
-    }}
-"""
+# Label türleri: role property'si ile seçilir (boyut, kalınlık, renk)
+LABEL_ROLES = {
+    'heading': 'font-size: 14px; font-weight: 600;',
+    'section': 'font-size: 13px; font-weight: 600;',
+    'progress': 'font-size: 13px; font-weight: 600;',
+    'row-title': 'font-size: 12px; font-weight: 600;',
+    'preview-title': 'font-size: 15px; font-weight: bold;',
+    'preview-channel': 'font-size: 12px; font-weight: 600; color: {text_muted};',
+}
 
-BUTTON_STYLE = f"""
-    QPushButton {{
-        background: {COLORS['primary']};
-        border: none;
-        border-radius: 14px;
-        padding: 10px;
-        color: {COLORS['text_primary']};
-        font-size: 15px;
-        font-family: {FONT_FAMILY};
-        font-weight: 600;
-        letter-spacing: 0.2px;
-    }}
-    QPushButton:hover {{
-        background: {COLORS['primary_dark']};
-    }}
-    QPushButton:pressed {{
-        background: {COLORS['accent']};
-        color: {COLORS['primary_dark']};
-    }}
+TEMPLATE = """
+QWidget {{
+    background: transparent;
+    color: {text_primary};
+    font-family: {font};
+}}
+QWidget#Card {{
+    background: {background};
+    border-radius: {radius}px;
+}}
+QWidget#Header {{ background: transparent; }}
+QLabel#Title {{
+    color: {text_primary};
+    font-size: 18px;
+    font-weight: 900;
+    letter-spacing: 0.2px;
+}}
+QLabel[role] {{
+    color: {text_primary};
+    letter-spacing: 0.1px;
+    background: transparent;
+}}
+{label_roles}
+QLabel[role="status"], QCheckBox[role="status"] {{
+    color: {text_secondary};
+    font-size: 12px;
+    background: transparent;
+}}
+ModernLineEdit {{
+    background: {surface_light};
+    border: 2px solid {primary};
+    border-radius: 13px;
+    padding: 10px 15px;
+    color: {text_primary};
+    font-size: 14px;
+}}
+ModernLineEdit:focus {{
+    border: 2px solid {accent};
+    background: {surface};
+}}
+CoverLabel {{
+    background: {surface};
+    border: 2px solid {surface_light};
+    border-radius: 12px;
+    color: {text_muted};
+    font-size: 14px;
+}}
+ModernComboBox {{
+    background: {surface_light};
+    border: 2px solid {primary};
+    border-radius: 13px;
+    padding: 8px 16px;
+    color: {text_primary};
+    font-size: 14px;
+}}
+ModernComboBox:hover {{
+    background: {surface};
+    border: 2px solid {primary_dark};
+}}
+ModernComboBox:disabled, ModernLineEdit:disabled {{
+    background: {surface};
+    border: 2px solid {surface_light};
+    color: {text_muted};
+}}
+ModernComboBox::drop-down {{
+    border: none;
+    width: 25px;
+}}
+ModernComboBox::down-arrow {{
+    image: none;
+    border-left: 5px solid transparent;
+    border-right: 5px solid transparent;
+    border-top: 5px solid {text_secondary};
+    margin-right: 7px;
+}}
+ModernComboBox QAbstractItemView {{
+    background: {surface_light};
+    border: 2px solid {primary};
+    border-radius: 9px;
+    selection-background-color: {accent};
+    color: {text_primary};
+    padding: 5px;
+    font-size: 14px;
+}}
+ModernComboBox QAbstractItemView::item {{
+    padding: 7px 2px 7px 12px;
+    min-height: 22px;
+}}
+PrimaryButton {{
+    background: {primary};
+    border: none;
+    border-radius: 14px;
+    padding: 10px;
+    color: {text_primary};
+    font-size: 15px;
+    font-weight: 600;
+    letter-spacing: 0.2px;
+}}
+PrimaryButton:hover {{
+    background: {primary_dark};
+}}
+PrimaryButton:pressed {{
+    background: {accent};
+    color: {primary_dark};
+}}
+PrimaryButton:disabled {{
+    background: {surface_light};
+    color: {text_muted};
+}}
+IconButton {{
+    background: transparent;
+    border: none;
+    color: {text_secondary};
+    padding: 4px;
+    border-radius: 2px;
+}}
+IconButton:hover {{
+    background: {accent};
+    border-radius: 7px;
+    color: {primary};
+}}
+IconButton:disabled {{
+    color: {text_muted};
+}}
+QProgressBar {{
+    background: {surface_light};
+    border: none;
+    border-radius: 8px;
+    height: 11px;
+    padding: 2px;
+    text-align: center;
+}}
+QProgressBar::chunk {{
+    background: {progress};
+    border-radius: 7px;
+    margin: 0px;
+}}
+QProgressBar[slim="true"] {{
+    border-radius: 4px;
+    height: 3px;
+}}
+QProgressBar[slim="true"]::chunk {{
+    border-radius: 3px;
+}}
+QProgressBar[state="paused"]::chunk, QProgressBar[state="failed"]::chunk {{
+    background: {text_muted};
+}}
+QueueView {{
+    background: transparent;
+    border: none;
+}}
+QueueView QScrollBar:vertical {{
+    background: transparent;
+    width: 6px;
+}}
+QueueView QScrollBar::handle:vertical {{
+    background: {surface_light};
+    border-radius: 3px;
+}}
+QueueView QScrollBar::add-line:vertical, QueueView QScrollBar::sub-line:vertical {{
+    height: 0px;
+}}
+HistoryView QTableView {{
+    background: transparent;
+    border: none;
+    selection-background-color: transparent;
+}}
+HistoryView QScrollBar:vertical {{
+    background: transparent;
+    width: 6px;
+}}
+HistoryView QScrollBar::handle:vertical {{
+    background: {surface_light};
+    border-radius: 3px;
+    min-height: 24px;
+}}
+HistoryView QScrollBar::add-line:vertical, HistoryView QScrollBar::sub-line:vertical {{
+    height: 0px;
+}}
+PlaylistView QListWidget {{
+    background: {surface};
+    border: 2px solid {surface_light};
+    border-radius: 12px;
+    color: {text_primary};
+    font-size: 12px;
+    padding: 4px;
+}}
+PlaylistView QListWidget::item {{
+    padding: 3px 2px;
+}}
+PlaylistView QListWidget::item:selected {{
+    background: {surface_light};
+    color: {text_primary};
+}}
 """
 
-ICON_BUTTON_STYLE = f"""
-    QToolButton {{
-        background: transparent;
-        border: none;
-        color: {COLORS['text_secondary']};
-        padding: 4px;
-        border-radius: 2px;
-    }}
-    QToolButton:hover {{
-        background: {COLORS['accent']};
-        border-radius: 7px;
-        color: {COLORS['primary']};
-    }}
-"""
+@functools.lru_cache(maxsize=None)
+def stylesheet(theme=DEFAULT_THEME):
+    colors = THEMES.get(theme) or THEMES[DEFAULT_THEME]
+    roles = '\n'.join(f'QLabel[role="{role}"] {{ {rules.format(**colors)} }}' for role, rules in LABEL_ROLES.items())
+    return TEMPLATE.format(font=FONT_FAMILY, radius=RADIUS, label_roles=roles, **colors)
 
-HEADER_STYLE = f"""
-    QWidget#Header {{ background: transparent; }}
-    QLabel#Title {{
-        color: {COLORS['text_primary']};
-        font-size: 18px;
-        font-family: {FONT_FAMILY};
-        font-weight: 900;
-        letter-spacing: 0.2px;
-    }}
-"""
+def palette():
+    # QPainter ile çizen bileşenler (spinner vb.) renkleri buradan okur
+    return THEMES[_current]
 
-PROGRESS_STYLE = f"""
-    QProgressBar {{
-        background: {COLORS['surface_light']};
-        border: none;
-        border-radius: 8px;
-        height: 11px;
-        padding: 2px;
-        text-align: center;
-    }}
-    QProgressBar::chunk {{
-        background: {COLORS['progress']};
-        border-radius: 7px;
-        margin: 0px;
-    }}
-"""
+def current_theme():
+    return _current
 
-STATUS_LABEL_STYLE = f"""
-    QLabel {{
-        color: {COLORS['text_secondary']};
-        font-size: 12px;
-        background: transparent;
-        font-family: {FONT_FAMILY};
-    }}
-"""
+def apply_theme(app, theme=DEFAULT_THEME):
+    # Qt stylesheet'i bir kez ayrıştırır ve tüm widget'ları tek seferde yeniden cilalar
+    global _current
+    _current = theme if theme in THEMES else DEFAULT_THEME
+    app.setStyleSheet(stylesheet(_current))
+    # palette() ile kendini çizen widget'lar stylesheet değişiminden haberdar olmaz; yeniden çizilmeleri istenir
+    for widget in app.allWidgets():
+        widget.update()
 
-LABEL_STYLE = f"""
-    QLabel {{
-        color: {COLORS['text_primary']};
-        font-size: 14px;
-        font-weight: 600;
-        font-family: {FONT_FAMILY};
-        letter-spacing: 0.1px;
-        background: transparent;
-    }}
-"""
+def set_variant(widget, name, value):
+    # Gösterildikten sonra değişen property için yalnızca o widget yeniden cilalanır
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
@@ -0,0 +1,71 @@
+"""
+VIGGA - Bant Genişliği Zamanlayıcısı Testleri
+"""
+import threading
+import time
+import pytest
+import bandwidth
+from bandwidth import BandwidthScheduler, scheduled_limit_kbps
+
+@pytest.fixture
+def settings(monkeypatch):
+    values = {'bandwidth_limit_kbps': 0, 'bandwidth_schedule': []}
+    monkeypatch.setattr(bandwidth, 'get_setting', values.get)
+    return values
+
+def test_schedule_rules(settings):
+    settings['bandwidth_limit_kbps'] = 100
+    settings['bandwidth_schedule'] = [{'start': '09:00', 'end': '18:00', 'kbps': 2000},
+                                      {'start': '22:00', 'end': '06:00', 'kbps': 0},
+                                      {'start': 'bad'}]
+    day = time.mktime((2026, 1, 5, 12, 0, 0, 0, 0, -1))
+    evening = time.mktime((2026, 1, 5, 20, 0, 0, 0, 0, -1))
+    night = time.mktime((2026, 1, 5, 2, 30, 0, 0, 0, -1))
+    assert scheduled_limit_kbps(day) == 2000
+    assert scheduled_limit_kbps(evening) == 100
+    assert scheduled_limit_kbps(night) == 0
+
+def test_unlimited_flow_never_waits(settings):
+    flow = BandwidthScheduler().open_flow()
+    t0 = time.monotonic()
+    flow.consume(100 * 1024 * 1024)
+    assert time.monotonic() - t0 < 0.05
+
+def test_weights_share_limit(settings):
+    settings['bandwidth_limit_kbps'] = 300
+    scheduler = BandwidthScheduler()
+    heavy = scheduler.open_flow(2)
+    light = scheduler.open_flow(1)
+    assert scheduler.flow_rate(heavy) == pytest.approx(200 * 1024)
+    assert scheduler.flow_rate(light) == pytest.approx(100 * 1024)
+    heavy.close()
+    assert scheduler.flow_rate(light) == pytest.approx(300 * 1024)
+
+def test_token_bucket_throttles_to_rate(settings):
+    settings['bandwidth_limit_kbps'] = 100
+    flow = BandwidthScheduler().open_flow()
+    t0 = time.monotonic()
+    flow.consume(20 * 1024)
+    elapsed = time.monotonic() - t0
+    assert 0.15 <= elapsed < 0.5
+
+def test_cancel_event_interrupts_wait(settings):
+    settings['bandwidth_limit_kbps'] = 1
+    flow = BandwidthScheduler().open_flow()
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+    t0 = time.monotonic()
+    flow.consume(100 * 1024, cancel)
+    assert time.monotonic() - t0 < 0.5
+
+def test_interactive_reserve(settings):
+    settings['bandwidth_limit_kbps'] = 1000
+    scheduler = BandwidthScheduler()
+    assert scheduler.bulk_limit() == 1000 * 1024
+    with scheduler.interactive():
+        assert scheduler.bulk_limit() == pytest.approx(1000 * 1024 * (1 - bandwidth.INTERACTIVE_RESERVE))
+    settings['bandwidth_limit_kbps'] = 0
+    scheduler.measured_bps = 5000
+    with scheduler.interactive():
+        assert scheduler.bulk_limit() == pytest.approx(5000 * (1 - bandwidth.INTERACTIVE_RESERVE))
+    assert scheduler.bulk_limit() is None
@@ -0,0 +1,33 @@
+"""
+VIGGA - Benchmark Testleri
+Küçük dosyalarla gerçek indirme yolu yerel medya sunucusu sürecine karşı koşturulur.
+"""
+import pytest
+from benchmark import MB, ServerProcess, compare, run_case, summarize
+from media_server import progressive_path, hls_path
+
+@pytest.fixture(scope='module')
+def server():
+    with ServerProcess(latency_ms=0, bandwidth_kbps=0) as server:
+        yield server
+
+def test_progressive_case_reports_bytes_and_connections(server):
+    result = run_case(server, server.base_url + progressive_path(2 * MB), connections=2)
+    assert result['ok'] and result['error'] is None
+    assert result['bytes'] == 2 * MB and result['mb_per_s'] > 0
+    assert result['requests'] >= 1 and 1 <= result['peak_connections'] <= 2
+
+def test_hls_case_fetches_every_segment(server):
+    result = run_case(server, server.base_url + hls_path(4, 64 * 1024), connections=1)
+    assert result['ok'] and result['bytes'] == 4 * 64 * 1024
+    # Manifest + 4 segment
+    assert result['requests'] >= 5
+
+def test_summary_scaling_and_comparison():
+    runs = [dict(scenario='hls', connections=n, ok=True, ttfb_ms=10.0, mb_per_s=speed, cpu_ms_per_mb=5.0, peak_connections=n)
+            for n, speed in ((1, 10.0), (1, 12.0), (4, 33.0))]
+    runs.append(dict(scenario='hls', connections=4, ok=False))
+    summary = summarize(runs)
+    assert summary['hls/1']['mb_per_s'] == 11.0 and summary['hls/4']['scaling'] == 3.0
+    lines = compare(summary, {'summary': {'hls/4': dict(summary['hls/4'], mb_per_s=30.0)}})
+    assert len(lines) == 1 and 'mb_per_s +10.0%' in lines[0]
@@ -0,0 +1,61 @@
+"""
+VIGGA - Kart Gölgesi ve Çizim Sayacı Testleri
+"""
+import pytest
+import paint_stats
+from conftest import wait_until
+
+@pytest.fixture
+def shadow(qapp):
+    from card_shadow import CardShadow
+    return CardShadow(15, 12, (0, 6))
+
+def test_pixmap_is_blurred_once_and_shared(shadow):
+    from card_shadow import CardShadow
+    assert shadow.pixmap.width() == shadow.pixmap.height() == 2 * (12 + 15) + 1
+    assert CardShadow(15, 12).pixmap.cacheKey() == shadow.pixmap.cacheKey()
+
+def test_inner_updates_skip_the_shadow(shadow):
+    from PyQt5.QtCore import QRect
+    card = QRect(12, 12, 312, 616)
+    # İlerleme çubuğu gibi kartın ortasındaki güncellemeler
+    assert shadow.covers(card, QRect(40, 500, 250, 4))
+    # Yuvarlak köşeye ya da kart dışına taşan alanlar gölgeyi yeniden çizer
+    assert not shadow.covers(card, QRect(12, 12, 20, 20))
+    assert not shadow.covers(card, QRect(300, 600, 30, 30))
+    assert not shadow.covers(card, QRect(0, 0, 336, 640))
+
+def test_paint_draws_only_the_edge_pieces(shadow):
+    from PyQt5.QtCore import Qt, QRect
+    from PyQt5.QtGui import QImage, QPainter
+    image = QImage(336, 640, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    card = QRect(12, 12, 312, 616)
+    shadow.paint(painter, card)
+    painter.end()
+    # Kenarın hemen dışında gölge var, kartın ortası boş kalır
+    assert image.pixelColor(168, card.bottom() + 8).alpha() > 0
+    assert image.pixelColor(168, 320).alpha() == 0
+
+def test_paint_report_is_opt_in(qapp, monkeypatch):
+    monkeypatch.delenv('VIGGA_PAINT_REPORT', raising=False)
+    monkeypatch.setattr('sys.argv', ['main.py'])
+    assert paint_stats.install(qapp) is None
+    monkeypatch.setenv('VIGGA_PAINT_REPORT', '1')
+    assert paint_stats.report_enabled()
+
+def test_paint_events_are_counted_per_class(qapp):
+    from PyQt5.QtWidgets import QLabel
+    stats = paint_stats.PaintStats()
+    qapp.installEventFilter(stats)
+    try:
+        label = QLabel('x')
+        label.show()
+        wait_until(qapp, lambda: stats.frames >= 1)
+    finally:
+        qapp.removeEventFilter(stats)
+        label.close()
+    report = stats.report()
+    # Pencerenin çizim turu ölçülür, içindeki paint olayları sınıf adıyla sayılır
+    assert report['frames'] >= 1 and report['paints'].get('QLabel', 0) >= 1
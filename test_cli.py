@@ -0,0 +1,71 @@
+"""
+VIGGA - Komut Satırı Testleri
+Yerel bir HTTP sunucusundan toplu indirme; olaylar satır başına JSON olarak okunur.
+"""
+import asyncio
+import functools
+import io
+import json
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import download_archive
+from download_archive import DownloadArchive
+from cli import BatchRunner, JsonEmitter, build_parser, format_id_for, read_urls
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture(autouse=True)
+def archive(tmp_path, monkeypatch):
+    archive = DownloadArchive(str(tmp_path / 'archive.sqlite3'))
+    monkeypatch.setattr(download_archive, '_archive', archive)
+    return archive
+
+@pytest.fixture
+def server(tmp_path):
+    root = tmp_path / 'www'
+    root.mkdir()
+    for name in ('a.mp4', 'b.mp4'):
+        (root / name).write_bytes(os.urandom(64 * 1024))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=str(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.root = root
+    server.base_url = f'http://127.0.0.1:{server.server_port}/'
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def events(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+def test_format_id_from_arguments():
+    parser = build_parser()
+    assert format_id_for(parser.parse_args(['u'])) == 'bestvideo'
+    assert format_id_for(parser.parse_args(['u', '--max-height', '720'])) == 'bestvideo[height<=720]'
+    assert format_id_for(parser.parse_args(['u', '-f', 'Audio Only (MP3)'])) == 'bestaudio'
+    assert format_id_for(parser.parse_args(['u', '--max-height', '720', '--format-id', '22'])) == '22'
+
+def test_urls_are_read_lazily_from_arguments_then_file(tmp_path):
+    batch = tmp_path / 'urls.txt'
+    batch.write_text('# comment\n\nhttps://x/2\n  https://x/3  \n')
+    args = build_parser().parse_args(['https://x/1', '-a', str(batch)])
+    urls = read_urls(args)
+    assert next(urls) == 'https://x/1'
+    assert list(urls) == ['https://x/2', 'https://x/3']
+
+def test_batch_emits_json_lines_and_counts_failures(server, tmp_path):
+    stream = io.StringIO()
+    runner = BatchRunner(jobs=2, format_id='best', selected_format='MP4', outtmpl=str(tmp_path / '%(title)s.%(ext)s'),
+                         emitter=JsonEmitter(stream), interval=0.05)
+    urls = [server.base_url + 'a.mp4', server.base_url + 'b.mp4', server.base_url + 'missing.mp4']
+    assert asyncio.run(runner.run(iter(urls))) == 1
+    log = events(stream)
+    assert [e['event'] for e in log if e['event'] == 'started'] == ['started'] * 3
+    finished = {e['url']: e for e in log if e['event'] == 'finished'}
+    assert set(finished) == set(urls[:2]) and finished[urls[0]]['downloaded'] == 64 * 1024
+    assert [e['url'] for e in log if e['event'] == 'error'] == [urls[2]]
+    assert log[-1]['event'] == 'summary' and (log[-1]['completed'], log[-1]['failed']) == (2, 1)
+    assert (tmp_path / 'a.mp4').read_bytes() == (server.root / 'a.mp4').read_bytes()
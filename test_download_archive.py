@@ -0,0 +1,59 @@
+"""
+VIGGA - İndirme Arşivi Testleri
+"""
+import os
+import time
+import pytest
+import download_archive
+from download_archive import DownloadArchive, format_key, file_hash
+from download_core import DownloadTask
+from media_server import MediaServer, progressive_path
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    archive = DownloadArchive(str(tmp_path / 'archive.sqlite3'))
+    monkeypatch.setattr(download_archive, '_archive', archive)
+    return archive
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+def test_record_lookup_and_background_hash(archive, tmp_path):
+    video = tmp_path / 'a.mp4'
+    video.write_bytes(b'x' * 1000)
+    fmt = format_key('22', 'MP4')
+    archive.record('Youtube:a', fmt, 'https://youtu.be/a', str(video))
+    assert archive.lookup('Youtube:a', fmt)['size'] == 1000
+    assert archive.lookup('Youtube:a', format_key('18', 'MP4')) is None
+    assert archive.lookup(None, fmt) is None
+    wait_for(lambda: archive.lookup('Youtube:a', fmt)['sha1'] == file_hash(str(video)))
+
+def test_changed_or_deleted_files_are_dropped(archive, tmp_path):
+    fmt = format_key('best', 'MP4')
+    for name in ('a', 'b', 'c'):
+        (tmp_path / f'{name}.mp4').write_bytes(b'x' * 10)
+        archive.record(f'Generic:{name}', fmt, None, str(tmp_path / f'{name}.mp4'))
+    (tmp_path / 'a.mp4').write_bytes(b'x' * 11)
+    assert archive.lookup('Generic:a', fmt) is None and archive.count() == 2
+    os.remove(tmp_path / 'b.mp4')
+    assert archive.prune() == 1 and archive.count() == 1
+
+def test_known_media_is_skipped_before_and_after_extraction(archive, tmp_path):
+    server = MediaServer().start()
+    try:
+        url = server.base_url + progressive_path(64 * 1024)
+        outtmpl = str(tmp_path / 'dl' / '%(id)s.%(ext)s')
+        assert DownloadTask(url, 'best', 'MP4', outtmpl=outtmpl).run() == (True, "Download complete")
+        assert archive.count() == 1
+        requests = server.stats()['requests']
+        # Önizlemeden bilinen anahtar: istek atılmadan atlanır
+        key = archive._db.execute('SELECT media_key FROM downloads').fetchone()[0]
+        assert DownloadTask(url, 'best', 'MP4', outtmpl=outtmpl, media_key=key).run() == (True, "Already downloaded")
+        assert server.stats()['requests'] == requests
+        # Anahtar bilinmiyorsa çıkarımdan sonra, indirmeden önce atlanır
+        assert DownloadTask(url, 'best', 'MP4', outtmpl=outtmpl).run() == (True, "Already downloaded")
+    finally:
+        server.stop()
@@ -0,0 +1,72 @@
+"""
+VIGGA - İndirme Geçmişi Testleri
+"""
+import pytest
+from download_history import DownloadHistory, ORDERS
+
+@pytest.fixture
+def history(tmp_path):
+    history = DownloadHistory(str(tmp_path / 'history.sqlite3'))
+    titles = ['beta', 'Alpha', 'alpha', 'gamma', '100% real', 'under_score', 'Delta']
+    for i in range(60):
+        # Tekrarlanan created/size/title değerleri keyset eşitliklerinin id ile ayrılmasını sınar
+        history.add(f'https://x/{i}', f'{titles[i % len(titles)]} {i // 20}', channel=f'ch{i % 3}',
+                    size=(i % 5) * 100, created=1000 + i // 4)
+    return history
+
+@pytest.mark.parametrize('order', sorted(ORDERS))
+@pytest.mark.parametrize('search', ['', 'alpha', 'ch1'])
+def test_keyset_pages_match_offset_pages(history, order, search):
+    expected = [e['id'] for e in history.page(1000, search=search, order=order)]
+    assert len(expected) == history.count(search)
+    seen, after = [], None
+    while True:
+        rows = history.page(7, search=search, order=order, after=after)
+        if not rows:
+            break
+        seen += [e['id'] for e in rows]
+        after = rows[-1]
+    assert seen == expected
+    offset = [e['id'] for start in range(0, len(expected), 7) for e in history.page(7, start, search, order)]
+    assert offset == expected
+
+def test_search_escapes_like_wildcards(history):
+    assert history.count('%') == history.count('100%')
+    assert all('%' in e['title'] for e in history.page(100, search='%'))
+    assert all('_' in e['title'] for e in history.page(100, search='_'))
+
+def test_remove_and_clear(history):
+    first = history.page(1)[0]
+    history.remove(first['id'])
+    assert history.count() == 59
+    assert history.page(1)[0]['id'] != first['id']
+    history.clear()
+    assert history.count() == 0 and history.page(10) == []
+
+def test_add_reads_size_from_file(tmp_path, history):
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(b'x' * 1234)
+    entry_id = history.add('https://x/f', '', path=str(path), created=5000)
+    entry = history.page(1)[0]
+    assert entry['id'] == entry_id and entry['size'] == 1234 and entry['title'] == 'https://x/f'
+
+def test_view_reads_only_visible_blocks_and_deletes(qapp, history):
+    from PyQt5.QtCore import Qt, QEvent
+    from PyQt5.QtGui import QKeyEvent
+    from history_view import HistoryView, BLOCK_ROWS
+    view = HistoryView(history)
+    counts = []
+    view.count_changed.connect(counts.append)
+    model = view.model
+    assert model.rowCount() == 60
+    assert model.entry(0)['id'] == history.page(1)[0]['id']
+    # Satırlar blok blok okunur; ilk erişim tüm tabloyu yüklemez
+    assert list(model._blocks) == [0] and len(model._blocks[0]) == min(BLOCK_ROWS, 60)
+    view.list.setCurrentIndex(model.index(0))
+    view.keyPressEvent(QKeyEvent(QEvent.KeyPress, Qt.Key_Delete, Qt.NoModifier))
+    assert history.count() == 59 and counts == [59]
+    view.search_input.setText('ch1')
+    view._apply_search()
+    assert model.rowCount() == history.count('ch1') and counts[-1] == model.rowCount()
+    view.clear()
+    assert model.rowCount() == 0 and history.count() == 0
@@ -0,0 +1,47 @@
+"""
+VIGGA - İndirme Günlüğü Testleri
+"""
+import json
+import time
+import download_journal
+from download_journal import DownloadJournal
+
+def read(path):
+    with open(path, encoding='utf-8') as fh:
+        return {e['id']: e for e in json.load(fh)}
+
+def test_record_many_is_flushed_once_later(tmp_path, monkeypatch):
+    monkeypatch.setattr(download_journal, 'FLUSH_INTERVAL', 0.2)
+    path = str(tmp_path / 'journal.json')
+    journal = DownloadJournal(path)
+    journal.record('https://x/0', 'best', 'MP4')
+    t0 = time.perf_counter()
+    ids = journal.record_many([(f'https://x/{i}', 'best', 'MP4', '', None) for i in range(1, 2000)])
+    assert time.perf_counter() - t0 < 0.5
+    assert len(read(path)) == 1
+    time.sleep(0.4)
+    entries = read(path)
+    assert len(entries) == 2000 and set(ids) <= set(entries)
+
+def test_durable_states_are_written_immediately(tmp_path, monkeypatch):
+    monkeypatch.setattr(download_journal, 'FLUSH_INTERVAL', 60)
+    path = str(tmp_path / 'journal.json')
+    journal = DownloadJournal(path)
+    journal_id = journal.record('https://x/0', 'best', 'MP4')
+    journal.set_state(journal_id, 'running')
+    assert read(path)[journal_id]['state'] == 'queued'
+    journal.set_state(journal_id, 'paused')
+    assert read(path)[journal_id]['state'] == 'paused'
+    assert DownloadJournal(path).unfinished()[0]['state'] == 'paused'
+
+def test_prepare_resume_truncates_to_recorded_offset(tmp_path):
+    journal = DownloadJournal(str(tmp_path / 'journal.json'))
+    journal_id = journal.record('https://x/0', 'best', 'MP4')
+    part = tmp_path / 'video.mp4.part'
+    part.write_bytes(b'x' * 500)
+    journal.update_progress(journal_id, {'status': 'downloading', 'tmpfilename': str(part),
+                                         'filename': str(tmp_path / 'video.mp4'), 'downloaded_bytes': 300})
+    journal.prepare_resume(journal_id)
+    assert part.stat().st_size == 300
+    journal.discard(journal_id)
+    assert not part.exists() and journal.unfinished() == []
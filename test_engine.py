@@ -0,0 +1,269 @@
+"""
+VIGGA - İndirme Motoru Testleri
+İndirme görevi ve extractor havuzu sahte nesnelerle değiştirilir; öncelik, duraklat/devam/iptal, günlük ve tekilleştirme sınanır.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+import pytest
+import engine
+import metadata_cache
+from download_journal import DownloadJournal
+from download_history import DownloadHistory
+from metadata_cache import MetadataCache
+from engine import DownloadEngine, Job, RUNNING, PAUSED, DONE, FAILED, SPEED_ALPHA, format_eta, render_progress
+
+MB = 1024 * 1024
+
+class FakeTask:
+    started = []
+    def __init__(self, url, format_id, selected_format, journal_id=None, weight=1.0, outtmpl=None, **options):
+        self.url = url
+        self.weight = weight
+        self.files = set()
+        self.pending = []
+        self.info_rejected = False
+        self.filepath = None
+        self.meta = {}
+        self._result = None
+        self._done = threading.Event()
+        FakeTask.started.append(self)
+    def run(self):
+        self._done.wait(10)
+        return self._result
+    def finish(self, ok=True, message='ok'):
+        self._result = (ok, message)
+        self._done.set()
+    def cancel(self, keep_partial=False):
+        self.finish(False, 'Cancelled')
+    def snapshot(self):
+        return getattr(self, 'state', (0, 0, 'downloading'))
+    def set_weight(self, weight):
+        self.weight = weight
+    def partial_files(self):
+        return set(self.files)
+
+class FakePool:
+    # Eşleşme yok (anahtar kanonik URL olur); çıkarımlar elle tamamlanır
+    def __init__(self):
+        self.submitted = []
+    def match(self, urls):
+        future = Future()
+        future.set_result([None] * len(urls))
+        return future
+    def submit(self, url, progress=None, entries=None):
+        future = Future()
+        self.submitted.append((url, progress, entries, future))
+        return future
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    FakeTask.started = []
+    monkeypatch.setattr(engine, 'DownloadTask', FakeTask)
+    monkeypatch.setattr(metadata_cache, '_cache', MetadataCache(path=str(tmp_path / 'metadata.json')))
+    journal = DownloadJournal(str(tmp_path / 'journal.json'))
+    history = DownloadHistory(str(tmp_path / 'history.sqlite3'))
+    def run(scenario, extractor_pool=None):
+        async def main():
+            dl = DownloadEngine(max_parallel=1, journal=journal, history=history, extractor_pool=FakePool() if extractor_pool is None else extractor_pool)
+            try:
+                return await scenario(dl)
+            finally:
+                for task in FakeTask.started:
+                    task.finish()
+                await dl.shutdown()
+        return asyncio.run(main())
+    run.journal = journal
+    run.history = history
+    return run
+
+def item(url, **kwargs):
+    return dict(dict(url=url, format_id='best', selected_format='MP4'), **kwargs)
+
+async def wait_for(predicate, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError('timed out')
+
+def started_urls():
+    return [t.url for t in FakeTask.started]
+
+def test_higher_priority_starts_first_and_ties_keep_order(run):
+    async def scenario(dl):
+        first, low, a, b = await dl.add_many([item('https://x/0'), item('https://x/low', priority=-1),
+                                        item('https://x/a'), item('https://x/b')])
+        dl.set_priority(b.job_id, 1)
+        for job in (first, b, a):
+            FakeTask.started[-1].finish()
+            assert await job.wait() == DONE
+        await wait_for(lambda: low.state == RUNNING)
+    run(scenario)
+    assert started_urls() == ['https://x/0', 'https://x/b', 'https://x/a', 'https://x/low']
+
+def test_pause_resume_and_pending_count(run):
+    async def scenario(dl):
+        first, second = await dl.add_many([item('https://x/0'), item('https://x/1')])
+        assert dl.active_count() == 1 and dl.pending_count() == 2
+        dl.pause(second.job_id)
+        assert second.state == PAUSED and dl.pending_count() == 1
+        dl.pause(first.job_id)
+        await wait_for(lambda: first.state == PAUSED)
+        assert dl.active_count() == 0 and dl.pending_count() == 0
+        dl.resume(second.job_id)
+        assert second.state == RUNNING and dl.pending_count() == 1
+    run(scenario)
+    assert started_urls() == ['https://x/0', 'https://x/1']
+
+def test_cancelling_a_paused_job_removes_its_part_files(run, tmp_path):
+    part = tmp_path / 'video.mp4.part'
+    part.write_bytes(b'x')
+    async def scenario(dl):
+        job = await dl.add(**item('https://x/0'))
+        FakeTask.started[0].files = {str(tmp_path / 'video.mp4')}
+        dl.pause(job.job_id)
+        await wait_for(lambda: job.state == PAUSED)
+        assert part.exists() and job.partial
+        dl.cancel(job.job_id)
+        await wait_for(lambda: not part.exists())
+        return dl.job(job.job_id)
+    assert run(scenario) is None
+
+def test_failed_job_can_be_retried(run):
+    async def scenario(dl):
+        job = await dl.add(**item('https://x/0'))
+        FakeTask.started[0].finish(False, 'HTTP Error 500')
+        assert await job.wait() == FAILED and job.message == 'HTTP Error 500'
+        dl.resume(job.job_id)
+        return job.state
+    assert run(scenario) == RUNNING and len(FakeTask.started) == 2
+
+def test_url_forms_share_one_job_before_extraction(run):
+    async def scenario(dl):
+        blocker = await dl.add(**item('https://x/0'))
+        jobs = await dl.add_many([item('https://youtu.be/dQw4w9WgXcQ'),
+                                  item('https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42'),
+                                  item('https://m.youtube.com/watch?v=dQw4w9WgXcQ&si=x')])
+        again = await dl.add(**item('youtube.com/watch?v=dQw4w9WgXcQ'))
+        other = await dl.add(**item('https://youtu.be/dQw4w9WgXcQ', selected_format='WEBM'))
+        return blocker, jobs, again, other, dl.pending_count()
+    # Havuz yok: URL eşleştirmesi bu süreçte yapılır
+    blocker, jobs, again, other, pending = run(scenario, extractor_pool=False)
+    assert jobs[0] is jobs[1] is jobs[2] is again and other is not again
+    assert jobs[0].key == 'Youtube:dQw4w9WgXcQ' and blocker.key == 'https://x/0'
+    assert pending == 3
+
+def test_finished_job_is_forgotten_for_dedupe(run):
+    async def scenario(dl):
+        job = await dl.add(**item('https://x/0'))
+        FakeTask.started[0].finish()
+        assert await job.wait() == DONE
+        again = await dl.add(**item('https://x/0?utm_source=feed'))
+        return job, again
+    job, again = run(scenario)
+    assert again is not job and len(FakeTask.started) == 2
+
+def test_concurrent_extractions_share_one_pool_request(run):
+    pool = FakePool()
+    async def scenario(dl):
+        seen = {'first': [], 'late': []}
+        first = asyncio.ensure_future(dl.extract('https://x/v?si=a', progress=seen['first'].append,
+                                                 entries=seen['first'].append))
+        await wait_for(lambda: pool.submitted)
+        url, progress, entries, future = pool.submitted[0]
+        progress(40)
+        entries([{'url': 'https://x/1'}])
+        await asyncio.sleep(0.01)
+        late = asyncio.ensure_future(dl.extract('https://x/v', progress=seen['late'].append, entries=seen['late'].append))
+        await asyncio.sleep(0.01)
+        # Çağıranlardan biri vazgeçse de ortak çıkarım sürer
+        first.cancel()
+        future.set_result({'key': 'Generic:v', 'payload': {'title': 'v'}, 'expires': None})
+        return await late, seen, first.cancelled()
+    payload, seen, cancelled = run(scenario, extractor_pool=pool)
+    assert payload == {'title': 'v'} and len(pool.submitted) == 1 and cancelled
+    # Geç katılan önceki ilerlemeyi ve liste parçasını da alır
+    assert seen['late'] == [40, [{'url': 'https://x/1'}], 100]
+
+def test_add_many_journals_once_and_leaves_items_untouched(run, monkeypatch):
+    calls = []
+    record_many = run.journal.record_many
+    monkeypatch.setattr(run.journal, 'record_many', lambda items: calls.append(len(items)) or record_many(items))
+    monkeypatch.setattr(run.journal, 'record', lambda *a, **k: pytest.fail('record() called per item'))
+    items = [item(f'https://x/{i % 3}') for i in range(9)]
+    originals = [dict(it) for it in items]
+    async def scenario(dl):
+        jobs = await dl.add_many(items)
+        return [job.journal_id for job in jobs], dl.pending_count()
+    journal_ids, pending = run(scenario)
+    # Listedeki tekrarlar mevcut işe bağlanır; günlüğe yalnızca yeni işler girer
+    assert calls == [3] and len(set(journal_ids)) == 3 and pending == 3
+    assert items == originals
+
+def test_unfinished_jobs_stay_in_the_journal(run):
+    async def scenario(dl):
+        done, paused, cancelled = await dl.add_many([item(f'https://x/{i}') for i in range(3)])
+        dl.pause(paused.job_id)
+        dl.cancel(cancelled.job_id)
+        FakeTask.started[0].finish()
+        assert await done.wait() == DONE
+        unfinished = [(e['url'], e['state']) for e in run.journal.unfinished()]
+        # Günlükten devam eden aynı iş ikinci kez eklenmez
+        resumed = await dl.add(**item('https://x/1', journal_id=paused.journal_id))
+        return unfinished, resumed is paused
+    unfinished, same_job = run(scenario)
+    assert unfinished == [('https://x/1', 'paused')] and same_job
+
+def test_weight_reaches_queued_and_running_jobs(run):
+    async def scenario(dl):
+        running, queued = await dl.add_many([item('https://x/0'), item('https://x/1', weight=2.0)])
+        dl.set_weight(running.job_id, 3.0)
+        assert FakeTask.started[0].weight == 3.0
+        FakeTask.started[0].finish()
+        await wait_for(lambda: queued.state == RUNNING)
+        return FakeTask.started[1].weight
+    assert run(scenario) == 2.0
+
+def test_progress_text():
+    assert format_eta(59.9) == '0:59'
+    assert format_eta(3725) == '1:02:05'
+    assert render_progress(MB, 10 * MB, 'downloading', MB) == (10, '1.0MB / 10.0MB  1.0MB/s  0:09')
+    assert render_progress(MB, 0, 'downloading', None) == (0, '1.0MB')
+    assert render_progress(0, MB, 'processing', None) == (100, 'Processing…')
+
+def test_speed_is_smoothed_and_unchanged_text_is_not_reemitted(run):
+    async def scenario(dl):
+        job = Job(1, 'https://x/0', 'best', 'MP4')
+        job.task = FakeTask(job.url, 'best', 'MP4')
+        job.task.state = (0, 10 * MB, 'downloading')
+        assert dl._sample_job(job, 100.0) and job.text == '0.0B / 10.0MB'
+        job.task.state = (MB, 10 * MB, 'downloading')
+        assert dl._sample_job(job, 101.0) and job.speed == MB
+        job.task.state = (4 * MB, 10 * MB, 'downloading')
+        dl._sample_job(job, 102.0)
+        assert job.speed == MB + SPEED_ALPHA * 2 * MB
+        job.task.state = (4 * MB, 10 * MB, 'downloading')
+        # Hız değişti (0'a doğru), sonra aynı saatte aynı değer: yalnızca ilki yeni metin üretir
+        assert dl._sample_job(job, 103.0)
+        assert not dl._sample_job(job, 103.0)
+    run(scenario)
+
+def test_only_downloads_with_a_file_enter_the_history(run, tmp_path):
+    video = tmp_path / 'v.mp4'
+    video.write_bytes(b'x' * 10)
+    async def scenario(dl):
+        saved = await dl.add(**item('https://x/0', title='fallback'))
+        task = FakeTask.started[0]
+        task.filepath = str(video)
+        task.meta = {'title': 'Video', 'channel': 'ch', 'thumbnail': None, 'url': 'https://x/watch/0'}
+        task.finish()
+        await saved.wait()
+        # Arşivden atlanan indirmenin dosyası yoktur; geçmişe girmez
+        skipped = await dl.add(**item('https://x/1'))
+        await wait_for(lambda: len(FakeTask.started) == 2)
+        FakeTask.started[1].finish(message='Already downloaded')
+        return await skipped.wait()
+    assert run(scenario) == DONE
+    entries = run.history.page(10)
+    assert [(e['url'], e['title'], e['channel'], e['size']) for e in entries] == [('https://x/watch/0', 'Video', 'ch', 10)]
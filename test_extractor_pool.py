@@ -0,0 +1,83 @@
+"""
+VIGGA - Extractor Süreç Havuzu Testleri
+"""
+import os
+import signal
+import socket
+import threading
+import time
+import pytest
+from extractor_pool import ExtractorPool, ENTRY_BATCH_SIZE, _stream_entries, match_urls
+from media_info import reduce_playlist
+
+@pytest.fixture
+def hanging_url():
+    # Bağlantıyı kabul edip hiç yanıt vermeyen sunucu: çıkarım worker'da asılı kalır
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(5)
+    held = []
+    def serve():
+        while True:
+            try:
+                held.append(sock.accept()[0])
+            except OSError:
+                return
+    threading.Thread(target=serve, daemon=True).start()
+    yield f'http://127.0.0.1:{sock.getsockname()[1]}/video'
+    sock.close()
+    for conn in held:
+        conn.close()
+
+def test_match_urls_in_process():
+    assert match_urls(['https://youtu.be/dQw4w9WgXcQ', 'https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=3',
+                       'https://example.com/page']) == ['Youtube:dQw4w9WgXcQ', 'Youtube:dQw4w9WgXcQ', None]
+
+def test_submit_after_shutdown_fails_immediately():
+    pool = ExtractorPool(size=1)
+    pool.shutdown()
+    with pytest.raises(RuntimeError):
+        pool.submit('https://example.com/').result(timeout=1)
+    with pytest.raises(RuntimeError):
+        pool.match(['https://example.com/']).result(timeout=1)
+
+def test_crashed_worker_fails_its_request_and_is_replaced(hanging_url):
+    pool = ExtractorPool(size=1)
+    try:
+        assert pool.match(['https://youtu.be/dQw4w9WgXcQ']).result(timeout=60) == ['Youtube:dQw4w9WgXcQ']
+        stuck = pool.submit(hanging_url)
+        # İstek worker'a verilmiş (başlamış olsun olmasın); worker ölünce hata ile bitmeli
+        queued = pool.match(['https://vimeo.com/123456'])
+        time.sleep(0.5)
+        pid = next(iter(pool._workers))
+        os.kill(pid, signal.SIGKILL)
+        with pytest.raises(RuntimeError, match='worker exited'):
+            stuck.result(timeout=10)
+        assert queued.result(timeout=60) == ['Vimeo:123456']
+        assert pid not in pool._workers and len(pool._workers) == 1
+    finally:
+        pool.shutdown()
+
+class Results(list):
+    def put(self, message):
+        self.append(message)
+
+def test_playlist_entries_stream_in_small_batches():
+    def entries():
+        yield {'id': 'a', 'title': 'A', 'url': 'https://youtu.be/a', 'duration': 10}
+        yield None
+        for i in range(60):
+            yield {'id': str(i), 'url': f'https://youtu.be/{i}'}
+    results = Results()
+    assert _stream_entries(7, {'entries': entries()}, results) == 61
+    sizes = [len(batch) for kind, req_id, batch in results]
+    # İlk eleman hemen gider ki liste görünümü beklemeden açılsın
+    assert sizes[0] == 1 and max(sizes) <= ENTRY_BATCH_SIZE and sum(sizes) == 61
+    first = results[0][2][0]
+    assert first == {'index': 1, 'id': 'a', 'title': 'A', 'url': 'https://youtu.be/a', 'duration': 10}
+    assert results[-1][2][-1]['index'] == 61 and results[-1][2][-1]['title'] == 'https://youtu.be/59'
+
+def test_playlist_payload_offers_generic_qualities():
+    payload = reduce_playlist({'title': 'Mix', 'uploader': 'me'}, 3)
+    assert payload['playlist'] and payload['entry_count'] == 3 and payload['channel'] == 'me'
+    assert [opt for opt in payload['quality_options'] if 'Audio Only' in opt[0]]
@@ -0,0 +1,109 @@
+"""
+VIGGA - Bilgi Çekme Zamanlayıcısı Testleri
+VideoInfoFetcher sahte bir QObject ile değiştirilir; debounce ve generation elemesi sınanır.
+"""
+import pytest
+from PyQt5.QtCore import QObject, pyqtSignal
+import fetch_scheduler
+from fetch_scheduler import FetchScheduler
+from conftest import wait_until
+
+class FakeFetcher(QObject):
+    info_ready = pyqtSignal(dict)
+    entries_found = pyqtSignal(list)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+    created = []
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        FakeFetcher.created.append(self)
+    def start(self):
+        pass
+    def complete(self, info):
+        self.info_ready.emit(info)
+        self.finished.emit()
+
+class FakeProbe(QObject):
+    sizes_ready = pyqtSignal(dict)
+    finished = pyqtSignal()
+    created = []
+    def __init__(self, url, info, parent=None):
+        super().__init__(parent)
+        self.url = url
+        FakeProbe.created.append(self)
+    def start(self):
+        pass
+
+@pytest.fixture
+def scheduler(qapp, monkeypatch):
+    FakeFetcher.created = []
+    FakeProbe.created = []
+    monkeypatch.setattr(fetch_scheduler, 'VideoInfoFetcher', FakeFetcher)
+    monkeypatch.setattr(fetch_scheduler, 'SizeProbe', FakeProbe)
+    scheduler = FetchScheduler(debounce_ms=20)
+    scheduler.results = []
+    scheduler.info_ready.connect(scheduler.results.append)
+    return scheduler
+
+def test_typing_burst_fetches_only_the_last_url(qapp, scheduler):
+    for url in ('https://youtu.be/a', 'https://youtu.be/ab', 'https://youtu.be/abc'):
+        scheduler.request(url)
+    wait_until(qapp, lambda: FakeFetcher.created)
+    assert [f.url for f in FakeFetcher.created] == ['https://youtu.be/abc']
+    FakeFetcher.created[0].complete({'title': 'abc'})
+    assert scheduler.results == [{'title': 'abc'}] and not scheduler.is_busy()
+
+def test_superseded_result_is_dropped(qapp, scheduler):
+    scheduler.request('https://youtu.be/old')
+    wait_until(qapp, lambda: len(FakeFetcher.created) == 1)
+    scheduler.request('https://youtu.be/new')
+    wait_until(qapp, lambda: len(FakeFetcher.created) == 2)
+    old, new = FakeFetcher.created
+    new.complete({'title': 'new'})
+    old.complete({'title': 'old'})
+    assert scheduler.results == [{'title': 'new'}]
+
+def test_same_url_reuses_the_in_flight_fetch(qapp, scheduler):
+    scheduler.request('https://youtu.be/abc')
+    wait_until(qapp, lambda: FakeFetcher.created)
+    scheduler.request('https://youtu.be/abc')
+    wait_until(qapp, lambda: not scheduler._timer.isActive())
+    assert len(FakeFetcher.created) == 1
+    FakeFetcher.created[0].complete({'title': 'abc'})
+    assert scheduler.results == [{'title': 'abc'}]
+
+def test_cancel_stops_debounce_and_in_flight_results(qapp, scheduler):
+    scheduler.request('https://youtu.be/abc')
+    wait_until(qapp, lambda: FakeFetcher.created)
+    scheduler.request('https://youtu.be/other')
+    scheduler.cancel()
+    qapp.processEvents()
+    assert not scheduler.is_busy()
+    FakeFetcher.created[0].complete({'title': 'abc'})
+    assert len(FakeFetcher.created) == 1 and scheduler.results == []
+
+def test_entry_batches_follow_the_current_generation(qapp, scheduler):
+    batches = []
+    scheduler.entries_found.connect(batches.append)
+    scheduler.request('https://youtube.com/playlist?list=PL1')
+    wait_until(qapp, lambda: FakeFetcher.created)
+    FakeFetcher.created[0].entries_found.emit([{'index': 1}])
+    scheduler.cancel()
+    FakeFetcher.created[0].entries_found.emit([{'index': 2}])
+    assert batches == [[{'index': 1}]]
+
+def test_probed_sizes_follow_the_current_generation(qapp, scheduler):
+    sizes = []
+    scheduler.sizes_ready.connect(sizes.append)
+    scheduler.request('https://x/a')
+    wait_until(qapp, lambda: FakeFetcher.created)
+    FakeFetcher.created[0].complete({'title': 'a'})
+    FakeProbe.created[0].sizes_ready.emit({'title': 'a', 'exact': True})
+    scheduler.request('https://x/list')
+    wait_until(qapp, lambda: len(FakeFetcher.created) == 2)
+    # Playlist önizlemesi yoklanmaz
+    FakeFetcher.created[1].complete({'title': 'list', 'playlist': True})
+    assert [p.url for p in FakeProbe.created] == ['https://x/a']
+    FakeProbe.created[0].sizes_ready.emit({'title': 'a', 'late': True})
+    assert sizes == [{'title': 'a', 'exact': True}]
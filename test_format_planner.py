@@ -0,0 +1,92 @@
+"""
+VIGGA - Format Planlayıcı Testleri
+"""
+import format_planner
+from format_planner import (FormatIndex, NATIVE, REMUX, TRANSCODE, POLICY_MAX_SIZE, POLICY_MAX_TIME, POLICY_SMALLEST,
+                            codec_family, container_action, VIDEO_CODECS, observe_bandwidth, plan, quality_ladder)
+
+MB = 1024 * 1024
+
+INFO = {
+    'duration': 100,
+    'formats': [
+        {'format_id': 'sb0', 'protocol': 'mhtml', 'vcodec': 'none', 'acodec': 'none'},
+        {'format_id': '18', 'ext': 'mp4', 'vcodec': 'avc1.42001E', 'acodec': 'mp4a.40.2', 'height': 360, 'fps': 30,
+         'filesize': 5 * MB},
+        {'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'abr': 128, 'filesize': 2 * MB},
+        {'format_id': '251', 'ext': 'webm', 'vcodec': 'none', 'acodec': 'opus', 'abr': 160, 'filesize': 3 * MB},
+        {'format_id': '137', 'ext': 'mp4', 'vcodec': 'avc1.640028', 'acodec': 'none', 'height': 1080, 'fps': 30,
+         'filesize': 40 * MB},
+        {'format_id': '248', 'ext': 'webm', 'vcodec': 'vp9', 'acodec': 'none', 'height': 1080, 'fps': 30,
+         'filesize_approx': 30 * MB},
+        {'format_id': '136', 'ext': 'mp4', 'vcodec': 'avc1.4d401f', 'acodec': 'none', 'height': 720, 'fps': 30,
+         'tbr': 800},
+    ],
+}
+
+def by_id(selections):
+    return {s['format_id']: s for s in selections}
+
+def test_codec_family():
+    assert codec_family('avc1.640028', VIDEO_CODECS) == 'H.264'
+    assert codec_family('none', VIDEO_CODECS) is None
+    assert codec_family('xyz.1', VIDEO_CODECS) == 'XYZ'
+
+def test_index_splits_streams_and_skips_storyboards():
+    index = FormatIndex(INFO)
+    assert [f['format_id'] for f in index.combined] == ['18']
+    assert {f['format_id'] for f in index.video_only} == {'137', '248', '136'}
+    assert {f['format_id'] for f in index.audio_only} == {'140', '251'}
+    # tbr tahmini: 800 kbit/s * 100 s
+    assert next(f for f in index.video_only if f['format_id'] == '136')['size'] == 800 * 1000 // 8 * 100
+
+def test_selections_pair_audio_by_container():
+    sels = by_id(FormatIndex(INFO).selections())
+    assert '137+140' in sels and '248+251' in sels
+    assert sels['137+140']['size'] == 42 * MB
+    assert sels['18']['audio_id'] is None
+    # Hedef container ses seçimini belirler
+    webm = by_id(FormatIndex(INFO).selections('webm'))
+    assert '137+251' in webm and webm['137+251']['fit'] == TRANSCODE
+    assert webm['248+251']['fit'] == REMUX
+
+def test_container_fit():
+    mp4 = by_id(FormatIndex(INFO).selections('mp4'))
+    assert mp4['18']['fit'] == NATIVE
+    assert mp4['137+140']['fit'] == REMUX
+    assert mp4['248+140']['fit'] == TRANSCODE
+    assert by_id(FormatIndex(INFO).selections('mkv'))['248+251']['fit'] == REMUX
+
+def test_container_action_for_the_downloaded_file():
+    assert container_action({'ext': 'mp4', 'vcodec': 'avc1.640028', 'acodec': 'mp4a.40.2'}, 'mp4') is None
+    assert container_action({'ext': 'mkv', 'vcodec': 'avc1.640028', 'acodec': 'mp4a.40.2'}, 'mp4') == REMUX
+    assert container_action({'ext': 'mkv', 'vcodec': 'vp9', 'acodec': 'opus'}, 'mp4') == TRANSCODE
+    # Ses dosyası ve hedefsiz seçim dönüştürülmez
+    assert container_action({'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.2'}, 'mp4') is None
+    assert container_action({'ext': 'mkv', 'vcodec': 'vp9'}, None) is None
+
+def test_best_prefers_stream_copy_then_fewer_bytes():
+    mp4 = FormatIndex(INFO).selections('mp4')
+    assert plan(mp4)['format_id'] == '137+140'
+    assert plan(FormatIndex(INFO).selections())['format_id'] == '248+251'
+
+def test_size_time_and_smallest_policies():
+    sels = FormatIndex(INFO).selections()
+    assert plan(sels, POLICY_MAX_SIZE, max_bytes=20 * MB)['height'] == 720
+    assert plan(sels, POLICY_MAX_SIZE, max_bytes=MB) is None
+    assert plan(sels, POLICY_MAX_TIME, max_seconds=10, bandwidth_bps=MB)['format_id'] == '18'
+    assert plan(sels, POLICY_MAX_TIME, max_seconds=10)['height'] == 1080
+    assert plan(sels, POLICY_SMALLEST, height=1080)['format_id'] == '248+251'
+
+def test_quality_ladder_one_per_height():
+    ladder = quality_ladder(FormatIndex(INFO).selections('mp4'))
+    assert [s['height'] for s in ladder] == [1080, 720, 360]
+    assert ladder[0]['format_id'] == '137+140'
+
+def test_measured_bandwidth_is_smoothed(monkeypatch):
+    monkeypatch.setattr(format_planner, '_bandwidth_bps', None)
+    observe_bandwidth(0)
+    assert format_planner.measured_bandwidth() is None
+    observe_bandwidth(1000)
+    observe_bandwidth(2000)
+    assert format_planner.measured_bandwidth() == 1000 + format_planner.BANDWIDTH_ALPHA * 1000
@@ -0,0 +1,35 @@
+"""
+VIGGA - Görüntü Çözücü Testleri
+"""
+from PyQt5.QtCore import QBuffer, QIODevice
+from PyQt5.QtGui import QColor, QImage
+from image_decoder import ImageDecoder, decode_scaled
+from conftest import wait_until
+
+def encoded(width, height, fmt='PNG'):
+    # Sol yarı kırmızı, sağ yarı mavi: kırpmanın ortadan yapıldığı renklerden anlaşılır
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor('red'))
+    for x in range(width // 2, width):
+        for y in range(height):
+            image.setPixelColor(x, y, QColor('blue'))
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, fmt)
+    return bytes(buffer.data())
+
+def test_decodes_directly_to_target_size_and_crops_centre(qapp):
+    image = decode_scaled(encoded(1280, 720), 200, 200)
+    assert (image.width(), image.height()) == (200, 200)
+    assert image.pixelColor(5, 100) == QColor('red') and image.pixelColor(195, 100) == QColor('blue')
+
+def test_invalid_data_gives_null_image(qapp):
+    assert decode_scaled(b'not an image', 100, 100).isNull()
+
+def test_decoder_emits_off_the_gui_thread(qapp):
+    decoder = ImageDecoder(threads=1)
+    results = []
+    decoder.decoded.connect(lambda key, w, h, image: results.append((key, w, h, image.size().width())))
+    decoder.submit('https://x/a.png', encoded(640, 360), 320, 180)
+    wait_until(qapp, lambda: results)
+    assert results == [('https://x/a.png', 320, 180, 320)]
@@ -0,0 +1,77 @@
+"""
+VIGGA - Çıkarım Deposu Testleri
+"""
+import json
+import time
+import pytest
+import yt_dlp
+from info_store import InfoStore
+from download_core import DownloadTask
+from media_server import MediaServer, progressive_path
+
+def test_expired_entries_are_not_stored_or_returned():
+    store = InfoStore(max_entries=5, max_bytes=1000)
+    store.put('old', '{}', time.time() - 1)
+    assert store.get('old') is None
+    store.put('soon', '{"a": 1}', time.time() + 0.05)
+    time.sleep(0.1)
+    assert store.get('soon') is None
+    assert store._total == 0
+
+def test_lru_evicts_least_recently_used():
+    store = InfoStore(max_entries=2, max_bytes=1000)
+    expires = time.time() + 60
+    store.put('a', 'aa', expires)
+    store.put('b', 'bb', expires)
+    assert store.get('a') == 'aa'
+    store.put('c', 'cc', expires)
+    assert store.get('b') is None
+    assert store.get('a') == 'aa' and store.get('c') == 'cc'
+
+def test_byte_limit_and_replacement():
+    store = InfoStore(max_entries=10, max_bytes=10)
+    expires = time.time() + 60
+    store.put('a', 'x' * 6, expires)
+    store.put('a', 'x' * 4, expires)
+    assert store._total == 4
+    store.put('b', 'y' * 6, expires)
+    store.put('c', 'z' * 3, expires)
+    assert store.get('a') is None
+    assert store._total == 9
+
+def test_discard():
+    store = InfoStore(max_entries=2, max_bytes=100)
+    store.put('a', 'aa', time.time() + 60)
+    store.discard('a')
+    store.discard('missing')
+    assert store.get('a') is None and store._total == 0
+
+@pytest.fixture
+def server():
+    server = MediaServer().start()
+    yield server
+    server.stop()
+
+def extract(url):
+    with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
+        return ydl.sanitize_info(ydl.extract_info(url, download=False))
+
+def test_download_starts_from_stored_info(server, tmp_path):
+    url = server.base_url + progressive_path(64 * 1024)
+    info = extract(url)
+    server.reset_stats()
+    task = DownloadTask(url, 'best', 'MP4', outtmpl=str(tmp_path / '%(id)s.%(ext)s'), archive=False,
+                        info_json=json.dumps(info))
+    assert task.run() == (True, "Download complete") and not task.info_rejected
+    # Yeniden çıkarım yok: yalnızca medya aktarımı
+    assert server.stats()['requests'] <= 2
+
+def test_expired_stored_urls_fall_back_to_extraction(server, tmp_path):
+    url = server.base_url + progressive_path(64 * 1024)
+    info = extract(url)
+    for fmt in info.get('formats') or [info]:
+        fmt['url'] = server.base_url + '/expired/' + fmt['url'].rsplit('/', 1)[-1]
+    info.pop('url', None)
+    task = DownloadTask(url, 'best', 'MP4', outtmpl=str(tmp_path / '%(id)s.%(ext)s'), archive=False,
+                        info_json=json.dumps(info))
+    assert task.run() == (True, "Download complete") and task.info_rejected
@@ -0,0 +1,62 @@
+"""
+VIGGA - Medya Bilgisi Testleri
+"""
+from media_info import reduce_info, probe_targets, apply_probed_sizes
+
+MB = 1024 * 1024
+
+INFO = {
+    'title': 'Video',
+    'duration': 100,
+    'formats': [
+        {'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'abr': 128, 'filesize': 2 * MB,
+         'protocol': 'https', 'url': 'https://cdn/140'},
+        {'format_id': '137', 'ext': 'mp4', 'vcodec': 'avc1.640028', 'acodec': 'none', 'height': 1080, 'fps': 30,
+         'filesize_approx': 40 * MB, 'protocol': 'https', 'url': 'https://cdn/137', 'http_headers': {'A': 'b'}},
+        {'format_id': '136', 'ext': 'mp4', 'vcodec': 'avc1.4d401f', 'acodec': 'none', 'height': 720, 'fps': 30,
+         'tbr': 800, 'protocol': 'm3u8_native', 'url': 'https://cdn/136.m3u8'},
+    ],
+}
+
+def test_probe_targets_only_inexact_http_streams():
+    assert probe_targets(reduce_info(INFO)) == {'137': ('https://cdn/137', {'A': 'b'})}
+
+def test_apply_probed_sizes_relabels_without_reordering():
+    payload = reduce_info(INFO)
+    before = [fid for _, fid in payload['quality_options']]
+    assert '~42MB' in payload['quality_options'][0][0]
+    updated = apply_probed_sizes(payload, {'137': 50 * MB})
+    assert [fid for _, fid in updated['quality_options']] == before
+    assert updated['quality_options'][0][0] == '1080p 30fps H.264 52MB'
+    assert updated['streams']['137'] == {'size': 50 * MB, 'exact': True, 'url': None, 'headers': None}
+    sel = next(s for s in updated['selections'] if s['format_id'] == '137+140')
+    assert sel['size'] == 52 * MB and sel['exact']
+    mp4 = updated['containers']['MP4']
+    assert mp4['quality_options'][0][0].startswith('1080p 30fps H.264 52MB')
+    assert probe_targets(updated) == {}
+
+def test_apply_probed_sizes_does_not_mutate_payload():
+    payload = reduce_info(INFO)
+    label = payload['quality_options'][0][0]
+    apply_probed_sizes(payload, {'137': 50 * MB})
+    assert payload['quality_options'][0][0] == label
+    assert payload['streams']['137']['exact'] is False
+    assert payload['containers']['MP4']['quality_options'][0][0] == label
+
+def test_quality_options_are_merged_selections():
+    payload = reduce_info(INFO)
+    assert payload['quality_options'] == [('1080p 30fps H.264 ~42MB', '137+140'), ('720p 30fps H.264 ~11MB', '136+140'),
+                                          ('Audio Only (Best)', 'bestaudio')]
+    assert [s['format_id'] for s in payload['selections']] == ['137+140', '136+140']
+
+def test_formats_without_height_fall_back_to_best():
+    payload = reduce_info({'title': 'Pin', 'formats': [{'format_id': 'V1', 'vcodec': 'h264', 'acodec': 'aac'}]})
+    assert payload['quality_options'] == [('Best Video / Audio', 'V1'), ('Audio Only (Best)', 'bestaudio')]
+
+def test_each_container_gets_its_own_plan():
+    vp9 = {'format_id': '248', 'ext': 'webm', 'vcodec': 'vp9', 'acodec': 'none', 'height': 1080, 'fps': 30, 'filesize': 30 * MB}
+    containers = reduce_info(dict(INFO, formats=INFO['formats'] + [vp9]))['containers']
+    # MP4 aynı çözünürlükte stream copy ile alınabilen H.264'ü, MKV daha küçük VP9'u seçer
+    assert containers['MP4']['quality_options'][0] == ('1080p 30fps H.264 ~42MB', '137+140')
+    assert containers['MKV']['quality_options'][0] == ('1080p 30fps VP9 32MB', '248+140')
+    assert all(label.endswith('· re-encode') for label, _ in containers['WEBM']['quality_options'])
@@ -0,0 +1,79 @@
+"""
+VIGGA - Metadata Önbelleği Testleri
+"""
+import os
+import time
+import pytest
+import metadata_cache
+from metadata_cache import MetadataCache, canonical_url, expiry_for_info, extractor_key_for_info
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = MetadataCache(path=str(tmp_path / 'metadata.json'), max_entries=3, max_bytes=1 << 20, default_ttl=3600)
+    monkeypatch.setattr(metadata_cache, '_cache', cache)
+    return cache
+
+def test_key_from_info():
+    assert extractor_key_for_info({'extractor_key': 'Youtube', 'id': 'dQw4w9WgXcQ'}) == 'Youtube:dQw4w9WgXcQ'
+    assert extractor_key_for_info({'extractor_key': 'Youtube'}) is None
+
+def test_expiry_follows_signed_format_urls():
+    now = time.time()
+    info = {'formats': [{'url': f'https://cdn/x?expire={int(now + 1000)}'},
+                        {'manifest_url': f'https://cdn/api/manifest/expire/{int(now + 2000)}/sig/1'}]}
+    assert abs(expiry_for_info(info, 3600) - (now + 1000 - metadata_cache.EXPIRY_MARGIN)) < 2
+    assert abs(expiry_for_info({'formats': []}, 3600) - (now + 3600)) < 2
+
+def test_canonical_url_strips_tracking_and_normalises():
+    assert canonical_url('  YouTube.com:443/watch?v=abc&utm_source=x&si=1#t=5 ') == 'https://youtube.com/watch?v=abc'
+    assert canonical_url('HTTP://Example.com:80') == 'http://example.com/'
+    assert canonical_url('https://x.com/a?b=2&a=1') == canonical_url('https://x.com/a?a=1&b=2&fbclid=z')
+
+def test_canonical_url_keeps_media_params():
+    assert canonical_url('https://x.com/watch?v=abc&list=PL1') == 'https://x.com/watch?list=PL1&v=abc'
+
+def test_media_key_uses_alias_after_put(cache):
+    assert cache.media_key('https://youtube.com/watch?v=abc') is None
+    cache.put('Youtube:abc', {'title': 't'}, url='https://youtube.com/watch?v=abc')
+    assert cache.media_key('youtube.com/watch?v=abc&utm_medium=x') == 'Youtube:abc'
+
+def test_aliases_survive_reload_and_drop_with_entry(cache):
+    cache.put('Youtube:abc', {'title': 't'}, url='https://youtube.com/watch?v=abc')
+    reloaded = MetadataCache(path=cache.path, max_entries=3, max_bytes=1 << 20, default_ttl=3600)
+    assert reloaded.media_key('https://youtube.com/watch?v=abc') == 'Youtube:abc'
+    for i in range(3):
+        cache.put(f'Other:{i}', {'title': i})
+    assert cache.media_key('https://youtube.com/watch?v=abc') is None
+
+def test_least_recently_used_entry_is_evicted(cache):
+    for i in range(3):
+        cache.put(f'Youtube:{i}', {'title': i})
+    assert cache.get('Youtube:0')['title'] == 0
+    cache.put('Youtube:3', {'title': 3})
+    assert cache.get('Youtube:1') is None
+    assert cache.get('Youtube:0') is not None and cache.get('Youtube:3') is not None
+
+def test_expired_entry_is_dropped(cache):
+    cache.put('Youtube:old', {'title': 'old'}, expires=time.time() + 0.05)
+    time.sleep(0.1)
+    assert cache.get('Youtube:old') is None
+
+def test_reads_defer_the_file_write(cache, monkeypatch):
+    monkeypatch.setattr(metadata_cache, 'RECENCY_SAVE_DELAY', 60)
+    cache.put('Youtube:a', {'title': 'a', 'quality_options': [['720p', '22']]})
+    mtime = os.stat(cache.path).st_mtime_ns
+    time.sleep(0.02)
+    assert cache.get('Youtube:a')['quality_options'] == [('720p', '22')]
+    assert os.stat(cache.path).st_mtime_ns == mtime
+    metadata_cache.flush_metadata_cache()
+    assert os.stat(cache.path).st_mtime_ns != mtime
+    reloaded = MetadataCache(path=cache.path, max_entries=3, max_bytes=1 << 20, default_ttl=3600)
+    assert reloaded.get('Youtube:a')['title'] == 'a'
+
+def test_update_keeps_expiry_and_aliases(cache):
+    expires = time.time() + 100
+    cache.put('Youtube:abc', {'title': 'a'}, expires=expires, url='https://youtube.com/watch?v=abc')
+    cache.update_for_url('https://youtube.com/watch?v=abc', {'title': 'b'})
+    assert cache.get('Youtube:abc')['title'] == 'b'
+    assert cache._entries['Youtube:abc']['expires'] == expires
+    assert cache.media_key('https://youtube.com/watch?v=abc') == 'Youtube:abc'
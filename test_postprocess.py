@@ -0,0 +1,62 @@
+"""
+VIGGA - Son İşlem Havuzu Testleri
+ffmpeg gerektirmeyen yollar ve ffmpeg yokken hata yolu sınanır.
+"""
+import asyncio
+import shutil
+import pytest
+import metadata_cache
+import postprocess
+from engine import DownloadEngine, PROCESSING, FAILED, DONE
+from media_server import MediaServer, progressive_path
+from metadata_cache import MetadataCache
+from postprocess import PendingPostprocess, PostprocessPool
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = PostprocessPool(size=1)
+    yield pool
+    pool.shutdown()
+
+def pending(tmp_path, pp_names=(), postprocessors=()):
+    video = tmp_path / 'clip.m4a'
+    video.write_bytes(b'x' * 1024)
+    info = {'id': 'clip', 'title': 'clip', 'ext': 'm4a', 'filepath': str(video)}
+    opts = {'quiet': True, 'outtmpl': str(tmp_path / '%(title)s.%(ext)s'), 'postprocessors': list(postprocessors)}
+    return PendingPostprocess(opts, str(video), info, {}, list(pp_names))
+
+def test_item_without_postprocessors_returns_its_file(pool, tmp_path):
+    item = pending(tmp_path)
+    assert pool.submit(item).result(60) == item.filename
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is not None, reason='ffmpeg is installed')
+def test_worker_error_comes_back_as_a_plain_message(pool, tmp_path):
+    with pytest.raises(RuntimeError) as excinfo:
+        pool.submit(pending(tmp_path, postprocessors=[{'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3'}])).result(60)
+    assert 'ffmpeg' in str(excinfo.value).lower() and 'Traceback' not in str(excinfo.value)
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is not None, reason='ffmpeg is installed')
+def test_engine_frees_the_slot_before_conversion_fails(tmp_path, monkeypatch, pool):
+    monkeypatch.setattr(metadata_cache, '_cache', MetadataCache(path=str(tmp_path / 'metadata.json')))
+    monkeypatch.setattr(postprocess, '_pool', pool)
+    server = MediaServer().start()
+    async def main():
+        engine = DownloadEngine(max_parallel=1, journal=False, history=False, extractor_pool=False)
+        states = []
+        engine.subscribe(lambda event, job: job and event == 'changed' and states.append((job.job_id, job.state)))
+        outtmpl = str(tmp_path / '%(id)s.%(ext)s')
+        mp3, mp4 = await engine.add_many([
+            dict(url=server.base_url + progressive_path(64 * 1024), format_id='bestaudio', selected_format='Audio Only (MP3)',
+                 outtmpl=outtmpl, archive=False),
+            dict(url=server.base_url + progressive_path(64 * 1024 + 1), format_id='best', selected_format='MP4',
+                 outtmpl=outtmpl, archive=False)])
+        results = await mp3.wait(), await mp4.wait()
+        await engine.shutdown()
+        return states, results, mp3
+    try:
+        states, results, mp3 = asyncio.run(main())
+    finally:
+        server.stop()
+    assert results == (FAILED, DONE) and 'ffmpeg' in mp3.message.lower()
+    # MP3 dönüştürmeye geçtiğinde ikinci indirme başlar
+    assert states.index((mp3.job_id, PROCESSING)) < states.index((mp3.job_id + 1, 'running'))
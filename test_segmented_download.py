@@ -0,0 +1,94 @@
+"""
+VIGGA - Segmentli İndirme Testleri
+Range destekli yerel bir HTTP sunucusundan indirilir; parça sayısı, host bağlantı sınırı ve içerik doğrulanır.
+"""
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import segmented_download
+import settings
+from segmented_download import install_segmented_downloaders, segmented_opts
+
+MB = 1024 * 1024
+BODY = os.urandom(6 * MB)
+
+class RangeHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        # Yalnızca parça istekleri sayılır; extractor'ın ilk isteği ve boyut yoklaması host sınırı dışında
+        fragment = self.headers.get('Range') not in (None, 'bytes=0-0')
+        with server.lock:
+            server.active += fragment
+            server.peak = max(server.peak, server.active)
+            server.ranges.append(self.headers.get('Range'))
+        try:
+            start, end = 0, len(BODY) - 1
+            match = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range') or '')
+            if match:
+                start = int(match.group(1))
+                end = min(int(match.group(2) or end), end)
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{len(BODY)}')
+            else:
+                self.send_response(200)
+            self.send_header('Content-Type', 'video/mp4')
+            self.send_header('Content-Length', str(end - start + 1))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.end_headers()
+            # Eşzamanlılık ölçülebilsin diye her yanıt biraz sürer
+            time.sleep(0.05)
+            self.wfile.write(BODY[start:end + 1])
+        finally:
+            with server.lock:
+                server.active -= fragment
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # Extractor ilk yanıtın yalnızca başını okuyup bağlantıyı kapatır
+            pass
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    server.lock = threading.Lock()
+    server.active = server.peak = 0
+    server.ranges = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def download(url, tmp_path):
+    import yt_dlp
+    install_segmented_downloaders()
+    opts = {'quiet': True, 'no_warnings': True, 'outtmpl': str(tmp_path / 'out.%(ext)s')}
+    opts.update(segmented_opts())
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        ydl.download([url])
+    return (tmp_path / 'out.mp4').read_bytes()
+
+def test_large_file_is_split_into_ranges_under_the_host_cap(server, tmp_path, monkeypatch):
+    monkeypatch.setitem(settings.SETTINGS, 'segmented_connections', 4)
+    monkeypatch.setitem(settings.SETTINGS, 'segment_size_mb', 1)
+    monkeypatch.setitem(settings.SETTINGS, 'max_connections_per_host', 2)
+    # Host semaforu ilk kullanımda sınırla oluşur; önceki testlerin semaforu kullanılmasın
+    monkeypatch.setattr(segmented_download, '_host_slots', {})
+    data = download(f'http://127.0.0.1:{server.server_port}/video.mp4', tmp_path)
+    assert data == BODY
+    ranges = [r for r in server.ranges if r and r != 'bytes=0-0']
+    # 6 MB, bölüm en az 1 MB: 4 bağlantı * 4 = 16 yerine 6 parça
+    assert len(ranges) == 6
+    assert server.peak == 2
+    assert not list(tmp_path.glob('*.part*')) and not list(tmp_path.glob('*.ytdl'))
+
+def test_single_connection_keeps_the_plain_download(server, tmp_path, monkeypatch):
+    monkeypatch.setitem(settings.SETTINGS, 'segmented_connections', 1)
+    data = download(f'http://127.0.0.1:{server.server_port}/video.mp4', tmp_path)
+    assert data == BODY
+    assert 'bytes=0-0' not in server.ranges
@@ -0,0 +1,49 @@
+"""
+VIGGA - Boyut Yoklayıcı Testleri
+"""
+import socket
+import threading
+import pytest
+from media_server import MediaServer, progressive_path
+from size_prober import probe_size, probe_sizes
+
+@pytest.fixture
+def server():
+    server = MediaServer(latency_ms=0, bandwidth_kbps=0).start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def broken_url():
+    # Başlığı http.client sınırını aşan yanıt: HTTPException fırlatır
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(5)
+    def serve():
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return
+            conn.recv(4096)
+            conn.sendall(b'HTTP/1.1 200 OK\r\nX-Bad: ' + b'a' * 70000 + b'\r\n\r\n')
+            conn.close()
+    threading.Thread(target=serve, daemon=True).start()
+    yield f'http://127.0.0.1:{sock.getsockname()[1]}/x'
+    sock.close()
+
+def test_probe_size(server):
+    assert probe_size(server.base_url + progressive_path(12345)) == 12345
+
+def test_broken_server_does_not_drop_other_results(server, broken_url):
+    assert probe_size(broken_url) is None
+    sizes = probe_sizes({'bad': (broken_url, {}), 'good': (server.base_url + progressive_path(4321), {})})
+    assert sizes == {'good': 4321}
+
+def test_unreachable_host_is_skipped():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    assert probe_sizes({'gone': (f'http://127.0.0.1:{port}/x', {})}) == {}
+    assert probe_sizes({}) == {}
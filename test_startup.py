@@ -0,0 +1,35 @@
+"""
+VIGGA - Açılış Zamanlaması Testleri
+"""
+import json
+import os
+import subprocess
+import sys
+import startup
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def test_building_the_window_does_not_load_yt_dlp_or_qtnetwork():
+    # Ayrı süreç: test oturumunda bu modüller zaten yüklü olabilir
+    code = ("import sys\n"
+            "from PyQt5.QtWidgets import QApplication\n"
+            "app = QApplication([])\n"
+            "import main\n"
+            "window = main.ViggaApp()\n"
+            "print(sorted(m for m in ('yt_dlp', 'PyQt5.QtNetwork') if m in sys.modules))\n")
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == '[]'
+
+def test_report_lists_marks_and_keeps_a_bounded_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(startup, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(startup, 'STARTUP_LOG_PATH', str(tmp_path / 'startup.jsonl'))
+    monkeypatch.setattr(startup, 'STARTUP_LOG_KEEP', 3)
+    startup.mark('test mark')
+    data = startup.report()
+    assert data['marks'][-1]['label'] == 'test mark' and data['marks'][-1]['ms'] >= 0
+    for _ in range(5):
+        startup._append_log(data)
+    lines = (tmp_path / 'startup.jsonl').read_text().splitlines()
+    assert len(lines) == 3 and json.loads(lines[-1])['marks'] == data['marks']
@@ -0,0 +1,42 @@
+"""
+VIGGA - Stil ve Tema Testleri
+"""
+import re
+import styles
+from styles import THEMES, apply_theme, current_theme, palette, set_variant, stylesheet
+
+def test_every_theme_defines_the_same_colours():
+    names = [set(colors) for colors in THEMES.values()]
+    assert all(keys == names[0] for keys in names)
+
+def test_stylesheet_is_built_once_per_theme():
+    assert stylesheet('dark') is stylesheet('dark')
+    assert stylesheet('light') != stylesheet('dark')
+    # Şablonda doldurulmamış yer tutucu kalmaz
+    assert not re.search(r'\{[a-z_]+\}', stylesheet('light'))
+    assert THEMES['light']['background'] in stylesheet('light')
+
+def test_apply_theme_sets_one_app_stylesheet(qapp):
+    from ui_components import ProgressWidget
+    try:
+        widget = ProgressWidget()
+        apply_theme(qapp, 'light')
+        assert current_theme() == 'light' and palette() is THEMES['light']
+        assert qapp.styleSheet() == stylesheet('light') and widget.styleSheet() == ''
+        # Bilinmeyen tema varsayılana düşer
+        apply_theme(qapp, 'neon')
+        assert current_theme() == styles.DEFAULT_THEME
+    finally:
+        apply_theme(qapp, styles.DEFAULT_THEME)
+
+def test_queue_row_state_is_a_repolished_property(qapp):
+    from ui_components import QueueRow
+    apply_theme(qapp, styles.DEFAULT_THEME)
+    row = QueueRow(1, 'video')
+    bar = row.progress.progress_bar
+    for state in ('running', 'paused', 'failed', 'done'):
+        row.set_state(state)
+        assert bar.property('state') == state
+    assert row.status_label.text() == 'Complete' and not row.toggle_btn.isVisibleTo(row)
+    set_variant(row.title_label, 'role', 'heading')
+    assert row.title_label.property('role') == 'heading'
@@ -0,0 +1,32 @@
+"""
+VIGGA - Thumbnail Önbelleği Testleri
+"""
+import os
+from thumbnail_cache import ThumbnailCache
+
+def test_disk_entry_round_trips_with_validators(tmp_path):
+    cache = ThumbnailCache(directory=str(tmp_path), max_bytes=1 << 20)
+    assert cache.load('https://i.ytimg.com/a.jpg') == (None, None)
+    cache.save('https://i.ytimg.com/a.jpg', b'jpeg', etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    data, meta = cache.load('https://i.ytimg.com/a.jpg')
+    assert data == b'jpeg' and meta['etag'] == '"v1"' and meta['url'] == 'https://i.ytimg.com/a.jpg'
+
+def test_disk_tier_evicts_least_recently_touched(tmp_path):
+    cache = ThumbnailCache(directory=str(tmp_path), max_bytes=2500)
+    for i, url in enumerate(('https://x/a', 'https://x/b')):
+        cache.save(url, b'x' * 1000)
+        os.utime(cache._path(url), (1000 + i, 1000 + i))
+    cache.touch('https://x/a')
+    cache.save('https://x/c', b'x' * 1000)
+    assert cache.load('https://x/b') == (None, None)
+    assert cache.load('https://x/a')[0] and cache.load('https://x/c')[0]
+    assert not os.path.exists(cache._path('https://x/b') + '.json')
+
+def test_memory_tier_is_keyed_by_target_size(tmp_path):
+    cache = ThumbnailCache(directory=str(tmp_path), max_bytes=1 << 20, memory_entries=2)
+    cache.store_scaled('https://x/a', 320, 180, 'a-320')
+    cache.store_scaled('https://x/a', 640, 360, 'a-640')
+    assert cache.scaled('https://x/a', 320, 180) == 'a-320'
+    cache.store_scaled('https://x/b', 320, 180, 'b-320')
+    assert cache.scaled('https://x/a', 640, 360) is None
+    assert cache.scaled('https://x/a', 320, 180) == 'a-320'
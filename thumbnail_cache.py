@@ -0,0 +1,97 @@
+"""
+VIGGA - Thumbnail Önbelleği
+Bellekte CoverLabel boyutuna ölçeklenmiş pixmap'lerin LRU'su, diskte boyut sınırlı ham görüntü önbelleği.
+Disk kayıtları ETag/Last-Modified ile koşullu istekle doğrulanır.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from settings import CACHE_DIR, get_setting
+
+THUMBNAIL_DIR = os.path.join(CACHE_DIR, 'thumbnails')
+MEMORY_ENTRIES = 64
+
+def _digest(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+class ThumbnailCache:
+    def __init__(self, directory=THUMBNAIL_DIR, max_bytes=None, memory_entries=MEMORY_ENTRIES):
+        self.directory = directory
+        self.max_bytes = max_bytes or get_setting('thumbnail_cache_mb') * 1024 * 1024
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+    def scaled(self, url, width, height):
+        key = (url, width, height)
+        pixmap = self._memory.get(key)
+        if pixmap is not None:
+            self._memory.move_to_end(key)
+        return pixmap
+    def store_scaled(self, url, width, height, pixmap):
+        key = (url, width, height)
+        self._memory[key] = pixmap
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    def load(self, url):
+        path = self._path(url)
+        try:
+            with open(path, 'rb') as fh:
+                data = fh.read()
+            with open(path + '.json', 'r', encoding='utf-8') as fh:
+                meta = json.load(fh)
+        except (OSError, ValueError):
+            return None, None
+        return data, meta
+    def save(self, url, data, etag=None, last_modified=None):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(url)
+        try:
+            with open(path + '.tmp', 'wb') as fh:
+                fh.write(data)
+            os.replace(path + '.tmp', path)
+            with open(path + '.json', 'w', encoding='utf-8') as fh:
+                json.dump({'url': url, 'etag': etag, 'last_modified': last_modified, 'stored': time.time()}, fh)
+        except OSError:
+            return
+        self._evict_disk()
+    def touch(self, url):
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+    def _path(self, url):
+        return os.path.join(self.directory, _digest(url))
+    def _evict_disk(self):
+        # En eski erişilenden başlayarak boyut sınırının altına inilir
+        try:
+            names = [n for n in os.listdir(self.directory) if not n.endswith(('.json', '.tmp'))]
+        except OSError:
+            return
+        files = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            for p in (path, path + '.json'):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= size
+
+_cache = None
+
+def get_thumbnail_cache():
+    global _cache
+    if _cache is None:
+        _cache = ThumbnailCache()
+    return _cache
@@ -4,11 +4,14 @@ Metinler ve dropdown padding tam, preview ve spacing uyumlu, Instagram/Pinterest
 """
 import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QToolButton,
-                             QPushButton, QLabel, QComboBox, QLineEdit, QProgressBar)
+                             QPushButton, QLabel, QComboBox, QLineEdit, QProgressBar, QScrollArea,
+                             QListWidget, QListWidgetItem, QCheckBox, QMenu)
 from PyQt5.QtGui import QIcon, QPainter, QPixmap, QPainterPath, QFontMetrics
-from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, pyqtProperty, QRect, QUrl
-from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
-from styles import *
+from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, pyqtProperty, pyqtSignal, QRect, QUrl
+from styles import palette, set_variant
+from bandwidth import get_bandwidth_scheduler
+from thumbnail_cache import get_thumbnail_cache
+from image_decoder import get_image_decoder
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ICON_DIR = os.path.join(BASE_DIR, 'assets', 'icons')
@@ -20,23 +23,25 @@ class ModernLineEdit(QLineEdit):
     def __init__(self, placeholder=""):
         super().__init__()
         self.setPlaceholderText(placeholder)
-        self.setStyleSheet(URL_INPUT_STYLE)
         self.setMinimumHeight(32)
 
 class ModernComboBox(QComboBox):
     def __init__(self):
         super().__init__()
-        self.setStyleSheet(COMBO_STYLE)
         self.setMinimumHeight(32)
-        self.view().setStyleSheet('QListView {padding:5px; font-size:14px;} QListView::item {padding:7px 2px 7px 12px; min-height:22px;}')
         self.setEditable(False)
         self.format_ids = []
     def set_quality_options(self, options):
+        # Liste yenilenirken (ör. kesin boyutlar geldiğinde) aynı seçenek seçili kalır
+        index, previous = self.currentIndex(), self.get_selected_format_id()
         self.clear()
         self.format_ids = []
         for label, fid in options:
             self.addItem(label)
             self.format_ids.append(fid)
+        if previous in self.format_ids:
+            same = 0 <= index < len(self.format_ids) and self.format_ids[index] == previous
+            self.setCurrentIndex(index if same else self.format_ids.index(previous))
     def get_selected_format_id(self):
         idx = self.currentIndex()
         if 0 <= idx < len(self.format_ids):
@@ -46,26 +51,58 @@ class ModernComboBox(QComboBox):
 class CoverLabel(QLabel):
     def __init__(self):
         super().__init__()
-        self._pixmap = None
+        self._source = None
+        self._key = None
+        self._pending = set()
         self.setAlignment(Qt.AlignCenter)
         self.setMinimumHeight(144)
         self.setMaximumHeight(144)
+        self.setMinimumWidth(1)
         self.setSizePolicy(self.sizePolicy().Expanding, self.sizePolicy().Fixed)
-    def set_pixmap(self, pixmap: QPixmap):
-        self._pixmap = pixmap
+        get_image_decoder().decoded.connect(self._on_decoded)
+    def set_image_data(self, data, key):
+        # Yalnızca sıkıştırılmış veri tutulur; çözme ve ölçekleme arka planda hedef boyutta yapılır
+        self._source = data
+        self._key = key
         self._update_scaled()
+    def set_cached(self, key):
+        # Bellekte bu boyuta ölçeklenmiş kopya varsa veri beklenmeden gösterilir
+        scaled = get_thumbnail_cache().scaled(key, self.width(), self.height())
+        if scaled is None:
+            return False
+        self._source = None
+        self._key = key
+        self.setPixmap(scaled)
+        return True
     def clear_pixmap(self):
-        self._pixmap = None
+        self._source = None
+        self._key = None
         self.clear()
     def resizeEvent(self, event):
         self._update_scaled()
         super().resizeEvent(event)
     def _update_scaled(self):
-        if not self._pixmap or self.width() <= 0 or self.height() <= 0:
+        w, h = self.width(), self.height()
+        if w <= 0 or h <= 0 or not self._key:
             return
-        target = QSize(self.width(), self.height())
-        scaled = self._pixmap.scaled(target, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-        self.setPixmap(scaled)
+        scaled = get_thumbnail_cache().scaled(self._key, w, h)
+        if scaled is not None:
+            self.setPixmap(scaled)
+            return
+        if self._source is None or (self._key, w, h) in self._pending:
+            return
+        self._pending.add((self._key, w, h))
+        get_image_decoder().submit(self._key, self._source, w, h)
+    def _on_decoded(self, key, w, h, image):
+        if (key, w, h) not in self._pending:
+            return
+        self._pending.discard((key, w, h))
+        if image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        get_thumbnail_cache().store_scaled(key, w, h, pixmap)
+        if key == self._key and (w, h) == (self.width(), self.height()):
+            self.setPixmap(pixmap)
 
 class VideoPreviewCard(QWidget):
     def __init__(self):
@@ -74,36 +111,71 @@ class VideoPreviewCard(QWidget):
         contour.setContentsMargins(0, 0, 0, 0)
         contour.setSpacing(0)
         self.thumbnail_label = CoverLabel()
-        self.thumbnail_label.setStyleSheet(PREVIEW_STYLE)
         contour.addWidget(self.thumbnail_label, stretch=0)
         meta_zone = QVBoxLayout()
         meta_zone.setContentsMargins(4, 6, 4, 4)
         meta_zone.setSpacing(2)
         self.title_label = QLabel('Video preview...')
         self.title_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        self.title_label.setStyleSheet(LABEL_STYLE + ' font-size:15px; font-weight:bold;')
+        self.title_label.setProperty('role', 'preview-title')
         meta_zone.addWidget(self.title_label)
         self.channel_label = QLabel('')
         self.channel_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        self.channel_label.setStyleSheet(LABEL_STYLE + ' font-size:12px; font-weight:600; color:#BCA6D4;')
+        self.channel_label.setProperty('role', 'preview-channel')
         self.channel_label.setWordWrap(False)
         meta_zone.addWidget(self.channel_label)
         contour.addLayout(meta_zone, stretch=0)
         contour.addSpacing(2)
-        self.network_manager = QNetworkAccessManager()
-        self.network_manager.finished.connect(self.on_thumbnail_loaded)
+        self.network_manager = None
     def set_video_info(self, title, channel, thumbnail_url):
         self._title_full = title or ''
         self._apply_elide()
         self.channel_label.setText(channel or '')
-        if thumbnail_url:
-            request = QNetworkRequest(QUrl(thumbnail_url))
-            self.network_manager.get(request)
+        self._thumb_url = thumbnail_url or ''
+        if not thumbnail_url:
+            return
+        cache = get_thumbnail_cache()
+        shown = self.thumbnail_label.set_cached(thumbnail_url)
+        data, meta = cache.load(thumbnail_url)
+        if data is not None:
+            self.thumbnail_label.set_image_data(data, thumbnail_url)
+        elif not shown:
+            self.thumbnail_label.clear_pixmap()
+        from PyQt5.QtNetwork import QNetworkRequest
+        request = QNetworkRequest(QUrl(thumbnail_url))
+        request.setPriority(QNetworkRequest.HighPriority)
+        request.setAttribute(QNetworkRequest.User, thumbnail_url)
+        if meta and data is not None:
+            # Disk kaydı koşullu istekle doğrulanır; 304 gelirse yeniden indirilmez
+            if meta.get('etag'):
+                request.setRawHeader(b'If-None-Match', meta['etag'].encode())
+            if meta.get('last_modified'):
+                request.setRawHeader(b'If-Modified-Since', meta['last_modified'].encode())
+        # Thumbnail gelene kadar toplu indirmeler bant genişliğinden pay bırakır
+        get_bandwidth_scheduler().interactive_begin()
+        self._network().get(request)
+    def _network(self):
+        # QtNetwork ilk thumbnail isteğinde yüklenir
+        if self.network_manager is None:
+            from PyQt5.QtNetwork import QNetworkAccessManager
+            self.network_manager = QNetworkAccessManager(self)
+            self.network_manager.finished.connect(self.on_thumbnail_loaded)
+        return self.network_manager
     def on_thumbnail_loaded(self, reply):
-        if reply.error() == QNetworkReply.NoError:
-            pixmap = QPixmap()
-            pixmap.loadFromData(reply.readAll())
-            self.thumbnail_label.set_pixmap(pixmap)
+        from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply
+        get_bandwidth_scheduler().interactive_end()
+        url = reply.request().attribute(QNetworkRequest.User) or reply.request().url().toString()
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        cache = get_thumbnail_cache()
+        if status == 304:
+            cache.touch(url)
+        elif reply.error() == QNetworkReply.NoError:
+            data = bytes(reply.readAll())
+            etag = bytes(reply.rawHeader(b'ETag')).decode('latin-1') or None
+            modified = bytes(reply.rawHeader(b'Last-Modified')).decode('latin-1') or None
+            cache.save(url, data, etag, modified)
+            if url == getattr(self, '_thumb_url', ''):
+                self.thumbnail_label.set_image_data(data, url)
         reply.deleteLater()
     def resizeEvent(self, event):
         self._apply_elide()
@@ -114,10 +186,13 @@ class VideoPreviewCard(QWidget):
         self.title_label.setText(elided_title)
     def reset(self):
         self._title_full = ''
+        self._thumb_url = ''
         self.title_label.setText('Video preview...')
         self.channel_label.setText('')
         self.thumbnail_label.clear_pixmap()
 
+SPINNER_STEP = 12
+
 class LoadingSpinner(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -133,8 +208,11 @@ class LoadingSpinner(QWidget):
         return self._angle
     @angle.setter
     def angle(self, value):
-        self._angle = value
-        self.update()
+        # Açı adımlara yuvarlanır; görünür değişiklik olmayan karelerde yeniden çizim istenmez
+        value -= value % SPINNER_STEP
+        if value != self._angle:
+            self._angle = value
+            self.update()
     def start(self):
         self.animation.start()
         self.show()
@@ -144,24 +222,22 @@ class LoadingSpinner(QWidget):
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
-        painter.translate(14, 14)
+        painter.translate(self.width() / 2, self.height() / 2)
         painter.rotate(self._angle)
         from PyQt5.QtGui import QPen, QColor
-        pen = QPen(QColor(COLORS['primary']), 2, Qt.SolidLine, Qt.RoundCap)
+        pen = QPen(QColor(palette()['primary']), 2, Qt.SolidLine, Qt.RoundCap)
         painter.setPen(pen)
         painter.drawArc(-10, -10, 20, 20, 0, 270 * 16)
 
 class PrimaryButton(QPushButton):
     def __init__(self, text=""):
         super().__init__(text)
-        self.setStyleSheet(BUTTON_STYLE)
         self.setMinimumHeight(38)
         self.setCursor(Qt.PointingHandCursor)
 
 class IconButton(QToolButton):
     def __init__(self, name, tooltip=""):
         super().__init__()
-        self.setStyleSheet(ICON_BUTTON_STYLE)
         self.setIcon(QIcon(icon_path(name)))
         self.setIconSize(QSize(15, 15))
         self.setToolTip(tooltip)
@@ -176,9 +252,9 @@ class ProgressWidget(QWidget):
         info_layout = QHBoxLayout()
         if not slim:
             self.progress_label = QLabel("")
-            self.progress_label.setStyleSheet(LABEL_STYLE + ' font-size:13px;')
+            self.progress_label.setProperty('role', 'progress')
             self.percentage_label = QLabel("0%")
-            self.percentage_label.setStyleSheet(LABEL_STYLE + ' font-size:13px;')
+            self.percentage_label.setProperty('role', 'progress')
             self.percentage_label.setAlignment(Qt.AlignRight)
             info_layout.addWidget(self.progress_label)
             info_layout.addWidget(self.percentage_label)
@@ -186,10 +262,7 @@ class ProgressWidget(QWidget):
             self.progress_label = None
             self.percentage_label = None
         self.progress_bar = QProgressBar()
-        style = PROGRESS_STYLE
-        if slim:
-            style = style.replace('height: 11px;', 'height: 3px;').replace('border-radius: 8px;', 'border-radius: 4px;').replace('border-radius: 7px;', 'border-radius: 3px;')
-        self.progress_bar.setStyleSheet(style)
+        self.progress_bar.setProperty('slim', slim)
         self.progress_bar.setTextVisible(False)
         self.progress_bar.setMaximum(100)
         self.progress_bar.setValue(0)
@@ -199,9 +272,11 @@ class ProgressWidget(QWidget):
         self.setFixedHeight(56 if not slim else 12)
         self.hide()
     def update_progress(self, value, text=""):
-        self.progress_bar.setValue(value)
-        if self.percentage_label: self.percentage_label.setText(f"{value}%")
-        if self.progress_label: self.progress_label.setText(text)
+        # Değişmeyen değerler için setValue/setText (ve yeniden çizim) atlanır
+        if value != self.progress_bar.value():
+            self.progress_bar.setValue(value)
+            if self.percentage_label: self.percentage_label.setText(f"{value}%")
+        if self.progress_label and text != self.progress_label.text(): self.progress_label.setText(text)
         if not self.isVisible(): self.show()
     def reset(self):
         self.progress_bar.setValue(0)
@@ -217,7 +292,7 @@ class StatusBar(QWidget):
         self.folder_btn = IconButton('folder.svg', 'Open downloads folder')
         self.delete_btn = IconButton('trash.svg', 'Clear')
         self.status_label = QLabel("Status: Ready")
-        self.status_label.setStyleSheet(STATUS_LABEL_STYLE)
+        self.status_label.setProperty('role', 'status')
         self.status_label.setAlignment(Qt.AlignRight)
         layout.addWidget(self.folder_btn)
         layout.addWidget(self.delete_btn)
@@ -230,12 +305,205 @@ class HeaderBar(QWidget):
     def __init__(self):
         super().__init__()
         self.setObjectName('Header')
-        self.setStyleSheet(HEADER_STYLE)
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         self.title = QLabel("VIGGA")
         self.title.setObjectName('Title')
+        self.title.setToolTip('Ctrl+T: switch theme')
         layout.addWidget(self.title)
         layout.addStretch()
+        self.history_btn = IconButton('history.svg', 'History')
+        layout.addWidget(self.history_btn)
         self.close_btn = IconButton('close.svg', 'Close')
         layout.addWidget(self.close_btn)
+
+class QueueRow(QWidget):
+    STATE_TEXT = {'queued': 'Queued', 'running': '', 'processing': 'Processing…', 'paused': 'Paused',
+                  'done': 'Complete', 'failed': 'Error', 'cancelled': 'Cancelled'}
+    PRIORITIES = (('High priority', 1), ('Normal priority', 0), ('Low priority', -1))
+    priority_requested = pyqtSignal(int)
+    def __init__(self, item_id, title):
+        super().__init__()
+        self.item_id = item_id
+        self.state = 'queued'
+        self.priority = 0
+        self.setToolTip('Right-click to change priority')
+        self._title_full = title or ''
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(2)
+        top = QHBoxLayout()
+        top.setSpacing(4)
+        self.title_label = QLabel(self._title_full)
+        self.title_label.setProperty('role', 'row-title')
+        self.status_label = QLabel('Queued')
+        self.status_label.setProperty('role', 'status')
+        self.status_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.toggle_btn = IconButton('pause.svg', 'Pause')
+        self.cancel_btn = IconButton('close.svg', 'Cancel')
+        top.addWidget(self.title_label, 1)
+        top.addWidget(self.status_label, 0)
+        top.addWidget(self.toggle_btn, 0)
+        top.addWidget(self.cancel_btn, 0)
+        layout.addLayout(top)
+        self.progress = ProgressWidget(slim=True)
+        self.progress.show()
+        layout.addWidget(self.progress)
+    def set_state(self, state):
+        if state != self.state:
+            # Duraklatılmış/hatalı satırın çubuğu soluk çizilir; yalnızca bu çubuk yeniden cilalanır
+            set_variant(self.progress.progress_bar, 'state', state)
+        self.state = state
+        text = self.STATE_TEXT.get(state, '')
+        if text:
+            self.status_label.setText(text)
+        paused = state in ('paused', 'failed')
+        self.toggle_btn.setIcon(QIcon(icon_path('play.svg' if paused else 'pause.svg')))
+        self.toggle_btn.setToolTip('Resume' if paused else 'Pause')
+        self.toggle_btn.setVisible(state in ('queued', 'running', 'paused', 'failed'))
+        if state == 'done':
+            self.progress.progress_bar.setValue(100)
+    def contextMenuEvent(self, event):
+        # Sıradaki işler önceliğe göre başlar; eşit öncelikte ekleme sırası korunur
+        menu = QMenu(self)
+        for label, value in self.PRIORITIES:
+            action = menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(value == self.priority)
+            action.setData(value)
+        chosen = menu.exec_(event.globalPos())
+        if chosen is not None and chosen.data() != self.priority:
+            self.priority_requested.emit(chosen.data())
+    def update_progress(self, value, text=''):
+        self.progress.update_progress(value)
+        parts = text.split('  ')[1:] if text else []
+        status = ' · '.join(parts) if parts else (text or f"{value}%")
+        if status != self.status_label.text():
+            self.status_label.setText(status)
+    def resizeEvent(self, event):
+        fm = QFontMetrics(self.title_label.font())
+        self.title_label.setText(fm.elidedText(self._title_full, Qt.ElideRight, max(60, self.title_label.width())))
+        super().resizeEvent(event)
+
+class QueueView(QScrollArea):
+    pause_requested = pyqtSignal(int)
+    resume_requested = pyqtSignal(int)
+    cancel_requested = pyqtSignal(int)
+    priority_requested = pyqtSignal(int, int)
+    def __init__(self):
+        super().__init__()
+        self.setWidgetResizable(True)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self._container = QWidget()
+        self._layout = QVBoxLayout(self._container)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(4)
+        self._layout.addStretch()
+        self.setWidget(self._container)
+        self._rows = {}
+    def add_row(self, item_id, title):
+        row = QueueRow(item_id, title)
+        row.toggle_btn.clicked.connect(lambda _=False, r=row: self._on_toggle(r))
+        row.cancel_btn.clicked.connect(lambda _=False, i=item_id: self.cancel_requested.emit(i))
+        row.priority_requested.connect(lambda priority, i=item_id: self.priority_requested.emit(i, priority))
+        self._layout.insertWidget(self._layout.count() - 1, row)
+        self._rows[item_id] = row
+        return row
+    def row(self, item_id):
+        return self._rows.get(item_id)
+    def set_state(self, item_id, state):
+        row = self._rows.get(item_id)
+        if row:
+            row.set_state(state)
+    def set_priority(self, item_id, priority):
+        row = self._rows.get(item_id)
+        if row:
+            row.priority = priority
+    def update_progress(self, item_id, value, text=''):
+        row = self._rows.get(item_id)
+        if row:
+            row.update_progress(value, text)
+    def remove_row(self, item_id):
+        row = self._rows.pop(item_id, None)
+        if row:
+            self._layout.removeWidget(row)
+            row.deleteLater()
+    def _on_toggle(self, row):
+        if row.state in ('paused', 'failed'):
+            self.resume_requested.emit(row.item_id)
+        else:
+            self.pause_requested.emit(row.item_id)
+
+class PlaylistView(QWidget):
+    entry_activated = pyqtSignal(str)
+    def __init__(self):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        top = QHBoxLayout()
+        self.title_label = QLabel('Playlist')
+        self.title_label.setProperty('role', 'section')
+        self.count_label = QLabel('')
+        self.count_label.setProperty('role', 'status')
+        self.select_all = QCheckBox('All')
+        self.select_all.setProperty('role', 'status')
+        self.select_all.toggled.connect(self._on_select_all)
+        top.addWidget(self.title_label, 1)
+        top.addWidget(self.count_label, 0)
+        top.addWidget(self.select_all, 0)
+        layout.addLayout(top)
+        self.list = QListWidget()
+        self.list.setUniformItemSizes(True)
+        self.list.currentItemChanged.connect(self._on_current_changed)
+        layout.addWidget(self.list)
+        self._done = False
+    def reset(self, title='Playlist'):
+        self.list.clear()
+        self._done = False
+        self.title_label.setText(title)
+        self.count_label.setText('')
+        self.select_all.blockSignals(True)
+        self.select_all.setChecked(False)
+        self.select_all.blockSignals(False)
+    def add_entries(self, entries):
+        check = Qt.Checked if self.select_all.isChecked() else Qt.Unchecked
+        self.list.setUpdatesEnabled(False)
+        for entry in entries:
+            item = QListWidgetItem(f"{entry['index']}. {entry['title']}")
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(check)
+            item.setData(Qt.UserRole, entry['url'])
+            item.setData(Qt.UserRole + 1, entry['title'])
+            self.list.addItem(item)
+        self.list.setUpdatesEnabled(True)
+        self._update_count()
+    def set_finished(self, title, count):
+        self._done = True
+        self.title_label.setText(title)
+        self._update_count()
+    def set_entry_details(self, url, info):
+        labels = [label for label, _ in info.get('quality_options', [])[:3]]
+        tip = ' · '.join(filter(None, [info.get('channel'), ', '.join(labels)]))
+        for row in range(self.list.count()):
+            item = self.list.item(row)
+            if item.data(Qt.UserRole) == url:
+                item.setToolTip(tip)
+                break
+    def checked_entries(self):
+        result = []
+        for row in range(self.list.count()):
+            item = self.list.item(row)
+            if item.checkState() == Qt.Checked:
+                result.append((item.data(Qt.UserRole), item.data(Qt.UserRole + 1)))
+        return result
+    def _update_count(self):
+        n = self.list.count()
+        self.count_label.setText(f"{n}" if self._done else f"{n}…")
+    def _on_select_all(self, checked):
+        state = Qt.Checked if checked else Qt.Unchecked
+        for row in range(self.list.count()):
+            self.list.item(row).setCheckState(state)
+    def _on_current_changed(self, current, previous):
+        if current:
+            self.entry_activated.emit(current.data(Qt.UserRole))